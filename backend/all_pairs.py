@@ -0,0 +1,157 @@
+# backend/all_pairs.py
+"""
+Caminos mínimos entre todos los pares de nodos.
+
+- floyd_warshall: matriz de distancias completa en NumPy; cada pivote k actualiza toda la
+  matriz con un único mínimo con broadcasting (D[i,k] + D[k,j]). Ideal para grafos densos.
+- johnson: repondera con potenciales de un Bellman-Ford (nodo virtual unido a todos con peso 0)
+  y ejecuta Dijkstra desde cada origen. Ideal para grafos dispersos con pesos negativos.
+
+Ambos devuelven un AllPairsResult con la matriz de distancias y la matriz de sucesores
+(primer salto del camino i -> j, o -1), a partir de la cual se reconstruye cualquier camino.
+"""
+
+import numpy as np
+
+from graph_core import CSRGraph, INF, NO_PREDECESSOR
+
+# Fracción de aristas (E / V²) a partir de la cual se prefiere Floyd-Warshall
+DENSE_GRAPH_THRESHOLD = 0.05
+# Hasta este tamaño Floyd-Warshall vectorizado gana a Johnson (Dijkstra en Python) aun siendo disperso
+SMALL_GRAPH_NODES = 512
+NO_SUCCESSOR = -1
+
+
+class AllPairsResult:
+    """Matrices n×n de distancias (float64, ∞ si no hay camino) y de sucesores (int32)."""
+
+    __slots__ = ('engine', 'distances', 'successors', 'negative_cycle')
+
+    def __init__(self, engine, distances, successors, negative_cycle=False):
+        self.engine = engine
+        self.distances = distances
+        self.successors = successors
+        self.negative_cycle = negative_cycle
+
+    def path(self, source, target):
+        return path_from_successors(self.successors, source, target)
+
+
+def choose_engine(graph):
+    """'floyd-warshall' para grafos densos o pequeños, 'johnson' para grafos grandes y dispersos."""
+    n = graph.num_nodes
+    if n <= SMALL_GRAPH_NODES or graph.num_edges >= DENSE_GRAPH_THRESHOLD * n * n:
+        return 'floyd-warshall'
+    return 'johnson'
+
+
+def floyd_warshall(graph):
+    """Floyd-Warshall vectorizado: O(V³) operaciones, pero solo V iteraciones en Python."""
+    n = graph.num_nodes
+    distances = np.full((n, n), INF)
+    successors = np.full((n, n), NO_SUCCESSOR, dtype=np.int32)
+
+    sources = graph.edge_sources()
+    distances[sources, graph.indices] = graph.weights
+    successors[sources, graph.indices] = graph.indices
+
+    # Un lazo propio negativo ya es un ciclo negativo; el resto de la diagonal es 0
+    diagonal = np.arange(n)
+    distances[diagonal, diagonal] = np.minimum(distances[diagonal, diagonal], 0)
+    successors[diagonal, diagonal] = diagonal
+
+    for k in range(n):
+        candidates = distances[:, k, None] + distances[None, k, :]
+        improved = candidates < distances
+        if improved.any():
+            np.copyto(distances, candidates, where=improved)
+            np.copyto(successors, np.broadcast_to(successors[:, k, None], (n, n)), where=improved)
+
+    negative_cycle = bool((distances[diagonal, diagonal] < 0).any())
+    return AllPairsResult('floyd-warshall', distances, successors, negative_cycle)
+
+
+def johnson_potentials(graph, bellman_ford_tree):
+    """
+    Potenciales h(v) = distancia desde un nodo virtual unido a todos con peso 0.
+    Devuelve None si el grafo contiene un ciclo negativo.
+    """
+    n = graph.num_nodes
+    augmented = CSRGraph(
+        np.append(graph.indptr, graph.indptr[-1] + n),
+        np.concatenate((graph.indices, np.arange(n, dtype=np.int32))),
+        np.concatenate((graph.weights, np.zeros(n, dtype=np.int64))),
+    )
+    tree = bellman_ford_tree(augmented, n, n + 1)
+    if tree.negative_cycle:
+        return None
+    return np.asarray(tree.distances[:n], dtype=np.int64)
+
+
+def reweight(graph, potentials):
+    """Grafo con pesos w'(u, v) = w(u, v) + h(u) - h(v) >= 0 (misma estructura CSR)."""
+    weights = graph.weights + potentials[graph.edge_sources()] - potentials[graph.indices]
+    return CSRGraph(graph.indptr, graph.indices, weights)
+
+
+def first_hops(tree, num_nodes):
+    """Fila de la matriz de sucesores para el origen del árbol: primer salto hacia cada nodo."""
+    source = tree.source
+    predecessors = tree.predecessors
+    hops = [NO_SUCCESSOR] * num_nodes
+    hops[source] = source
+    for target in range(num_nodes):
+        if hops[target] != NO_SUCCESSOR or predecessors[target] == NO_PREDECESSOR:
+            continue
+        # Subir hasta un nodo con primer salto conocido y propagarlo hacia abajo
+        chain = []
+        node = target
+        while hops[node] == NO_SUCCESSOR and predecessors[node] != NO_PREDECESSOR and predecessors[node] != source:
+            chain.append(node)
+            node = predecessors[node]
+        if hops[node] == NO_SUCCESSOR:
+            hops[node] = node if predecessors[node] == source else NO_SUCCESSOR
+        for descendant in chain:
+            hops[descendant] = hops[node]
+    return hops
+
+
+def run_sources_sequentially(graph, sources, single_source_tree):
+    """Ejecutor por defecto de la etapa por origen de Johnson: un árbol tras otro."""
+    return [single_source_tree(graph, source, graph.num_nodes) for source in sources]
+
+
+def johnson(graph, bellman_ford_tree, dijkstra_tree, run_sources=run_sources_sequentially):
+    """
+    Johnson: potenciales con un Bellman-Ford, repondera y ejecuta Dijkstra desde cada origen.
+    run_sources(grafo, orígenes, función_por_origen) permite repartir esa etapa (p. ej. en procesos).
+    """
+    n = graph.num_nodes
+    potentials = johnson_potentials(graph, bellman_ford_tree)
+    if potentials is None:
+        return AllPairsResult('johnson', np.full((n, n), INF), np.full((n, n), NO_SUCCESSOR, dtype=np.int32), True)
+
+    reweighted = reweight(graph, potentials)
+    distances = np.full((n, n), INF)
+    successors = np.full((n, n), NO_SUCCESSOR, dtype=np.int32)
+    for tree in run_sources(reweighted, range(n), dijkstra_tree):
+        source = tree.source
+        row = np.frombuffer(tree.distances, dtype=np.float64)
+        # d(s, t) = d'(s, t) - h(s) + h(t)
+        distances[source] = row - potentials[source] + potentials
+        successors[source] = first_hops(tree, n)
+    return AllPairsResult('johnson', distances, successors)
+
+
+def path_from_successors(successors, source, target):
+    """Camino source -> target siguiendo la matriz de sucesores; [] si no existe."""
+    if successors[source][target] == NO_SUCCESSOR:
+        return []
+    path = [source]
+    current = source
+    while current != target:
+        current = int(successors[current][target])
+        if current == NO_SUCCESSOR or len(path) > len(successors):
+            return []
+        path.append(current)
+    return path
@@ -0,0 +1,270 @@
+# backend/benchmark.py
+"""
+Suite de benchmarks reproducible para los motores de caminos mínimos.
+
+Genera grafos aleatorios con semilla fija (disperso, denso, rejilla y DAG con pesos negativos)
+de 10² a 10⁵ nodos, mide el tiempo de cada motor, de las variantes con pasos, de la construcción
+del grafo, de un lote de árboles en serie y en el pool de procesos (parallel.py) y de la ruta HTTP
+completa (/find_path con el cliente de pruebas de Flask), y registra el pico de memoria con
+tracemalloc. El resultado es JSON para comparar entre commits:
+
+    python benchmark.py --output resultados.json
+    python benchmark.py --sizes 100,1000 --families sparse,grid --compare resultados.json
+
+Los motores cuadráticos o con pasos se omiten (status 'skipped') por encima de su tamaño máximo.
+"""
+
+import argparse
+import json
+import math
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import main
+from graph_core import CSRGraph
+from parallel import ParallelExecutor, available_cpus
+
+DEFAULT_SIZES = (100, 1000, 10_000, 100_000)
+FAMILIES = ('sparse', 'dense', 'grid', 'negative-dag')
+SPARSE_DEGREE = 4
+DENSE_DENSITY = 0.2
+MAX_WEIGHT = 100
+
+# Tamaño máximo (nodos) de cada familia y de cada medición; por encima se omite
+FAMILY_MAX_NODES = {'dense': 2_000}
+ENGINE_MAX_NODES = {
+    'bellman-ford': 10_000,
+    'with-steps': 1_000,
+    'build-matrix': 2_000,
+    'http-steps': 1_000,
+    'batch': 10_000,
+}
+# Orígenes del lote que se compara en serie y repartido en el pool de procesos
+BATCH_SOURCES = 8
+
+
+# =======================================================
+# GENERADORES DE GRAFOS (CON SEMILLA)
+# =======================================================
+def generate_graph(family, num_nodes, seed):
+    """Devuelve (CSRGraph, posiciones (n, 2) o None) de la familia pedida."""
+    rng = np.random.default_rng([seed, num_nodes, FAMILIES.index(family)])
+    positions = None
+    if family == 'sparse':
+        num_edges = SPARSE_DEGREE * num_nodes
+        sources = rng.integers(0, num_nodes, num_edges)
+        targets = rng.integers(0, num_nodes, num_edges)
+        weights = rng.integers(1, MAX_WEIGHT + 1, num_edges)
+    elif family == 'dense':
+        mask = rng.random((num_nodes, num_nodes)) < DENSE_DENSITY
+        np.fill_diagonal(mask, False)
+        sources, targets = np.nonzero(mask)
+        weights = rng.integers(1, MAX_WEIGHT + 1, len(sources))
+    elif family == 'grid':
+        side = math.isqrt(num_nodes)
+        num_nodes = side * side
+        nodes = np.arange(num_nodes).reshape(side, side)
+        right = (nodes[:, :-1].ravel(), nodes[:, 1:].ravel())
+        down = (nodes[:-1, :].ravel(), nodes[1:, :].ravel())
+        sources = np.concatenate((right[0], right[1], down[0], down[1]))
+        targets = np.concatenate((right[1], right[0], down[1], down[0]))
+        weights = rng.integers(1, MAX_WEIGHT + 1, len(sources))
+        positions = np.stack((nodes.ravel() % side, nodes.ravel() // side), axis=1).astype(np.float64)
+    elif family == 'negative-dag':
+        # Aristas solo de u < v (sin ciclos) más una cadena que hace alcanzable todo el grafo
+        num_edges = SPARSE_DEGREE * num_nodes
+        a = rng.integers(0, num_nodes, num_edges)
+        b = rng.integers(0, num_nodes, num_edges)
+        keep = a != b
+        chain = np.arange(num_nodes - 1)
+        sources = np.concatenate((np.minimum(a, b)[keep], chain))
+        targets = np.concatenate((np.maximum(a, b)[keep], chain + 1))
+        weights = rng.integers(-MAX_WEIGHT // 5, MAX_WEIGHT + 1, len(sources))
+    else:
+        raise ValueError(f"Familia de grafos desconocida: {family}")
+    return CSRGraph.from_edges(num_nodes, sources, targets, weights), positions
+
+
+def graph_to_payload(graph, num_nodes, use_matrix):
+    """Cuerpo JSON de /find_path: matriz densa del editor o lista de aristas."""
+    if use_matrix:
+        return {'matrix': main.graph_to_matrix(graph), 'is_directed': True}
+    return {'edges': main.graph_to_edges(graph), 'num_nodes': num_nodes, 'is_directed': True}
+
+
+# =======================================================
+# MEDICIONES
+# =======================================================
+def measure(function, repeat):
+    """Tiempos de repeat ejecuciones y pico de memoria (tracemalloc) de una ejecución adicional."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        'seconds_min': min(timings),
+        'seconds_median': statistics.median(timings),
+        'peak_bytes': peak,
+    }
+
+
+def build_cases(graph, positions, num_nodes, has_negative_weights, client, pool):
+    """
+    Lista (nombre, límite de tamaño, función o None si no aplica) de mediciones para un grafo.
+    pool es el ParallelExecutor (siempre reparte) con el que se compara el lote en serie.
+    """
+    start, end = 0, num_nodes - 1
+    cases = [
+        ('dijkstra', None, None if has_negative_weights else lambda: main.dijkstra_tree(graph, start, num_nodes)),
+        ('dijkstra-indexed-heap', None, None if has_negative_weights else lambda: main.dijkstra_indexed_heap_tree(graph, start, num_nodes)),
+        ('dijkstra-dial', None, None if has_negative_weights else lambda: main.dijkstra_dial_tree(graph, start, num_nodes)),
+        ('bellman-ford', 'bellman-ford', lambda: main.bellman_ford_tree(graph, start, num_nodes)),
+        ('bellman-ford-vectorized', None, lambda: main.bellman_ford_vectorized_tree(graph, start, num_nodes)),
+        ('spfa', None, lambda: main.spfa_tree(graph, start, num_nodes)),
+        ('bidirectional-dijkstra', None, None if has_negative_weights else lambda: main.bidirectional_dijkstra(graph, start, end, num_nodes)),
+        ('astar', None, None if has_negative_weights or positions is None else lambda: main.astar(graph, start, end, num_nodes, positions)),
+        ('dijkstra-with-steps', 'with-steps', None if has_negative_weights else lambda: main.dijkstra_with_steps(graph, start, end, num_nodes)),
+        ('bellman-ford-with-steps', 'with-steps', lambda: main.bellman_ford_with_steps(graph, start, end, num_nodes)),
+    ]
+
+    matrix = main.graph_to_matrix(graph) if num_nodes <= ENGINE_MAX_NODES['build-matrix'] else None
+    edges = main.graph_to_edges(graph)
+    cases += [
+        ('build-matrix', 'build-matrix', lambda: main.build_graph_from_matrix(matrix, True)),
+        ('build-edges', None, lambda: main.build_graph_from_edges(edges, True, num_nodes)),
+    ]
+
+    algorithm = 'bellman-ford-vectorized' if has_negative_weights else 'dijkstra'
+    tree_function = main.ALGORITHMS[algorithm].tree_function
+    sources = list(range(0, num_nodes, max(1, num_nodes // BATCH_SOURCES)))[:BATCH_SOURCES]
+    cases += [
+        ('batch-serial', 'batch', lambda: [tree_function(graph, source, num_nodes) for source in sources]),
+        ('batch-process-pool', 'batch', lambda: pool.run_sources(graph, sources, tree_function)),
+    ]
+
+    body = graph_to_payload(graph, num_nodes, use_matrix=matrix is not None)
+    query = {'start_node_index': start, 'end_node_index': end, 'algorithm': algorithm}
+
+    def http(include_steps):
+        response = client.post('/find_path', json={**body, **query, 'include_steps': include_steps})
+        assert response.status_code == 200, response.data[:200]
+
+    main.spt_cache.clear()
+    cases += [
+        # Sin pasos cada repetición es un acierto de la caché de árboles salvo la primera: se vacía antes
+        ('http-find-path', None, lambda: (main.spt_cache.clear(), http(False))),
+        ('http-find-path-steps', 'http-steps', lambda: http(True)),
+    ]
+    return cases
+
+
+def run_suite(sizes=DEFAULT_SIZES, families=FAMILIES, seed=0, repeat=3, log=None):
+    """Ejecuta todas las mediciones y devuelve la lista de resultados."""
+    client = main.app.test_client()
+    # Al menos dos procesos para que el pool reparta incluso con una sola CPU (en producción esa
+    # configuración se ejecuta en serie: ver ParallelExecutor.should_parallelize)
+    workers = max(2, available_cpus())
+    pool = ParallelExecutor(max_workers=workers, min_parallel_work=0, min_parallel_sources=1, cpus=workers)
+    try:
+        results = []
+        for family in families:
+            for size in sizes:
+                base = {'family': family, 'nodes': size}
+                if size > FAMILY_MAX_NODES.get(family, math.inf):
+                    results.append({**base, 'engine': '*', 'status': 'skipped'})
+                    continue
+                graph, positions = generate_graph(family, size, seed)
+                num_nodes = graph.num_nodes
+                base = {'family': family, 'nodes': num_nodes, 'edges': graph.num_edges}
+                for engine, limit_key, function in build_cases(graph, positions, num_nodes, graph.has_negative_weights, client, pool):
+                    if function is None or num_nodes > ENGINE_MAX_NODES.get(limit_key, math.inf):
+                        results.append({**base, 'engine': engine, 'status': 'skipped'})
+                        continue
+                    record = {**base, 'engine': engine, 'status': 'ok', **measure(function, repeat)}
+                    results.append(record)
+                    if log is not None:
+                        log(f"{family:>13} n={num_nodes:<7} {engine:<26} {record['seconds_median'] * 1000:10.2f} ms  {record['peak_bytes'] / 2**20:8.2f} MiB")
+    finally:
+        pool.shutdown()
+    return results
+
+
+def environment_info(seed, repeat):
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'python': platform.python_version(),
+        'numpy': np.__version__,
+        'platform': platform.platform(),
+        'seed': seed,
+        'repeat': repeat,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+    }
+
+
+def compare(results, baseline):
+    """Filas (familia, nodos, motor, tiempo base, tiempo actual, razón) para las mediciones comunes."""
+    key = lambda r: (r['family'], r['nodes'], r['engine'])
+    previous = {key(r): r for r in baseline if r.get('status') == 'ok'}
+    rows = []
+    for record in results:
+        old = previous.get(key(record))
+        if record.get('status') == 'ok' and old is not None:
+            rows.append((*key(record), old['seconds_median'], record['seconds_median'],
+                         record['seconds_median'] / old['seconds_median'] if old['seconds_median'] else math.inf))
+    return rows
+
+
+def main_cli(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmarks de los motores de caminos mínimos.")
+    parser.add_argument('--sizes', default=",".join(map(str, DEFAULT_SIZES)), help="tamaños en nodos, separados por comas")
+    parser.add_argument('--families', default=",".join(FAMILIES), help="familias de grafos, separadas por comas")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--output', help="archivo JSON de resultados (por defecto, salida estándar)")
+    parser.add_argument('--compare', help="JSON de una ejecución anterior para mostrar la razón de tiempos")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",") if s]
+    families = [f for f in args.families.split(",") if f]
+    log = lambda line: print(line, file=sys.stderr)
+    report = {
+        'environment': environment_info(args.seed, args.repeat),
+        'results': run_suite(sizes, families, args.seed, args.repeat, log),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)['results']
+        for family, nodes, engine, old, new, ratio in compare(report['results'], baseline):
+            flag = "  <-- más lento" if ratio > 1.2 else ""
+            print(f"{family:>13} n={nodes:<7} {engine:<26} {old * 1000:10.2f} -> {new * 1000:10.2f} ms  x{ratio:.2f}{flag}", file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main_cli()
@@ -0,0 +1,99 @@
+# backend/dense_matrix.py
+"""
+Lectura vectorizada de la matriz densa del editor (lista de filas de cadenas: peso o "").
+
+En lugar de recorrer las n² celdas en Python (str, strip e int por celda), las filas se unen en
+un único bloque de bytes separado por \\x1f y se analiza con NumPy de una sola vez:
+
+1. Se localizan los separadores: cada celda es el tramo entre dos separadores consecutivos.
+2. Se valida que el bloque solo contenga dígitos, un signo inicial opcional y separadores.
+3. El valor de cada celda no vacía se acumula columna a columna (dígito × 10^k) alineando las
+   celdas por su último carácter.
+
+El resultado son las posiciones (i · n + j) de las celdas con peso, en orden fila-mayor, y sus
+pesos. Cualquier matriz fuera de ese formato canónico (filas irregulares, celdas no textuales,
+espacios, valores no enteros, más de 18 dígitos...) devuelve None para que el llamador use el
+recorrido celda a celda, que conserva exactamente los mismos mensajes de error.
+"""
+
+import numpy as np
+
+_SEPARATOR = 0x1f
+_PLUS, _MINUS, _ZERO = ord('+'), ord('-'), ord('0')
+# Con 18 dígitos el valor siempre cabe en int64
+MAX_DIGITS = 18
+
+
+def _join_rows(matrix_data, num_nodes):
+    """Bloque de bytes ASCII con las n² celdas separadas por \\x1f, o None si la matriz no es canónica."""
+    if any(not isinstance(row, list) or len(row) != num_nodes for row in matrix_data):
+        return None
+    try:
+        text = "\x1f".join(map("\x1f".join, matrix_data))
+    except TypeError:
+        # Celdas numéricas (JSON con enteros en vez de cadenas)
+        try:
+            text = "\x1f".join("\x1f".join(map(str, row)) for row in matrix_data)
+        except TypeError:
+            return None
+    try:
+        return text.encode('ascii')
+    except UnicodeEncodeError:
+        return None
+
+
+def parse_dense_matrix(matrix_data):
+    """
+    (posiciones fila-mayor de las celdas con peso, pesos int64) de una matriz n×n en formato
+    canónico, o None si hay que recurrir al recorrido celda a celda.
+    """
+    num_nodes = len(matrix_data)
+    if num_nodes == 0:
+        return None
+    blob = _join_rows(matrix_data, num_nodes)
+    if blob is None:
+        return None
+    data = np.frombuffer(blob, dtype=np.uint8)
+
+    # 1. Límites de las celdas: [inicio, fin) entre separadores consecutivos
+    separators = np.flatnonzero(data == _SEPARATOR)
+    num_cells = num_nodes * num_nodes
+    if len(separators) != num_cells - 1:
+        # Algún separador venía dentro de una celda
+        return None
+    ends = np.append(separators, len(data))
+    starts = np.empty(num_cells, dtype=np.int64)
+    starts[0] = 0
+    starts[1:] = separators + 1
+
+    # 2. Solo dígitos, separadores y signos al principio de una celda seguidos de un dígito
+    is_digit = (data - _ZERO) <= 9  # uint8: los bytes menores que '0' dan la vuelta
+    is_sign = (data == _PLUS) | (data == _MINUS)
+    if not (is_digit | is_sign | (data == _SEPARATOR)).all():
+        return None
+    signs = np.flatnonzero(is_sign)
+    if len(signs):
+        at_cell_start = (signs == 0) | (data[np.maximum(signs - 1, 0)] == _SEPARATOR)
+        before_digit = (signs + 1 < len(data)) & is_digit[np.minimum(signs + 1, len(data) - 1)]
+        if not (at_cell_start & before_digit).all():
+            return None
+
+    lengths = ends - starts
+    positions = np.flatnonzero(lengths)
+    if len(positions) and lengths[positions].max() > MAX_DIGITS:
+        return None
+
+    # 3. Valor de cada celda con peso, alineando las celdas por su último carácter
+    cell_starts, cell_ends = starts[positions], ends[positions]
+    width = int(lengths[positions].max()) if len(positions) else 0
+    weights = np.zeros(len(positions), dtype=np.int64)
+    power = 1
+    for offset in range(1, width + 1):
+        index = cell_ends - offset
+        valid = index >= cell_starts
+        digits = data[np.where(valid, index, 0)]
+        weights += np.where(valid & (digits != _PLUS) & (digits != _MINUS), digits.astype(np.int64) - _ZERO, 0) * power
+        power *= 10
+    negative = data[cell_starts] == _MINUS
+    weights[negative] = -weights[negative]
+    return positions, weights
@@ -0,0 +1,178 @@
+# backend/dynamic_sssp.py
+"""
+Edición incremental de grafos registrados y reparación de árboles de caminos mínimos.
+
+Al cambiar unas pocas aristas no hace falta recalcular el árbol desde cero (esquema dinámico
+al estilo Ramalingam-Reps):
+
+1. Aumentos y borrados: solo importan si la arista pertenece al árbol. En ese caso el subárbol
+   que cuelga de ella queda invalidado: sus nodos vuelven a ∞ y toman como valor provisional la
+   mejor arista entrante desde un nodo no afectado (una pasada vectorizada sobre indices, sin
+   construir el grafo inverso).
+2. Disminuciones e inserciones: el destino mejora si d[u] + w < d[v].
+3. Los nodos que cambiaron se propagan con una cola de trabajo (como SPFA), que también admite
+   pesos negativos y detecta los ciclos negativos que la edición haga alcanzables.
+
+El trabajo en Python es proporcional a la parte del árbol que cambia: las filas se leen cortando
+indptr/indices/weights solo para los nodos que se procesan, sin pedir graph.rows() (que convierte
+el grafo entero). Lo único O(E) es la pasada vectorizada del paso 1, y solo si se corta el árbol.
+"""
+
+from array import array
+from collections import deque, namedtuple
+
+import numpy as np
+
+from graph_core import CSRGraph, INF, NO_PREDECESSOR, ShortestPathTree
+
+# Cambio efectivo de una arista; None en old_weight (inserción) o en new_weight (borrado)
+EdgeChange = namedtuple('EdgeChange', ['source', 'target', 'old_weight', 'new_weight'])
+
+
+def apply_edge_edits(graph, edits):
+    """
+    Aplica ediciones (u, v, peso o None para borrar) y devuelve (grafo nuevo, cambios efectivos).
+    Si una arista aparece varias veces prevalece la última edición; las que no cambian nada se
+    descartan. Con solo cambios de peso se reutiliza la estructura CSR y se copian los pesos.
+    """
+    final_weights = {}
+    for u, v, weight in edits:
+        final_weights[(u, v)] = weight
+
+    weights = graph.weights.copy()
+    keep = np.ones(graph.num_edges, dtype=bool)
+    added = []
+    changes = []
+    for (u, v), weight in final_weights.items():
+        start, end = graph.indptr[u], graph.indptr[u + 1]
+        k = start + np.searchsorted(graph.indices[start:end], v)
+        exists = k < end and graph.indices[k] == v
+        old_weight = int(graph.weights[k]) if exists else None
+        if old_weight == weight:
+            continue
+        changes.append(EdgeChange(u, v, old_weight, weight))
+        if not exists:
+            added.append((u, v, weight))
+        elif weight is None:
+            keep[k] = False
+        else:
+            weights[k] = weight
+
+    if not changes:
+        return graph, []
+    if not added and keep.all():
+        return CSRGraph(graph.indptr, graph.indices, weights), changes
+
+    sources = np.concatenate((graph.edge_sources()[keep], np.array([e[0] for e in added], dtype=np.int64)))
+    targets = np.concatenate((graph.indices[keep], np.array([e[1] for e in added], dtype=np.int64)))
+    new_weights = np.concatenate((weights[keep], np.array([e[2] for e in added], dtype=np.int64)))
+    return CSRGraph.from_edges(graph.num_nodes, sources, targets, new_weights), changes
+
+
+def _subtree_nodes(predecessors, roots, num_nodes):
+    """Nodos de los subárboles (según predecessors) que cuelgan de roots, incluidas las raíces."""
+    parents = np.frombuffer(predecessors, dtype=np.int64)
+    has_parent = parents != NO_PREDECESSOR
+    children_order = np.argsort(parents, kind='stable')[np.count_nonzero(~has_parent):]
+    children_indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(np.bincount(parents[has_parent], minlength=num_nodes), out=children_indptr[1:])
+
+    affected = set(roots)
+    stack = list(affected)
+    while stack:
+        node = stack.pop()
+        for child in children_order[children_indptr[node]:children_indptr[node + 1]].tolist():
+            if child not in affected:
+                affected.add(child)
+                stack.append(child)
+    return affected
+
+
+def _propagate(graph, distances, predecessors, seeds):
+    """
+    Cola de trabajo desde los nodos que cambiaron hasta el punto fijo. Devuelve True si detecta un
+    ciclo negativo: partiendo de cotas válidas, sin ciclos negativos cada nodo entra como mucho |V| veces.
+    """
+    num_nodes = graph.num_nodes
+    enqueue_counts = array('l', [0]) * num_nodes
+    in_queue = bytearray(num_nodes)
+    queue = deque()
+    for node in seeds:
+        if not in_queue[node]:
+            in_queue[node] = 1
+            queue.append(node)
+
+    indptr, indices, weights = graph.indptr, graph.indices, graph.weights
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        distance_u = distances[u]
+        start, end = indptr[u], indptr[u + 1]
+        for v, weight in zip(indices[start:end].tolist(), weights[start:end].tolist()):
+            if distance_u + weight < distances[v]:
+                distances[v] = distance_u + weight
+                predecessors[v] = u
+                if not in_queue[v]:
+                    enqueue_counts[v] += 1
+                    if enqueue_counts[v] > num_nodes:
+                        return True
+                    in_queue[v] = 1
+                    queue.append(v)
+    return False
+
+
+def _best_incoming(graph, distances, predecessors, affected):
+    """
+    Para cada nodo afectado (ya en ∞), la mejor arista entrante desde un nodo no afectado con
+    distancia finita. Recorre las aristas con NumPy en una sola pasada; el bucle de Python solo
+    visita las aristas que entran en el subárbol.
+    """
+    mask = np.zeros(graph.num_nodes, dtype=bool)
+    mask[list(affected)] = True
+    incoming = np.flatnonzero(mask[graph.indices])
+    sources = graph.edge_sources()[incoming].tolist()
+    for source, target, weight in zip(sources, graph.indices[incoming].tolist(), graph.weights[incoming].tolist()):
+        if distances[source] + weight < distances[target]:
+            distances[target] = distances[source] + weight
+            predecessors[target] = source
+
+
+def repair_tree(tree, graph, changes):
+    """
+    Árbol de caminos mínimos de graph (ya editado) a partir del árbol del grafo anterior y de los
+    cambios aplicados. Devuelve None si el árbol anterior no es reparable (tenía un ciclo negativo).
+    """
+    if tree.negative_cycle:
+        return None
+    distances = array('d', tree.distances)
+    predecessors = array('q', tree.predecessors)
+    seeds = []
+
+    # 1. Aumentos y borrados de aristas del árbol: se invalida el subárbol que cuelga de ellas
+    cut_roots = [
+        change.target for change in changes
+        if change.old_weight is not None
+        and (change.new_weight is None or change.new_weight > change.old_weight)
+        and predecessors[change.target] == change.source
+    ]
+    if cut_roots:
+        affected = _subtree_nodes(predecessors, cut_roots, graph.num_nodes)
+        for node in affected:
+            distances[node] = INF
+            predecessors[node] = NO_PREDECESSOR
+        _best_incoming(graph, distances, predecessors, affected)
+        seeds.extend(node for node in affected if distances[node] != INF)
+
+    # 2. Disminuciones e inserciones
+    for change in changes:
+        if change.new_weight is None:
+            continue
+        candidate = distances[change.source] + change.new_weight
+        if candidate < distances[change.target]:
+            distances[change.target] = candidate
+            predecessors[change.target] = change.source
+            seeds.append(change.target)
+
+    # 3. Propagación hasta el punto fijo
+    negative_cycle = _propagate(graph, distances, predecessors, seeds)
+    return ShortestPathTree(tree.source, distances, predecessors, negative_cycle)
@@ -0,0 +1,125 @@
+# backend/graph_binary.py
+"""
+Formato binario del grafo CSR (.ogcsr), para disco y para la red.
+
+Cabecera de 64 bytes (little-endian) seguida de los arreglos CSR tal cual están en memoria:
+
+    offset  tamaño  campo
+    0       8       magic  b"OGCSR\\x00\\x00\\x01"
+    8       4       versión (uint32)
+    12      4       flags (uint32; bit 0 = grafo dirigido)
+    16      8       num_nodes (int64)
+    24      8       num_edges (int64)
+    32      32      reservado (ceros)
+    64      ...     indptr  int64[num_nodes + 1]
+    ...     ...     indices int32[num_edges]   (relleno hasta múltiplo de 8)
+    ...     ...     weights int64[num_edges]
+
+Como los arreglos se guardan con el mismo dtype que usa CSRGraph, cargar el grafo no requiere
+parsear ni copiar: desde bytes se crean vistas con np.frombuffer y desde disco con np.memmap,
+de modo que varios procesos que abren el mismo archivo comparten las páginas del sistema operativo.
+"""
+
+import struct
+
+import numpy as np
+
+from graph_core import CSRGraph
+
+MAGIC = b"OGCSR\x00\x00\x01"
+VERSION = 1
+HEADER_SIZE = 64
+FILE_EXTENSION = ".ogcsr"
+MIMETYPE = "application/octet-stream"
+
+_HEADER = struct.Struct("<8sIIqq")
+_FLAG_DIRECTED = 1
+
+
+class BinaryGraphFormatError(ValueError):
+    """El contenido no es un grafo .ogcsr válido."""
+
+
+def _layout(num_nodes, num_edges):
+    """Offsets de (indptr, indices, weights) y tamaño total del archivo."""
+    indptr_offset = HEADER_SIZE
+    indices_offset = indptr_offset + 8 * (num_nodes + 1)
+    weights_offset = indices_offset + 4 * num_edges
+    weights_offset += -weights_offset % 8
+    return indptr_offset, indices_offset, weights_offset, weights_offset + 8 * num_edges
+
+
+def to_bytes(graph, is_directed):
+    """Serializa el grafo al formato binario."""
+    _, indices_offset, weights_offset, total = _layout(graph.num_nodes, graph.num_edges)
+    buffer = bytearray(total)
+    _HEADER.pack_into(buffer, 0, MAGIC, VERSION, _FLAG_DIRECTED if is_directed else 0, graph.num_nodes, graph.num_edges)
+    buffer[HEADER_SIZE:indices_offset] = np.ascontiguousarray(graph.indptr, dtype='<i8').tobytes()
+    buffer[indices_offset:indices_offset + 4 * graph.num_edges] = np.ascontiguousarray(graph.indices, dtype='<i4').tobytes()
+    buffer[weights_offset:] = np.ascontiguousarray(graph.weights, dtype='<i8').tobytes()
+    return bytes(buffer)
+
+
+def write_graph(path, graph, is_directed):
+    with open(path, 'wb') as f:
+        f.write(to_bytes(graph, is_directed))
+
+
+def _read_header(header, available_bytes):
+    if available_bytes < HEADER_SIZE:
+        raise BinaryGraphFormatError("Archivo de grafo binario truncado (cabecera incompleta).")
+    magic, version, flags, num_nodes, num_edges = _HEADER.unpack_from(header, 0)
+    if magic != MAGIC:
+        raise BinaryGraphFormatError("No es un grafo binario .ogcsr (magic incorrecto).")
+    if version != VERSION:
+        raise BinaryGraphFormatError(f"Versión de grafo binario no soportada: {version}.")
+    if num_nodes < 0 or num_edges < 0:
+        raise BinaryGraphFormatError("Cabecera de grafo binario inválida.")
+    layout = _layout(num_nodes, num_edges)
+    if available_bytes < layout[3]:
+        raise BinaryGraphFormatError("Archivo de grafo binario truncado.")
+    return bool(flags & _FLAG_DIRECTED), num_nodes, num_edges, layout
+
+
+def validate_csr(graph):
+    """Comprueba la estructura CSR canónica (offsets monótonos, destinos en rango y ordenados por fila)."""
+    indptr, indices = graph.indptr, graph.indices
+    if indptr[0] != 0 or indptr[-1] != len(indices) or (np.diff(indptr) < 0).any():
+        raise BinaryGraphFormatError("indptr inválido en el grafo binario.")
+    if len(indices) and (indices.min() < 0 or indices.max() >= graph.num_nodes):
+        raise BinaryGraphFormatError("El grafo binario tiene destinos fuera de rango.")
+    if len(indices) > 1:
+        increasing = np.diff(indices) > 0
+        row_starts = indptr[1:-1]
+        row_starts = row_starts[(row_starts > 0) & (row_starts < len(indices))]
+        increasing[row_starts - 1] = True
+        if not increasing.all():
+            raise BinaryGraphFormatError("Las filas del grafo binario deben estar ordenadas por destino y sin repetidos.")
+
+
+def _graph_from_buffer(buffer, layout, num_nodes, num_edges):
+    indptr_offset, indices_offset, weights_offset, _ = layout
+    return CSRGraph(
+        np.frombuffer(buffer, dtype='<i8', count=num_nodes + 1, offset=indptr_offset),
+        np.frombuffer(buffer, dtype='<i4', count=num_edges, offset=indices_offset),
+        np.frombuffer(buffer, dtype='<i8', count=num_edges, offset=weights_offset),
+    )
+
+
+def from_bytes(data, validate=True):
+    """(CSRGraph, is_directed) con vistas sin copia sobre data (bytes recibidos por la red)."""
+    is_directed, num_nodes, num_edges, layout = _read_header(data, len(data))
+    graph = _graph_from_buffer(data, layout, num_nodes, num_edges)
+    if validate:
+        validate_csr(graph)
+    return graph, is_directed
+
+
+def load_graph(path, validate=True):
+    """(CSRGraph, is_directed) mapeado en memoria desde disco con np.memmap (solo lectura)."""
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    is_directed, num_nodes, num_edges, layout = _read_header(mapped[:HEADER_SIZE].tobytes(), len(mapped))
+    graph = _graph_from_buffer(mapped, layout, num_nodes, num_edges)
+    if validate:
+        validate_csr(graph)
+    return graph, is_directed
@@ -0,0 +1,403 @@
+# backend/graph_core.py
+"""
+Núcleo compacto del grafo: lista de adyacencia en formato CSR sobre arreglos de NumPy
+y arreglos tipados para el estado de los algoritmos (distancias y predecesores).
+
+Un grafo con E aristas ocupa ~12 bytes por arista (int32 destino + int64 peso) y 8 bytes
+por nodo (offsets), frente a los cientos de bytes por entrada de un dict de dicts.
+"""
+
+import hashlib
+from array import array
+from bisect import bisect_left
+
+import numpy as np
+
+INF = float('inf')
+NO_PREDECESSOR = -1
+# Por debajo de este tamaño de frontera el BFS expande nodo a nodo en lugar de vectorizado
+NARROW_FRONTIER = 32
+
+
+class CSRRow:
+    """Vista de las aristas salientes de un nodo; imita la interfaz de dict usada por los algoritmos."""
+
+    __slots__ = ('_pairs',)
+
+    def __init__(self, pairs):
+        self._pairs = pairs
+
+    def items(self):
+        return self._pairs
+
+    def keys(self):
+        return [v for v, _ in self._pairs]
+
+    def __iter__(self):
+        return (v for v, _ in self._pairs)
+
+    def __len__(self):
+        return len(self._pairs)
+
+    def _position(self, v):
+        # (v,) precede a cualquier (v, peso), así que bisect encuentra la primera arista hacia v
+        k = bisect_left(self._pairs, (v,))
+        return k if k < len(self._pairs) and self._pairs[k][0] == v else None
+
+    def __contains__(self, v):
+        return self._position(v) is not None
+
+    def __getitem__(self, v):
+        k = self._position(v)
+        if k is None:
+            raise KeyError(v)
+        return self._pairs[k][1]
+
+
+class CSRGraph:
+    """
+    Grafo dirigido en formato CSR: las aristas salientes de u son
+    indices[indptr[u]:indptr[u+1]] con pesos weights[indptr[u]:indptr[u+1]],
+    ordenadas por destino dentro de cada fila.
+    """
+
+    __slots__ = ('num_nodes', 'indptr', 'indices', 'weights', '_sources', '_content_hash', '_reverse', '_rows')
+
+    def __init__(self, indptr, indices, weights):
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.indices = np.asarray(indices, dtype=np.int32)
+        self.weights = np.asarray(weights, dtype=np.int64)
+        self.num_nodes = len(self.indptr) - 1
+        self._sources = None
+        self._content_hash = None
+        self._reverse = None
+        self._rows = None
+
+    @classmethod
+    def from_edges(cls, num_nodes, sources, targets, weights, symmetrize=False):
+        """
+        Construye el grafo a partir de arreglos paralelos de aristas.
+        Las aristas repetidas conservan el menor peso. Con symmetrize=True se añade (v, u)
+        para cada (u, v) cuya inversa no fue dada (igual que la celda simétrica vacía de la matriz).
+        """
+        sources = np.asarray(sources, dtype=np.int64)
+        targets = np.asarray(targets, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.int64)
+
+        # Ordenar por (origen, destino, peso) y quedarse con la primera arista de cada par
+        order = np.lexsort((weights, targets, sources))
+        sources, targets, weights = sources[order], targets[order], weights[order]
+        if len(sources):
+            first = np.ones(len(sources), dtype=bool)
+            first[1:] = (sources[1:] != sources[:-1]) | (targets[1:] != targets[:-1])
+            sources, targets, weights = sources[first], targets[first], weights[first]
+
+        if symmetrize and len(sources):
+            keys = sources * num_nodes + targets
+            reverse_keys = targets * num_nodes + sources
+            missing = (sources != targets) & ~np.isin(reverse_keys, keys)
+            sources, targets, weights = (
+                np.concatenate((sources, targets[missing])),
+                np.concatenate((targets, sources[missing])),
+                np.concatenate((weights, weights[missing])),
+            )
+            order = np.lexsort((targets, sources))
+            sources, targets, weights = sources[order], targets[order], weights[order]
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources, minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, targets, weights)
+
+    @classmethod
+    def from_dense_cells(cls, num_nodes, positions, weights, symmetrize=False):
+        """
+        Construye el grafo a partir de las celdas con peso de una matriz densa n×n, dadas por su
+        posición fila-mayor (i · n + j, ordenadas y sin repetir). Ya vienen en orden CSR, así que
+        no hace falta ordenar; symmetrize copia el peso de (j, i) en cada celda (i, j) vacía.
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        weights = np.asarray(weights, dtype=np.int64)
+        if symmetrize and len(positions):
+            present = np.zeros(num_nodes * num_nodes, dtype=bool)
+            present[positions] = True
+            dense_weights = np.zeros(num_nodes * num_nodes, dtype=np.int64)
+            dense_weights[positions] = weights
+            present = present.reshape(num_nodes, num_nodes)
+            dense_weights = dense_weights.reshape(num_nodes, num_nodes)
+            weights = np.where(present, dense_weights, dense_weights.T)[present | present.T]
+            positions = np.flatnonzero(present | present.T)
+
+        indptr = np.zeros(num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(positions // max(num_nodes, 1), minlength=num_nodes), out=indptr[1:])
+        return cls(indptr, positions % max(num_nodes, 1), weights)
+
+    @classmethod
+    def from_adjacency(cls, graph, num_nodes):
+        """Convierte una lista de adyacencia {u: {v: peso}} a CSR."""
+        sources, targets, weights = [], [], []
+        for u in range(num_nodes):
+            for v, weight in graph[u].items():
+                sources.append(u)
+                targets.append(v)
+                weights.append(weight)
+        return cls.from_edges(num_nodes, sources, targets, weights)
+
+    def __len__(self):
+        return self.num_nodes
+
+    def __getitem__(self, u):
+        return CSRRow(self.rows()[u])
+
+    @property
+    def num_edges(self):
+        return len(self.indices)
+
+    @property
+    def nbytes(self):
+        return self.indptr.nbytes + self.indices.nbytes + self.weights.nbytes
+
+    @property
+    def has_negative_weights(self):
+        return bool(len(self.weights) and self.weights.min() < 0)
+
+    def edge_sources(self):
+        """Origen de cada arista (arreglo paralelo a indices/weights), calculado una sola vez."""
+        if self._sources is None:
+            self._sources = np.repeat(
+                np.arange(self.num_nodes, dtype=np.int32), np.diff(self.indptr)
+            )
+        return self._sources
+
+    def rows(self):
+        """
+        Filas [(v, peso), ...] de cada nodo como listas de Python, calculadas una sola vez.
+        Los bucles escalares las recorren directamente: cortar arreglos de NumPy y llamar a
+        tolist() en cada acceso a una fila cuesta más que relajar las propias aristas. Ocupan
+        tanto como un dict de dicts, por eso solo se construyen cuando un algoritmo escalar las pide.
+        """
+        if self._rows is None:
+            indptr = self.indptr.tolist()
+            pairs = list(zip(self.indices.tolist(), self.weights.tolist()))
+            self._rows = [pairs[indptr[u]:indptr[u + 1]] for u in range(self.num_nodes)]
+        return self._rows
+
+    def reverse(self):
+        """Grafo con todas las aristas invertidas (para búsquedas hacia atrás), calculado una sola vez."""
+        if self._reverse is None:
+            self._reverse = CSRGraph.from_edges(self.num_nodes, self.indices, self.edge_sources(), self.weights)
+        return self._reverse
+
+    def reachable_from(self, source, target=None):
+        """
+        Máscara de los nodos alcanzables desde source (BFS por niveles sobre CSR). Los niveles
+        anchos se expanden vectorizados y los estrechos nodo a nodo, para no pagar el costo fijo
+        de NumPy en cada nivel de un grafo de gran diámetro (p. ej. una cadena). Con target se
+        detiene en cuanto lo alcanza, así que la máscara puede quedar incompleta.
+        """
+        indptr, indices = self.indptr, self.indices
+        reached = np.zeros(self.num_nodes, dtype=bool)
+        reached[source] = True
+        frontier = [source]
+        while len(frontier) and not (target is not None and reached[target]):
+            if len(frontier) < NARROW_FRONTIER:
+                next_frontier = []
+                for u in frontier:
+                    for v in indices[indptr[u]:indptr[u + 1]].tolist():
+                        if not reached[v]:
+                            reached[v] = True
+                            next_frontier.append(v)
+                frontier = next_frontier
+                continue
+            frontier = np.asarray(frontier, dtype=np.int64)
+            starts = indptr[frontier]
+            lengths = indptr[frontier + 1] - starts
+            # Posiciones de todas las aristas salientes de la frontera, fila tras fila
+            offsets = np.repeat(starts - np.cumsum(lengths) + lengths, lengths) + np.arange(lengths.sum())
+            neighbors = indices[offsets]
+            frontier = np.unique(neighbors[~reached[neighbors]])
+            reached[frontier] = True
+        return reached
+
+    def path_nodes(self, source, target):
+        """
+        Máscara de los nodos que están en algún camino source -> target (alcanzables desde source
+        y que alcanzan target). Si target es inalcanzable la máscara no lo incluye.
+        """
+        forward = self.reachable_from(source)
+        if not forward[target]:
+            return forward & False
+        return forward & self.reverse().reachable_from(target)
+
+    def subgraph(self, mask):
+        """Grafo con los mismos nodos pero solo las aristas entre nodos de mask."""
+        sources = self.edge_sources()
+        keep = mask[sources] & mask[self.indices]
+        if keep.all():
+            return self
+        indptr = np.zeros(self.num_nodes + 1, dtype=np.int64)
+        np.cumsum(np.bincount(sources[keep], minlength=self.num_nodes), out=indptr[1:])
+        return CSRGraph(indptr, self.indices[keep], self.weights[keep])
+
+    def content_hash(self):
+        """SHA-256 de los arreglos CSR canónicos: dos grafos con las mismas aristas tienen el mismo hash."""
+        if self._content_hash is None:
+            digest = hashlib.sha256()
+            digest.update(np.int64(self.num_nodes).tobytes())
+            for arr in (self.indptr, self.indices, self.weights):
+                digest.update(np.ascontiguousarray(arr).tobytes())
+            self._content_hash = digest.hexdigest()
+        return self._content_hash
+
+    def to_adjacency(self):
+        """Devuelve la lista de adyacencia {u: {v: peso}} equivalente."""
+        return {u: dict(self[u].items()) for u in range(self.num_nodes)}
+
+
+# =======================================================
+# ESTADO TIPADO DE LOS ALGORITMOS
+# =======================================================
+def adjacency_rows(graph):
+    """
+    Filas [(v, peso), ...] indexables por nodo para los bucles escalares: las cacheadas del
+    CSR, o las vistas items() de una lista de adyacencia {u: {v: peso}}.
+    """
+    if isinstance(graph, CSRGraph):
+        return graph.rows()
+    return [graph[u].items() for u in range(len(graph))]
+
+
+def new_distances(num_nodes, start_node):
+    """Arreglo float64 de distancias (∞ salvo el origen). np.frombuffer lo expone sin copia."""
+    distances = array('d', [INF]) * num_nodes
+    distances[start_node] = 0
+    return distances
+
+
+def new_predecessors(num_nodes):
+    """Arreglo int64 de predecesores; NO_PREDECESSOR marca nodos sin predecesor."""
+    return array('q', [NO_PREDECESSOR]) * num_nodes
+
+
+def as_distance(value):
+    """Convierte una distancia del arreglo float64 al entero original (o INF si es inalcanzable)."""
+    if value is None or value == INF:
+        return INF
+    return int(value)
+
+
+def display_distance(value):
+    """Distancia tal como se muestra en los pasos: entero, o "∞" si es inalcanzable."""
+    return int(value) if value != INF else "∞"
+
+
+def extract_path(predecessors, start_node, end_node):
+    """Reconstruye el camino start_node -> end_node; devuelve [] si no existe."""
+    path = [end_node]
+    current = end_node
+    while current != start_node:
+        current = predecessors[current]
+        if current == NO_PREDECESSOR or len(path) > len(predecessors):
+            return []
+        path.append(current)
+    path.reverse()
+    return path
+
+
+def _read_cycle(predecessors, node):
+    """Vuelta completa del ciclo de predecesores que contiene node, en el sentido de las aristas."""
+    cycle = [node]
+    current = predecessors[node]
+    while current != node:
+        cycle.append(current)
+        current = predecessors[current]
+    cycle.reverse()
+    return cycle
+
+
+def predecessor_cycle(predecessors, node):
+    """
+    Ciclo del grafo de predecesores al que se llega retrocediendo desde node, o None si la cadena
+    termina en un nodo sin predecesor. Tras |V| pasos hacia atrás se está necesariamente dentro
+    del ciclo; desde ahí se lee una vuelta.
+    """
+    for _ in range(len(predecessors)):
+        node = predecessors[node]
+        if node == NO_PREDECESSOR:
+            return None
+    return _read_cycle(predecessors, node)
+
+
+def find_predecessor_cycle(predecessors):
+    """Algún ciclo del grafo de predecesores (un solo recorrido, O(V)), o None si es un bosque."""
+    # 0: sin visitar, 1: en la cadena que se está recorriendo, 2: cadena ya descartada
+    state = bytearray(len(predecessors))
+    for start in range(len(predecessors)):
+        chain = []
+        node = start
+        while node != NO_PREDECESSOR and not state[node]:
+            state[node] = 1
+            chain.append(node)
+            node = predecessors[node]
+        if node != NO_PREDECESSOR and state[node] == 1:
+            return _read_cycle(predecessors, node)
+        for visited in chain:
+            state[visited] = 2
+    return None
+
+
+class NegativeCycle:
+    """Ciclo de peso negativo: nodos en el sentido de las aristas (sin repetir el primero) y peso total."""
+
+    __slots__ = ('nodes', 'weight')
+
+    def __init__(self, nodes, weight):
+        self.nodes = nodes
+        self.weight = weight
+
+    @classmethod
+    def from_nodes(cls, graph, nodes):
+        nodes = [int(node) for node in nodes]
+        return cls(nodes, sum(graph[u][v] for u, v in zip(nodes, nodes[1:] + nodes[:1])))
+
+
+class ShortestPathTree:
+    """
+    Árbol de caminos mínimos desde un origen: distancias y predecesores de todos los nodos.
+    Permite responder consultas a cualquier destino reconstruyendo el camino en O(longitud).
+    Si negative_cycle es True, cycle puede traer el NegativeCycle que lo provocó.
+    """
+
+    __slots__ = ('source', 'distances', 'predecessors', 'negative_cycle', 'cycle')
+
+    def __init__(self, source, distances, predecessors, negative_cycle=False, cycle=None):
+        self.source = source
+        self.distances = distances
+        self.predecessors = predecessors
+        self.negative_cycle = negative_cycle
+        self.cycle = cycle
+
+    @classmethod
+    def from_numpy(cls, source, distances, predecessors, negative_cycle=False, cycle=None):
+        """Convierte arreglos de NumPy (motores vectorizados) a los arreglos tipados estándar."""
+        typed_distances = array('d')
+        typed_distances.frombytes(np.ascontiguousarray(distances, dtype=np.float64).tobytes())
+        typed_predecessors = array('q')
+        typed_predecessors.frombytes(np.ascontiguousarray(predecessors, dtype=np.int64).tobytes())
+        return cls(source, typed_distances, typed_predecessors, negative_cycle, cycle)
+
+    @property
+    def nbytes(self):
+        return self.distances.itemsize * len(self.distances) + self.predecessors.itemsize * len(self.predecessors)
+
+    def path_to(self, target):
+        """(distancia, camino) hasta target con las mismas convenciones que dijkstra()/bellman_ford()."""
+        if target == self.source:
+            return 0, [self.source]
+        if self.negative_cycle:
+            return None, "Ciclo Negativo Detectado"
+        if self.distances[target] == INF:
+            return INF, []
+        path = extract_path(self.predecessors, self.source, target)
+        if not path:
+            return INF, []
+        return as_distance(self.distances[target]), path
@@ -0,0 +1,114 @@
+# backend/graph_registry.py
+"""
+Registro de grafos compilados: el cliente sube el grafo una vez (POST /graphs) y luego
+consulta por su ID, sin volver a enviar ni parsear la matriz.
+
+El ID es el hash de contenido del grafo CSR ya compilado (simetrizado si es no dirigido),
+por lo que el mismo grafo enviado como matriz, lista de aristas o CSR recibe el mismo ID. Un mismo
+contenido no puede registrarse a la vez como dirigido y como no dirigido (GraphRegistryConflict).
+Los grafos viven en un LRU acotado por memoria (bytes de los arreglos CSR).
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+class GraphRegistryConflict(ValueError):
+    """Ya hay un grafo registrado con el mismo contenido y otro valor de is_directed."""
+
+
+class CompiledGraph:
+    """Grafo ya validado y compilado, listo para consultar."""
+
+    __slots__ = ('graph_id', 'graph', 'num_nodes', 'has_negative_weights', 'is_directed')
+
+    def __init__(self, graph, is_directed):
+        self.graph_id = graph.content_hash()
+        self.graph = graph
+        self.num_nodes = graph.num_nodes
+        self.has_negative_weights = graph.has_negative_weights
+        self.is_directed = bool(is_directed)
+
+    @property
+    def nbytes(self):
+        return self.graph.nbytes
+
+    def describe(self):
+        return {
+            'graph_id': self.graph_id,
+            'num_nodes': self.num_nodes,
+            'num_edges': self.graph.num_edges,
+            'is_directed': self.is_directed,
+            'has_negative_weights': self.has_negative_weights,
+            'nbytes': self.nbytes,
+        }
+
+
+class GraphRegistry:
+    """LRU de CompiledGraph con desalojo por memoria total; seguro entre hilos."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def add(self, graph, is_directed):
+        """
+        Registra el grafo (o renueva el existente con el mismo hash) y devuelve su entrada.
+        GraphRegistryConflict si el existente se registró con otro is_directed.
+        """
+        entry = CompiledGraph(graph, is_directed)
+        with self._lock:
+            existing = self._entries.get(entry.graph_id)
+            if existing is not None:
+                if existing.is_directed != entry.is_directed:
+                    raise GraphRegistryConflict(
+                        f"El grafo {entry.graph_id} ya está registrado como "
+                        f"{'dirigido' if existing.is_directed else 'no dirigido'}; elimínelo antes de "
+                        f"registrarlo con otro is_directed."
+                    )
+                self._entries.move_to_end(entry.graph_id)
+                return existing
+            self._entries[entry.graph_id] = entry
+            self._total_bytes += entry.nbytes
+            self._evict()
+        return entry
+
+    def get(self, graph_id):
+        """Devuelve la entrada (marcándola como usada recientemente) o None si no existe."""
+        with self._lock:
+            entry = self._entries.get(graph_id)
+            if entry is not None:
+                self._entries.move_to_end(graph_id)
+            return entry
+
+    def remove(self, graph_id):
+        with self._lock:
+            entry = self._entries.pop(graph_id, None)
+            if entry is not None:
+                self._total_bytes -= entry.nbytes
+            return entry is not None
+
+    def _evict(self):
+        # Siempre se conserva el grafo recién añadido, aunque por sí solo supere el límite
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            _, evicted = self._entries.popitem(last=False)
+            self._total_bytes -= evicted.nbytes
+
+    def __contains__(self, graph_id):
+        with self._lock:
+            return graph_id in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'graphs': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
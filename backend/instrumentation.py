@@ -0,0 +1,235 @@
+# backend/instrumentation.py
+"""
+Instrumentación por solicitud: fases, contadores de operaciones, histogramas y perfilado.
+
+- RequestMetrics: tiempos por fase (parse, build, algorithm, serialize) y contadores de la
+  solicitud en curso (relaxations, heap_pushes, heap_pops, steps). Vive en un ContextVar, así que
+  cada hilo del servidor ve solo la suya; fuera de una solicitud lap() y count() no hacen nada.
+- Los algoritmos acumulan sus contadores en variables locales y llaman a count() una vez al
+  terminar, de modo que el bucle interno no paga la instrumentación.
+- MetricsRegistry: histogramas acumulados de latencia por ruta y por fase, y totales de los
+  contadores, expuestos en /metrics (formato de texto de Prometheus).
+- profiled: con ?profile=1 la ruta se ejecuta bajo cProfile y la respuesta JSON incluye un
+  resumen con las funciones de mayor tiempo acumulado.
+"""
+
+import cProfile
+import functools
+import pstats
+import threading
+import time
+from contextvars import ContextVar
+
+from flask import request
+
+from serialization import json_response
+
+# Límites superiores (segundos) de los buckets de los histogramas de latencia
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Funciones incluidas en el resumen de ?profile=1
+PROFILE_TOP_FUNCTIONS = 30
+
+_current = ContextVar('request_metrics', default=None)
+
+
+class RequestMetrics:
+    """Fases y contadores de una solicitud. Cada lap() cierra la fase que empezó en el lap anterior."""
+
+    __slots__ = ('started', 'phases', 'counters', '_last')
+
+    def __init__(self):
+        self.started = self._last = time.perf_counter()
+        self.phases = {}
+        self.counters = {}
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - self._last
+        self._last = now
+
+    def count(self, counters):
+        for name, amount in counters.items():
+            self.counters[name] = self.counters.get(name, 0) + amount
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+    def server_timing(self):
+        """Valor de la cabecera Server-Timing: duración (ms) de cada fase y del total, y los contadores."""
+        entries = [f"{phase};dur={seconds * 1000:.3f}" for phase, seconds in self.phases.items()]
+        entries.append(f"total;dur={self.elapsed() * 1000:.3f}")
+        entries.extend(f'{name};desc="{amount}"' for name, amount in self.counters.items())
+        return ", ".join(entries)
+
+
+def start_request():
+    """Activa las métricas de la solicitud actual; devuelve el token para finish_request."""
+    metrics = RequestMetrics()
+    return metrics, _current.set(metrics)
+
+
+def finish_request(token):
+    _current.reset(token)
+
+
+def current_metrics():
+    return _current.get()
+
+
+def lap(phase):
+    """Cierra la fase phase de la solicitud actual (no hace nada fuera de una solicitud)."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.lap(phase)
+
+
+def count(**counters):
+    """Suma contadores de operaciones a la solicitud actual (no hace nada fuera de una solicitud)."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.count(counters)
+
+
+# =======================================================
+# HISTOGRAMAS (/metrics)
+# =======================================================
+class Histogram:
+    """Histograma acumulado con buckets fijos, como los de Prometheus."""
+
+    __slots__ = ('bucket_counts', 'count', 'sum')
+
+    def __init__(self):
+        self.bucket_counts = [0] * len(LATENCY_BUCKETS)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.count += 1
+        self.sum += value
+        for i, upper in enumerate(LATENCY_BUCKETS):
+            if value <= upper:
+                self.bucket_counts[i] += 1
+                break
+
+    def cumulative_buckets(self):
+        """[(límite superior, observaciones <= límite)] incluyendo +Inf."""
+        total, buckets = 0, []
+        for upper, bucket_count in zip(LATENCY_BUCKETS, self.bucket_counts):
+            total += bucket_count
+            buckets.append((upper, total))
+        buckets.append((float('inf'), self.count))
+        return buckets
+
+
+class MetricsRegistry:
+    """Latencias por ruta y por fase, y totales de contadores, de todas las solicitudes; seguro entre hilos."""
+
+    def __init__(self):
+        self._request_latency = {}
+        self._phase_latency = {}
+        self._counters = {}
+        self._lock = threading.Lock()
+
+    def record(self, endpoint, metrics):
+        elapsed = metrics.elapsed()
+        with self._lock:
+            self._request_latency.setdefault(endpoint, Histogram()).observe(elapsed)
+            for phase, seconds in metrics.phases.items():
+                self._phase_latency.setdefault((endpoint, phase), Histogram()).observe(seconds)
+            for name, amount in metrics.counters.items():
+                self._counters[name] = self._counters.get(name, 0) + amount
+
+    def counters(self):
+        with self._lock:
+            return dict(self._counters)
+
+    def prometheus_text(self):
+        """Exposición en formato de texto de Prometheus (version 0.0.4)."""
+        lines = []
+        with self._lock:
+            lines.append("# HELP http_request_duration_seconds Latencia de las solicitudes por ruta.")
+            lines.append("# TYPE http_request_duration_seconds histogram")
+            for endpoint, histogram in sorted(self._request_latency.items()):
+                lines.extend(_histogram_lines('http_request_duration_seconds', f'endpoint="{endpoint}"', histogram))
+            lines.append("# HELP request_phase_duration_seconds Duración de cada fase de la solicitud.")
+            lines.append("# TYPE request_phase_duration_seconds histogram")
+            for (endpoint, phase), histogram in sorted(self._phase_latency.items()):
+                lines.extend(_histogram_lines('request_phase_duration_seconds', f'endpoint="{endpoint}",phase="{phase}"', histogram))
+            lines.append("# HELP algorithm_operations_total Operaciones de los algoritmos (relajaciones, cola de prioridad, pasos).")
+            lines.append("# TYPE algorithm_operations_total counter")
+            for name, amount in sorted(self._counters.items()):
+                lines.append(f'algorithm_operations_total{{operation="{name}"}} {amount}')
+        return "\n".join(lines) + "\n"
+
+    def clear(self):
+        with self._lock:
+            self._request_latency.clear()
+            self._phase_latency.clear()
+            self._counters.clear()
+
+
+def _histogram_lines(name, labels, histogram):
+    for upper, cumulative in histogram.cumulative_buckets():
+        bound = "+Inf" if upper == float('inf') else repr(upper)
+        yield f'{name}_bucket{{{labels},le="{bound}"}} {cumulative}'
+    yield f'{name}_sum{{{labels}}} {histogram.sum:.6f}'
+    yield f'{name}_count{{{labels}}} {histogram.count}'
+
+
+# =======================================================
+# PERFILADO (?profile=1)
+# =======================================================
+def profile_summary(profiler, top=PROFILE_TOP_FUNCTIONS):
+    """Funciones con mayor tiempo acumulado: llamadas, tiempo propio y tiempo acumulado (segundos)."""
+    stats = pstats.Stats(profiler)
+    rows = sorted(stats.stats.items(), key=lambda item: item[1][3], reverse=True)[:top]
+    return {
+        'total_seconds': stats.total_tt,
+        'sort': 'cumulative',
+        'functions': [
+            {
+                'function': f"{filename}:{line}({name})",
+                'calls': calls,
+                'primitive_calls': primitive_calls,
+                'own_seconds': own_time,
+                'cumulative_seconds': cumulative_time,
+            }
+            for (filename, line, name), (primitive_calls, calls, own_time, cumulative_time, _) in rows
+        ],
+    }
+
+
+def profiled(view):
+    """
+    Decorador de rutas: con ?profile=1 ejecuta la vista bajo cProfile y añade 'profile' a la
+    respuesta JSON. Las respuestas transmitidas por partes (stream) se devuelven sin perfil,
+    porque el trabajo ocurre después de que la vista retorna.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        if request.args.get('profile') != '1':
+            return view(*args, **kwargs)
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Ya hay otro perfilador activo en el intérprete
+            return view(*args, **kwargs)
+        try:
+            result = view(*args, **kwargs)
+        finally:
+            profiler.disable()
+
+        response, status = (result if isinstance(result, tuple) else (result, None))
+        if response.is_streamed or response.mimetype != 'application/json':
+            return result
+        payload = response.get_json()
+        if not isinstance(payload, dict):
+            return result
+        payload['profile'] = profile_summary(profiler)
+        profiled_response = json_response(payload, status or response.status_code)
+        for header, value in response.headers.items():
+            if header not in ('Content-Type', 'Content-Length'):
+                profiled_response.headers.add(header, value)
+        return profiled_response
+    return wrapper
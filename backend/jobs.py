@@ -0,0 +1,252 @@
+# backend/jobs.py
+"""
+Cola de trabajos asíncronos para cálculos largos (p. ej. Bellman-Ford con pasos sobre miles de nodos).
+
+POST /jobs encola el trabajo y devuelve su job_id de inmediato; un pool de hilos en segundo plano
+lo ejecuta mientras el cliente consulta el estado y el progreso (GET /jobs/<id>, o
+/jobs/<id>/events como NDJSON) y finalmente el resultado (GET /jobs/<id>/result).
+
+La cancelación y los límites son cooperativos: el trabajo recorre los pasos del algoritmo a través
+de Job.track_steps, que en cada paso actualiza el progreso y comprueba si se pidió cancelar, si se
+superó el tiempo límite o si la memoria estimada de la traza supera el límite de memoria. Las
+ejecuciones sin pasos (árbol completo) llaman a checkpoint() una vez por pase de relajación o cada
+CHECKPOINT_POPS extracciones de la cola; dentro de un trabajo comprueba cancelación y tiempo, y
+fuera de él no hace nada.
+
+La cola de espera está acotada (max_pending): con ella llena submit lanza JobQueueFull. Los
+trabajos terminados se guardan en un almacén acotado por número (los más antiguos se descartan).
+"""
+
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from contextvars import ContextVar
+
+DEFAULT_MAX_WORKERS = 2
+DEFAULT_MAX_JOBS = 128
+# Trabajos que pueden esperar en la cola (sin contar los que están en ejecución)
+DEFAULT_MAX_PENDING = 64
+DEFAULT_TIME_LIMIT = 60.0
+DEFAULT_MEMORY_LIMIT = 256 * 1024 * 1024
+# Los bucles de Dijkstra y A* llaman a checkpoint() cada tantas extracciones de la cola
+CHECKPOINT_POPS = 4096
+
+# Estimación de memoria de un delta: diccionario y descripción, más cada entrada de sus listas
+BYTES_PER_STEP = 600
+BYTES_PER_STEP_ENTRY = 80
+# Un paso completo (trace_format='full') repite distancia y predecesor de cada nodo
+BYTES_PER_FULL_STEP_NODE = 150
+_DELTA_LIST_KEYS = ('distanceChanges', 'predecessorChanges', 'settledNodes', 'updatedNodeIndices')
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+_current_job = ContextVar('current_job', default=None)
+
+
+class JobCancelled(Exception):
+    """Se pidió cancelar el trabajo mientras se ejecutaba."""
+
+
+class JobLimitExceeded(Exception):
+    """El trabajo superó su tiempo o memoria límite."""
+
+
+class JobQueueFull(Exception):
+    """La cola de espera alcanzó max_pending trabajos."""
+
+
+def checkpoint():
+    """Comprueba cancelación y límites del trabajo que se ejecuta en este hilo (si lo hay)."""
+    job = _current_job.get()
+    if job is not None:
+        job.check()
+
+
+def estimate_delta_bytes(delta):
+    entries = sum(len(delta[key]) for key in _DELTA_LIST_KEYS if delta.get(key))
+    return BYTES_PER_STEP + BYTES_PER_STEP_ENTRY * entries
+
+
+def estimate_full_trace_bytes(num_steps, num_nodes):
+    return num_steps * num_nodes * BYTES_PER_FULL_STEP_NODE
+
+
+class Job:
+    """Estado, progreso y resultado de un trabajo. Los campos de progreso los escribe solo el hilo trabajador."""
+
+    def __init__(self, kind, time_limit, memory_limit):
+        self.job_id = uuid.uuid4().hex
+        self.kind = kind
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit
+        self.status = QUEUED
+        self.steps = 0
+        self.iteration = None
+        self.memory_bytes = 0
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.finished = threading.Event()
+        self._cancel_requested = threading.Event()
+        self._deadline = None
+        self._future = None
+
+    # --- Lado del trabajador ---
+    def check(self):
+        """Lanza JobCancelled o JobLimitExceeded si el trabajo debe detenerse."""
+        if self._cancel_requested.is_set():
+            raise JobCancelled()
+        if self._deadline is not None and time.monotonic() > self._deadline:
+            raise JobLimitExceeded(f"Tiempo límite excedido ({self.time_limit:g} s).")
+        if self.memory_limit is not None and self.memory_bytes > self.memory_limit:
+            raise JobLimitExceeded(f"Límite de memoria excedido (~{self.memory_bytes} de {self.memory_limit} bytes).")
+
+    def reserve_memory(self, num_bytes):
+        """Suma memoria estimada (p. ej. la de la respuesta que se va a construir) y comprueba los límites."""
+        self.memory_bytes += num_bytes
+        self.check()
+
+    def track_steps(self, step_iterator):
+        """
+        Generador que reenvía los deltas de step_iterator (y su valor de retorno) actualizando el
+        progreso y comprobando cancelación y límites antes de cada paso.
+        """
+        while True:
+            try:
+                delta = next(step_iterator)
+            except StopIteration as stop:
+                return stop.value
+            self.steps += 1
+            self.iteration = delta.get('iteration', self.iteration)
+            self.memory_bytes += estimate_delta_bytes(delta)
+            self.check()
+            yield delta
+
+    # --- Lado del cliente ---
+    def request_cancel(self):
+        """Cancela el trabajo: si aún está en la cola no llega a ejecutarse; si corre, se detiene en el próximo paso."""
+        self._cancel_requested.set()
+        if self._future is not None and self._future.cancel():
+            self._finish(CANCELLED)
+
+    def _finish(self, status, result=None, error=None):
+        self.status = status
+        self.result = result
+        self.error = error
+        self.finished_at = time.time()
+        self.finished.set()
+
+    def iter_events(self, interval):
+        """
+        Estado del trabajo cada vez que cambia su progreso (comprobado cada interval segundos),
+        terminando con el estado final.
+        """
+        last_progress = None
+        while True:
+            finished = self.finished.wait(interval)
+            state = self.describe()
+            if finished or state['progress'] != last_progress:
+                last_progress = state['progress']
+                yield state
+            if finished:
+                return
+
+    def describe(self):
+        elapsed_until = self.finished_at or time.time()
+        return {
+            'job_id': self.job_id,
+            'kind': self.kind,
+            'status': self.status,
+            'progress': {
+                'steps': self.steps,
+                'iteration': self.iteration,
+                'estimated_bytes': self.memory_bytes,
+            },
+            'elapsed_seconds': round(elapsed_until - self.started_at, 6) if self.started_at else 0.0,
+            'time_limit': self.time_limit,
+            'memory_limit': self.memory_limit,
+            'error': self.error,
+        }
+
+
+class JobQueue:
+    """Pool de hilos que ejecuta los trabajos y almacén acotado de trabajos; seguro entre hilos."""
+
+    def __init__(self, max_workers=DEFAULT_MAX_WORKERS, max_jobs=DEFAULT_MAX_JOBS, max_pending=DEFAULT_MAX_PENDING):
+        self.max_workers = max_workers
+        self.max_jobs = max_jobs
+        self.max_pending = max_pending
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='job')
+        self._jobs = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, kind, task, time_limit=DEFAULT_TIME_LIMIT, memory_limit=DEFAULT_MEMORY_LIMIT):
+        """Encola task(job) -> resultado serializable y devuelve el Job; JobQueueFull si la cola está llena."""
+        job = Job(kind, time_limit, memory_limit)
+        with self._lock:
+            if sum(1 for queued in self._jobs.values() if queued.status == QUEUED) >= self.max_pending:
+                raise JobQueueFull(f"Hay {self.max_pending} trabajos en espera; intente más tarde.")
+            self._jobs[job.job_id] = job
+            self._evict_finished()
+        job._future = self._executor.submit(self._run, job, task)
+        return job
+
+    def _run(self, job, task):
+        if job._cancel_requested.is_set():
+            job._finish(CANCELLED)
+            return
+        job.started_at = time.time()
+        job._deadline = time.monotonic() + job.time_limit if job.time_limit else None
+        job.status = RUNNING
+        token = _current_job.set(job)
+        try:
+            result = task(job)
+        except JobCancelled:
+            job._finish(CANCELLED)
+        except JobLimitExceeded as e:
+            job._finish(FAILED, error=str(e))
+        except Exception as e:
+            job._finish(FAILED, error=f"Error ejecutando el trabajo: {e}")
+        else:
+            job._finish(DONE, result=result)
+        finally:
+            _current_job.reset(token)
+
+    def _evict_finished(self):
+        # Los trabajos en cola o en ejecución no se descartan aunque se supere max_jobs
+        excess = len(self._jobs) - max(1, self.max_jobs)
+        for job_id in [job_id for job_id, job in self._jobs.items() if job.finished.is_set()][:max(0, excess)]:
+            del self._jobs[job_id]
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        job = self.get(job_id)
+        if job is not None and not job.finished.is_set():
+            job.request_cancel()
+        return job
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def stats(self):
+        with self._lock:
+            counts = {}
+            for job in self._jobs.values():
+                counts[job.status] = counts.get(job.status, 0) + 1
+            return {
+                'jobs': len(self._jobs),
+                'by_status': counts,
+                'max_jobs': self.max_jobs,
+                'max_pending': self.max_pending,
+                'workers': self.max_workers,
+            }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,159 @@
+# backend/k_shortest.py
+"""
+Los k caminos simples más cortos entre dos nodos (algoritmo de Yen), para pesos no negativos.
+
+Yen parte del camino mínimo y, para obtener el siguiente, prueba cada nodo del último camino
+como "nodo de desvío": mantiene el prefijo (raíz) hasta ese nodo, prohíbe los nodos de la raíz y
+las aristas con las que los caminos ya aceptados salen de esa misma raíz, y busca el camino
+mínimo restante (camino de desvío). El mejor candidato de todas las iteraciones es el siguiente.
+
+Todas las búsquedas comparten el árbol de caminos mínimos hacia el destino (Dijkstra sobre el
+grafo inverso desde end_node, tomado de la caché de árboles):
+
+- d(v, end_node) del árbol es una cota inferior exacta en el grafo original y sigue siendo válida
+  (y consistente) al prohibir nodos y aristas, así que cada desvío es un A* que avanza casi en
+  línea recta hacia el destino.
+- En cuanto la búsqueda extrae un nodo cuyo camino del árbol hasta el destino no toca nada
+  prohibido, ese camino completa el desvío óptimo: se reutiliza en lugar de seguir buscando
+  (en el propio nodo de desvío, sin expandir ninguna arista).
+
+Las búsquedas de desvío de una misma iteración son independientes; quien llama puede ejecutarlas
+en paralelo pasando run_spur_searches.
+"""
+
+import heapq
+
+from graph_core import INF, NO_PREDECESSOR
+
+DEFAULT_MAX_K = 100
+
+
+def tree_path(next_hops, node, end_node):
+    """Camino node -> end_node siguiendo el árbol hacia el destino, o None si no llega."""
+    path = [node]
+    while node != end_node:
+        node = next_hops[node]
+        if node == NO_PREDECESSOR or len(path) > len(next_hops):
+            return None
+        path.append(node)
+    return path
+
+
+def search_prefix(predecessors, spur_node, node):
+    """Camino spur_node -> node según los predecesores de la búsqueda."""
+    path = [node]
+    while node != spur_node:
+        node = predecessors[node]
+        path.append(node)
+    path.reverse()
+    return path
+
+
+def spur_search(graph, task, end_node, distances_to_end, next_hops):
+    """
+    Camino de desvío (costo, camino) desde task = (nodo de desvío, nodos prohibidos, primeros
+    saltos prohibidos), o None si no existe. Las aristas prohibidas de Yen siempre salen del nodo
+    de desvío, así que basta con prohibir sus destinos en el primer salto.
+    """
+    spur_node, banned_nodes, banned_first_hops = task
+    if distances_to_end[spur_node] == INF:
+        return None
+    banned_nodes = set(banned_nodes)
+    banned_first_hops = set(banned_first_hops)
+    # clean[v]: el camino del árbol desde v hasta el destino no pasa por nodos prohibidos
+    clean = dict.fromkeys(banned_nodes, False)
+    clean[end_node] = True
+
+    def tree_continuation_is_clean(u):
+        chain = []
+        while u not in clean:
+            chain.append(u)
+            u = next_hops[u]
+        for v in chain:
+            clean[v] = clean[u]
+        return clean[u]
+
+    rows = graph.rows()
+    distances = {spur_node: 0}
+    predecessors = {}
+    settled = set()
+    # Con f igual se extrae primero el nodo con mayor g (más cerca del destino): en mesetas de
+    # caminos del mismo costo (p. ej. rejillas) la búsqueda avanza en vez de recorrer la meseta
+    queue = [(distances_to_end[spur_node], 0, spur_node)]
+    while queue:
+        _, negative_distance, u = heapq.heappop(queue)
+        distance = -negative_distance
+        if u in settled:
+            continue
+        # La heurística es exacta: si el resto del camino del árbol está permitido, f = g + h(u)
+        # es el óptimo y el desvío se completa con ese camino
+        if u == spur_node:
+            reuse_tree = next_hops[u] not in banned_first_hops and tree_continuation_is_clean(next_hops[u])
+        else:
+            reuse_tree = tree_continuation_is_clean(u)
+        if reuse_tree:
+            path = search_prefix(predecessors, spur_node, u)[:-1] + tree_path(next_hops, u, end_node)
+            # Con aristas de peso 0 el camino del árbol podría volver al prefijo: se sigue buscando
+            if len(set(path)) == len(path):
+                return distance + distances_to_end[u], path
+        settled.add(u)
+        for v, weight in rows[u]:
+            if v in settled or v in banned_nodes or (u == spur_node and v in banned_first_hops):
+                continue
+            # Si v no llega al destino en el grafo completo, tampoco con restricciones
+            if distances_to_end[v] == INF:
+                continue
+            new_distance = distance + weight
+            if new_distance < distances.get(v, INF):
+                distances[v] = new_distance
+                predecessors[v] = u
+                heapq.heappush(queue, (new_distance + distances_to_end[v], -new_distance, v))
+    return None
+
+
+def yen_k_shortest_paths(graph, start_node, end_node, k, reverse_tree, run_spur_searches=None):
+    """
+    Hasta k caminos simples start_node -> end_node como lista [(distancia, camino)] en orden de
+    distancia. reverse_tree es el árbol de Dijkstra desde end_node sobre graph.reverse();
+    run_spur_searches(tareas) -> resultados ejecuta las búsquedas de desvío de una iteración
+    (por defecto, en secuencia con spur_search).
+    """
+    distances_to_end, next_hops = reverse_tree.distances, reverse_tree.predecessors
+    if run_spur_searches is None:
+        def run_spur_searches(tasks):
+            return [spur_search(graph, task, end_node, distances_to_end, next_hops) for task in tasks]
+
+    first = tree_path(next_hops, start_node, end_node)
+    if first is None:
+        return []
+    # (distancia, camino, índice del nodo donde se desvió de su camino padre)
+    accepted = [(int(distances_to_end[start_node]), first, 0)]
+    candidates = []
+    seen = {tuple(first)}
+
+    while len(accepted) < k:
+        _, previous, deviation = accepted[-1]
+        # Mejora de Lawler: las raíces anteriores al punto de desvío ya se exploraron con el padre
+        root_cost = sum(graph[u][v] for u, v in zip(previous[:deviation], previous[1:deviation + 1]))
+        tasks, roots = [], []
+        for i in range(deviation, len(previous) - 1):
+            spur_node = previous[i]
+            root = previous[:i + 1]
+            banned_first_hops = {path[i + 1] for _, path, _ in accepted if len(path) > i + 1 and path[:i + 1] == root}
+            tasks.append((spur_node, root[:-1], sorted(banned_first_hops)))
+            roots.append((root, root_cost, i))
+            root_cost += graph[spur_node][previous[i + 1]]
+
+        for (root, cost, i), result in zip(roots, run_spur_searches(tasks)):
+            if result is None:
+                continue
+            spur_cost, spur_path = result
+            path = root[:-1] + spur_path
+            if tuple(path) not in seen:
+                seen.add(tuple(path))
+                heapq.heappush(candidates, (int(cost + spur_cost), path, i))
+
+        if not candidates:
+            break
+        accepted.append(heapq.heappop(candidates))
+    return [(distance, path) for distance, path, _ in accepted]
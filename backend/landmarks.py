@@ -0,0 +1,196 @@
+# backend/landmarks.py
+"""
+Índices de landmarks (ALT: A*, Landmarks y desigualdad Triangular) para grafos registrados que
+se consultan muchas más veces de las que cambian.
+
+El preprocesamiento elige L nodos "landmark" y guarda las distancias desde cada landmark a todos
+los nodos (grafo original) y desde todos los nodos a cada landmark (grafo inverso). Por la
+desigualdad triangular, para cualquier consulta hacia t:
+
+    d(v, t) >= d(L, t) - d(L, v)      y      d(v, t) >= d(v, L) - d(t, L)
+
+El máximo sobre los landmarks es una cota inferior consistente, que A* usa como heurística: la
+búsqueda sigue siendo exacta y fija muchos menos nodos que Dijkstra. Si la cota de un nodo es ∞,
+ese nodo no puede llegar a t.
+
+Cada índice guarda el hash de contenido del grafo con el que se construyó: al editar el grafo
+cambia su hash y el índice anterior deja de aplicarse (en memoria y al cargarlo de disco).
+Requiere pesos no negativos.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from graph_core import INF
+
+DEFAULT_NUM_LANDMARKS = 8
+MAX_LANDMARKS = 64
+DEFAULT_MAX_BYTES = 128 * 1024 * 1024
+FILE_SUFFIX = ".alt.npz"
+
+
+class LandmarkIndex:
+    """Distancias L×V desde y hacia cada landmark (float64, ∞ si no hay camino)."""
+
+    __slots__ = ('graph_id', 'landmarks', 'from_landmarks', 'to_landmarks')
+
+    def __init__(self, graph_id, landmarks, from_landmarks, to_landmarks):
+        self.graph_id = graph_id
+        self.landmarks = np.asarray(landmarks, dtype=np.int64)
+        self.from_landmarks = np.asarray(from_landmarks, dtype=np.float64)
+        self.to_landmarks = np.asarray(to_landmarks, dtype=np.float64)
+
+    @property
+    def num_nodes(self):
+        return self.from_landmarks.shape[1]
+
+    @property
+    def nbytes(self):
+        return self.landmarks.nbytes + self.from_landmarks.nbytes + self.to_landmarks.nbytes
+
+    def lower_bounds(self, target):
+        """Cota inferior de d(v, target) para cada nodo v (arreglo float64 de longitud V)."""
+        with np.errstate(invalid='ignore'):
+            forward = self.from_landmarks[:, target, None] - self.from_landmarks
+            backward = self.to_landmarks - self.to_landmarks[:, target, None]
+        # ∞ - ∞ (nodo y destino inalcanzables para el landmark) no aporta información
+        bounds = np.fmax(forward, backward)
+        bounds[np.isnan(bounds)] = 0.0
+        return np.maximum(bounds.max(axis=0), 0.0)
+
+    def describe(self):
+        return {
+            'graph_id': self.graph_id,
+            'kind': 'landmarks',
+            'landmarks': self.landmarks.tolist(),
+            'nbytes': self.nbytes,
+        }
+
+
+def build_landmark_index(graph, num_landmarks, tree_function):
+    """
+    Elige los landmarks por el método del más lejano y calcula sus tablas de distancias con
+    tree_function(grafo, origen, n) (Dijkstra). Primero se cubren los nodos que ningún landmark
+    alcanza (en ningún sentido), así que cada componente recibe al menos uno si hay suficientes.
+    """
+    num_nodes = graph.num_nodes
+    reverse = graph.reverse()
+    landmarks, from_rows, to_rows = [], [], []
+    closeness = np.full(num_nodes, INF)
+    candidate = int(np.argmax(np.diff(graph.indptr))) if num_nodes else 0
+
+    for _ in range(min(num_landmarks, num_nodes)):
+        landmarks.append(candidate)
+        from_rows.append(np.array(tree_function(graph, candidate, num_nodes).distances, dtype=np.float64))
+        to_rows.append(np.array(tree_function(reverse, candidate, num_nodes).distances, dtype=np.float64))
+        closeness = np.minimum(closeness, np.minimum(from_rows[-1], to_rows[-1]))
+        # Siguiente: el nodo más lejano a los landmarks ya elegidos (∞ = todavía sin cubrir)
+        closeness[landmarks] = -1.0
+        candidate = int(np.argmax(closeness))
+
+    shape = (len(landmarks), num_nodes)
+    return LandmarkIndex(
+        graph.content_hash(),
+        landmarks,
+        np.array(from_rows).reshape(shape),
+        np.array(to_rows).reshape(shape),
+    )
+
+
+# =======================================================
+# PERSISTENCIA (JUNTO AL .ogcsr DEL GRAFO)
+# =======================================================
+def index_path(directory, graph_id):
+    return os.path.join(directory, graph_id + FILE_SUFFIX)
+
+
+def save_index(index, directory):
+    """Guarda el índice como <graph_id>.alt.npz en el directorio de grafos."""
+    os.makedirs(directory, exist_ok=True)
+    path = index_path(directory, index.graph_id)
+    # np.savez añade .npz si falta; se escribe con nombre temporal y se renombra de forma atómica
+    temporary = path + '.tmp.npz'
+    np.savez(
+        temporary,
+        graph_id=np.array(index.graph_id),
+        landmarks=index.landmarks,
+        from_landmarks=index.from_landmarks,
+        to_landmarks=index.to_landmarks,
+    )
+    os.replace(temporary, path)
+    return path
+
+
+def load_index(directory, graph):
+    """Índice guardado del grafo, o None si no existe, está dañado o se construyó con otro contenido."""
+    path = index_path(directory, graph.content_hash())
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path) as data:
+            index = LandmarkIndex(str(data['graph_id']), data['landmarks'], data['from_landmarks'], data['to_landmarks'])
+    except (OSError, KeyError, ValueError):
+        return None
+    if index.graph_id != graph.content_hash() or index.num_nodes != graph.num_nodes:
+        return None
+    return index
+
+
+def delete_index(directory, graph_id):
+    """Borra el índice guardado del grafo; False si no había archivo."""
+    try:
+        os.remove(index_path(directory, graph_id))
+    except FileNotFoundError:
+        return False
+    return True
+
+
+class LandmarkIndexStore:
+    """LRU de índices por hash de contenido del grafo, acotado por memoria; seguro entre hilos."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, graph):
+        """Índice vigente para el contenido actual del grafo, o None."""
+        graph_id = graph.content_hash()
+        with self._lock:
+            index = self._entries.get(graph_id)
+            if index is not None:
+                self._entries.move_to_end(graph_id)
+            return index
+
+    def put(self, index):
+        with self._lock:
+            previous = self._entries.pop(index.graph_id, None)
+            if previous is not None:
+                self._total_bytes -= previous.nbytes
+            self._entries[index.graph_id] = index
+            self._total_bytes += index.nbytes
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+
+    def remove(self, graph_id):
+        with self._lock:
+            index = self._entries.pop(graph_id, None)
+            if index is not None:
+                self._total_bytes -= index.nbytes
+            return index is not None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'indexes': len(self._entries),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
@@ -1,98 +1,228 @@
 # backend/app.py (Corregido)
 
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, g, render_template, request
 from flask_cors import CORS # <-- Importar
 import json
 import heapq
+from array import array
+from collections import deque, namedtuple
+from functools import partial
 import numpy as np
 import os
 import string
 
+from all_pairs import NO_SUCCESSOR, choose_engine, floyd_warshall, johnson
+from dense_matrix import parse_dense_matrix
+from dynamic_sssp import apply_edge_edits, repair_tree
+from graph_core import (
+    CSRGraph, INF, NO_PREDECESSOR, new_distances, new_predecessors,
+    as_distance, display_distance, extract_path, adjacency_rows,
+)
+from graph_binary import FILE_EXTENSION as BINARY_GRAPH_EXTENSION, MIMETYPE as BINARY_GRAPH_MIMETYPE
+from graph_binary import BinaryGraphFormatError, from_bytes, load_graph, to_bytes, write_graph
+from graph_registry import DEFAULT_MAX_BYTES as GRAPH_REGISTRY_MAX_BYTES, GraphRegistry, GraphRegistryConflict
+from instrumentation import MetricsRegistry, count, finish_request, lap, profiled, start_request
+from k_shortest import DEFAULT_MAX_K, spur_search, yen_k_shortest_paths
+from landmarks import (
+    DEFAULT_MAX_BYTES as LANDMARK_INDEX_MAX_BYTES, DEFAULT_NUM_LANDMARKS, MAX_LANDMARKS, LandmarkIndexStore,
+    build_landmark_index, delete_index, load_index, save_index,
+)
+from jobs import (
+    CHECKPOINT_POPS, DEFAULT_MAX_JOBS, DEFAULT_MAX_PENDING as DEFAULT_JOB_MAX_PENDING,
+    DEFAULT_MAX_WORKERS as DEFAULT_JOB_WORKERS, DEFAULT_MEMORY_LIMIT as DEFAULT_JOB_MEMORY_LIMIT,
+    DEFAULT_TIME_LIMIT as DEFAULT_JOB_TIME_LIMIT, DONE as JOB_DONE, JobQueue, JobQueueFull, checkpoint,
+    estimate_full_trace_bytes,
+)
+from parallel import ParallelExecutor
+from priority_queues import IndexedBinaryHeap, LazyBinaryHeap
+from serialization import compress_response, dumps, json_response
+from shortest_path_trees import (
+    bellman_ford_tree, bellman_ford_vectorized_tree, dial_queue, dijkstra_dial_tree, dijkstra_indexed_heap_tree,
+    dijkstra_tree, negative_cycle_from_edge, negative_cycle_in_predecessors, nodes_with_out_edges, relaxable_edges,
+    spfa_tree, vectorized_edge_arrays, vectorized_predecessor_cycle, vectorized_relaxation_pass,
+)
+from spt_cache import DEFAULT_MAX_BYTES as SPT_CACHE_MAX_BYTES, ShortestPathTreeCache
+from step_trace import (
+    DEFAULT_KEYFRAME_INTERVAL, MIN_KEYFRAME_INTERVAL, StepRun, build_delta_trace, iter_delta_records,
+    iter_full_steps, steps_from_delta_trace,
+)
+from trace_store import DEFAULT_MAX_BYTES as TRACE_STORE_MAX_BYTES, StoredTrace, TraceStore, trace_id_for
+
 app = Flask(__name__, template_folder="templates", static_folder="static")
 
 # Inicializa CORS globalmente
 CORS(app)
 
-INF = float('inf')
 
-def bellman_ford(graph, start_node, end_node, num_nodes):
-    if start_node == end_node:
-        return 0, [start_node]
+# Latencias por ruta y por fase, y contadores de operaciones de todas las solicitudes (/metrics)
+metrics_registry = MetricsRegistry()
 
-    distances = {i: INF for i in range(num_nodes)}
-    distances[start_node] = 0
-    predecessors = {i: None for i in range(num_nodes)}
 
-    for _ in range(num_nodes - 1):
-        relaxed = False
-        for u in range(num_nodes):
-            for v, weight in graph[u].items():
-                if distances[u] != INF and distances[u] + weight < distances[v]:
-                    distances[v] = distances[u] + weight
-                    predecessors[v] = u
-                    relaxed = True
-        if not relaxed:
-            break
+@app.before_request
+def start_request_metrics():
+    g.request_metrics, g.request_metrics_token = start_request()
 
-    for u in range(num_nodes):
-        for v, weight in graph[u].items():
-            if distances[u] != INF and distances[u] + weight < distances[v]:
-                return None, "Ciclo Negativo Detectado"
 
-    if distances[end_node] == INF:
-        return INF, []
+@app.after_request
+def record_request_metrics(response):
+    """Añade Server-Timing (fases, total y contadores) y acumula la solicitud en metrics_registry."""
+    metrics = g.get('request_metrics')
+    if metrics is not None:
+        response.headers['Server-Timing'] = metrics.server_timing()
+        endpoint = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics_registry.record(endpoint, metrics)
+    return response
 
-    path = []
-    current = end_node
-    while current is not None:
-        path.append(current)
-        if current == start_node:
-            break
-        current = predecessors[current]
-    path.reverse()
-    if not path or path[0] != start_node:
-         return INF, []
 
-    return distances[end_node], path
+@app.teardown_request
+def finish_request_metrics(exception=None):
+    token = g.pop('request_metrics_token', None)
+    if token is not None:
+        finish_request(token)
 
-def dijkstra(graph, start_node, end_node, num_nodes):
-    if start_node == end_node:
-        return 0, [start_node]
 
-    distances = {i: INF for i in range(num_nodes)}
-    distances[start_node] = 0
-    predecessors = {i: None for i in range(num_nodes)}
-    priority_queue = [(0, start_node)]
+@app.after_request
+def compress_large_responses(response):
+    """Comprime (brotli o gzip, según Accept-Encoding) las respuestas JSON grandes."""
+    return compress_response(response, request.headers.get('Accept-Encoding'))
 
-    while priority_queue:
-        current_distance, u = heapq.heappop(priority_queue)
-        if current_distance > distances[u]:
+
+# Grafos compilados (POST /graphs), en un LRU acotado por memoria
+graph_registry = GraphRegistry(max_bytes=int(os.environ.get('GRAPH_REGISTRY_MAX_BYTES', GRAPH_REGISTRY_MAX_BYTES)))
+
+# Directorio opcional de grafos binarios (.ogcsr): se abren con np.memmap al arrancar y los grafos
+# importados se guardan ahí, de modo que varios procesos del servidor comparten las mismas páginas
+GRAPH_STORE_DIR = os.environ.get('GRAPH_STORE_DIR')
+
+# 'num_nodes' de una lista de aristas reserva arreglos de ese tamaño: se acota para no agotar memoria
+MAX_NUM_NODES = int(os.environ.get('MAX_NUM_NODES', 1_000_000))
+
+# Exportar como matriz densa es O(V²); por encima de este tamaño se pide 'binary' o 'edges'
+MATRIX_EXPORT_MAX_NODES = 2000
+
+# Árboles de caminos mínimos ya calculados, por (hash del grafo, origen, algoritmo)
+spt_cache = ShortestPathTreeCache(max_bytes=int(os.environ.get('SPT_CACHE_MAX_BYTES', SPT_CACHE_MAX_BYTES)))
+
+# Índices de landmarks (ALT) de los grafos registrados, por hash de contenido; con GRAPH_STORE_DIR
+# también se guardan junto al .ogcsr del grafo
+landmark_indexes = LandmarkIndexStore(max_bytes=int(os.environ.get('LANDMARK_INDEX_MAX_BYTES', LANDMARK_INDEX_MAX_BYTES)))
+
+# Trazas de pasos servidas por páginas en /trace/<trace_id> (trace_format='lazy')
+trace_store = TraceStore(max_bytes=int(os.environ.get('TRACE_STORE_MAX_BYTES', TRACE_STORE_MAX_BYTES)))
+
+# Procesos para cargas con muchos orígenes (lotes, Johnson); PARALLEL_WORKERS=1 lo desactiva y con
+# una sola CPU disponible siempre se ejecuta en serie
+parallel_executor = ParallelExecutor(max_workers=int(os.environ.get('PARALLEL_WORKERS', 0)) or None)
+
+# Trabajos asíncronos (POST /jobs). Los límites de tiempo (s) y memoria (bytes) son los máximos
+# por trabajo: el cliente puede pedir valores menores, no mayores
+job_queue = JobQueue(
+    max_workers=int(os.environ.get('JOB_WORKERS', DEFAULT_JOB_WORKERS)),
+    max_jobs=int(os.environ.get('JOB_STORE_MAX_JOBS', DEFAULT_MAX_JOBS)),
+    max_pending=int(os.environ.get('JOB_QUEUE_MAX_PENDING', DEFAULT_JOB_MAX_PENDING)),
+)
+JOB_TIME_LIMIT = float(os.environ.get('JOB_TIME_LIMIT', DEFAULT_JOB_TIME_LIMIT))
+JOB_MEMORY_LIMIT = int(os.environ.get('JOB_MEMORY_LIMIT', DEFAULT_JOB_MEMORY_LIMIT))
+# Cada cuánto (s) /jobs/<id>/events comprueba si cambió el progreso
+JOB_EVENTS_INTERVAL = 0.25
+
+
+def preload_graph_store(directory):
+    """Registra (mapeados en memoria, sin copiarlos) todos los grafos .ogcsr del directorio."""
+    loaded = 0
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(BINARY_GRAPH_EXTENSION):
             continue
-        for v, weight in graph[u].items():
-            if weight < 0:
-                pass
-            distance = current_distance + weight
-            if distance < distances[v]:
-                distances[v] = distance
-                predecessors[v] = u
-                heapq.heappush(priority_queue, (distance, v))
+        try:
+            graph, is_directed = load_graph(os.path.join(directory, name))
+        except (OSError, BinaryGraphFormatError) as e:
+            app.logger.warning("No se pudo cargar el grafo %s: %s", name, e)
+            continue
+        graph_registry.add(graph, is_directed)
+        index = load_index(directory, graph)
+        if index is not None:
+            landmark_indexes.put(index)
+        loaded += 1
+    return loaded
+
+
+# Con 'python main.py', los procesos de parallel_executor (spawn) vuelven a ejecutar este script
+# como __mp_main__: no usan el almacén, así que no lo cargan
+if GRAPH_STORE_DIR and os.path.isdir(GRAPH_STORE_DIR) and __name__ != '__mp_main__':
+    preload_graph_store(GRAPH_STORE_DIR)
+
+# =======================================================
+# PODA POR ALCANZABILIDAD (CONSULTAS PUNTO A PUNTO)
+# =======================================================
+# Solo los nodos alcanzables desde el origen y que alcanzan el destino pueden estar en un camino
+# origen -> destino. Restringir la relajación a ellos no cambia la distancia y deja fuera los
+# ciclos negativos que no afectan al camino pedido (un ciclo negativo ajeno ya no lo invalida).
+def restrict_to_path(graph, start_node, end_node):
+    """Subgrafo de los nodos de algún camino start_node -> end_node, o None si end_node es inalcanzable."""
+    relevant = graph.path_nodes(start_node, end_node)
+    count(pruned_nodes=graph.num_nodes - int(relevant.sum()))
+    if not relevant[end_node]:
+        return None
+    return graph.subgraph(relevant)
+
 
-    if distances[end_node] == INF:
+def path_search_graph(graph, start_node, end_node, prune):
+    """
+    Grafo sobre el que buscar start_node -> end_node, o None si end_node es inalcanzable.
+    prune=True (familia Bellman-Ford) lo restringe a los nodos de algún camino; si no, solo se
+    comprueba el alcance (Dijkstra y derivados ya exploran únicamente lo alcanzable). Con
+    start_node == end_node quedan los nodos de los ciclos que pasan por start_node (su componente
+    fuertemente conexa): solo un ciclo negativo entre ellos invalida la distancia 0.
+    """
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph, len(graph))
+    if prune:
+        return restrict_to_path(graph, start_node, end_node)
+    return graph if graph.reachable_from(start_node, target=end_node)[end_node] else None
+
+
+def path_from_pruned_tree(tree_function, graph, start_node, end_node, num_nodes):
+    """(distancia, camino) calculando el árbol de tree_function solo sobre el subgrafo podado."""
+    pruned = path_search_graph(graph, start_node, end_node, prune=True)
+    if pruned is None:
         return INF, []
+    tree = tree_function(pruned, start_node, num_nodes)
+    if tree.negative_cycle:
+        return None, "Ciclo Negativo Detectado"
+    return tree.path_to(end_node)
 
-    path = []
-    current = end_node
-    while current is not None:
-        path.append(current)
-        if current == start_node:
-            break
-        current = predecessors[current]
-    path.reverse()
-    if not path or path[0] != start_node:
-         return INF, []
-    return distances[end_node], path
 
-INF = float('inf')
+# =======================================================
+# CICLOS NEGATIVOS
+# =======================================================
+# Los ciclos se leen del grafo de predecesores (ver shortest_path_trees.py); aquí solo se describen
+# en los pasos.
+def describe_negative_cycle(cycle):
+    """Sufijo de la descripción de un paso con el ciclo encontrado (vacío si no se pudo leer)."""
+    if cycle is None:
+        return ""
+    names = " -> ".join(node_name_from_index(i) for i in cycle.nodes + cycle.nodes[:1])
+    return f" Ciclo: {names} (peso total {cycle.weight})."
+
+
+# =======================================================
+# CONSULTAS PUNTO A PUNTO SOBRE LOS ÁRBOLES
+# =======================================================
+# Los motores de árbol (bellman_ford_tree, spfa_tree, dijkstra_tree, ...) están en
+# shortest_path_trees.py para que los procesos de parallel_worker.py no importen este módulo.
+def bellman_ford(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    tree_function = partial(bellman_ford_tree, early_cycle_detection=early_cycle_detection)
+    return path_from_pruned_tree(tree_function, graph, start_node, end_node, num_nodes)
+
+def spfa(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    tree_function = partial(spfa_tree, early_cycle_detection=early_cycle_detection)
+    return path_from_pruned_tree(tree_function, graph, start_node, end_node, num_nodes)
+
+def dijkstra(graph, start_node, end_node, num_nodes):
+    """Consulta punto a punto (pesos no negativos): se detiene en cuanto fija end_node."""
+    if start_node == end_node:
+        return 0, [start_node]
+    return dijkstra_tree(graph, start_node, num_nodes, end_node).path_to(end_node)
 
 # Helper function (usada en el backend)
 def node_name_from_index(index: int) -> str:
@@ -117,132 +247,222 @@ def node_name_from_index(index: int) -> str:
             
     return name
 
-def reconstruct_path(predecessors, end_node):
-    path = []
-    current = end_node
-    while current is not None:
-        path.append(current)
-        current = predecessors.get(current)
-    return path[::-1] if path and path[0] == path[0] else [] 
-
-def get_path_edges(predecessors, num_nodes):
-    edges = []
-    for node, predecessor in predecessors.items():
-        if predecessor is not None and node < num_nodes: 
-            edges.append([predecessor, node])
-    return edges
-def bellman_ford_with_steps(graph, start_node, end_node, num_nodes):
-    distances = {i: INF for i in range(num_nodes)}
-    distances[start_node] = 0
-    predecessors = {i: None for i in range(num_nodes)}
-    steps = []
+def iter_bellman_ford_steps(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    active_nodes = nodes_with_out_edges(graph)
 
     # Estado Inicial
-    steps.append({
+    yield {
         'description': f"Inicialización: Distancia a {node_name_from_index(start_node)} = 0, el resto es ∞.",
         'activeNodeIndex': None,
         'activeEdgeIndices': None,
-        'settledNodeIndices': [],
         'updatedNodeIndices': [start_node],
-        'pathEdgesIndices': [],
-        'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
+        'distanceChanges': [[start_node, 0]],
         'iteration': 0,
         'negativeCycleDetected': False,
-    })
+    }
     
     # |V| - 1 pases de relajación
     for i in range(1, num_nodes):
         relaxed_in_pass = False
-        updated_in_pass = set()
         
-        # Iterar sobre todos los nodos 'u' y sus vecinos 'v'
-        for u in range(num_nodes):
-            for v, weight in graph[u].items():
+        # Iterar sobre los nodos 'u' con aristas salientes y sus vecinos 'v'
+        for u in active_nodes:
+            for v, weight in rows[u]:
                 
                 # Relajación
                 if distances[u] != INF and distances[u] + weight < distances[v]:
                     distances[v] = distances[u] + weight
                     predecessors[v] = u
                     relaxed_in_pass = True
-                    updated_in_pass.add(v)
 
-                    # Capturar paso
-                    steps.append({
-                        'description': f"Paso {i}: Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia a {node_name_from_index(v)} actualizada a {distances[v]}.",
+                    # Capturar paso (solo el cambio; el estado completo se reconstruye en step_trace)
+                    yield {
+                        'description': f"Paso {i}: Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia a {node_name_from_index(v)} actualizada a {as_distance(distances[v])}.",
                         'activeNodeIndex': u,
                         'activeEdgeIndices': [u, v],
-                        'settledNodeIndices': [],
-                        'updatedNodeIndices': list(updated_in_pass), 
-                        'pathEdgesIndices': get_path_edges(predecessors, num_nodes),
-                        'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
+                        'updatedInPass': v,
+                        'distanceChanges': [[v, display_distance(distances[v])]],
+                        'predecessorChanges': [[v, u]],
                         'iteration': i,
                         'negativeCycleDetected': False,
-                    })
+                    }
 
         # Si no hubo relajaciones, el algoritmo converge y podemos parar
         if not relaxed_in_pass:
-            steps.append({
+            yield {
                 'description': f"Paso {i}: No hubo relajaciones. El algoritmo converge y se detiene.",
                 'activeNodeIndex': None,
                 'activeEdgeIndices': None,
-                'settledNodeIndices': list(range(num_nodes)), # Todos settled
                 'updatedNodeIndices': [],
-                'pathEdgesIndices': get_path_edges(predecessors, num_nodes),
-                'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
+                'settledNodes': list(range(num_nodes)), # Todos settled
                 'iteration': i,
                 'negativeCycleDetected': False,
-            })
+            }
             break
 
+        # Detección temprana: un ciclo en el grafo de predecesores ya es un ciclo negativo
+        if early_cycle_detection:
+            cycle = negative_cycle_in_predecessors(graph, predecessors)
+            if cycle is not None:
+                yield {
+                    'description': f"¡Advertencia! Se detectó un ciclo negativo en el paso {i}: el grafo de predecesores contiene un ciclo.{describe_negative_cycle(cycle)}",
+                    'activeNodeIndex': None,
+                    'activeEdgeIndices': None,
+                    'updatedNodeIndices': cycle.nodes,
+                    'iteration': i,
+                    'negativeCycleDetected': True,
+                    'negativeCycleNodeIndices': cycle.nodes,
+                }
+                return "Ciclo Negativo Detectado", [], as_distance(distances[end_node]), cycle
+
     # Paso |V|: Revisión de ciclo negativo
-    for u in range(num_nodes):
-        for v, weight in graph[u].items():
+    for u in active_nodes:
+        for v, weight in rows[u]:
             if distances[u] != INF and distances[u] + weight < distances[v]:
-                # Ciclo negativo detectado
-                steps.append({
-                    'description': f"¡Advertencia! Se detectó un ciclo negativo. El borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) se relajó en la iteración |V|.",
+                # Ciclo negativo detectado: se lee del grafo de predecesores
+                cycle = negative_cycle_from_edge(graph, predecessors, u, v)
+                yield {
+                    'description': f"¡Advertencia! Se detectó un ciclo negativo. El borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) se relajó en la iteración |V|.{describe_negative_cycle(cycle)}",
                     'activeNodeIndex': u,
                     'activeEdgeIndices': [u, v],
-                    'settledNodeIndices': [],
                     'updatedNodeIndices': [v],
-                    'pathEdgesIndices': get_path_edges(predecessors, num_nodes),
-                    'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
                     'iteration': num_nodes,
                     'negativeCycleDetected': True,
-                })
-                return "Ciclo Negativo Detectado", [], distances.get(end_node), steps
+                    'negativeCycleNodeIndices': cycle.nodes if cycle is not None else [],
+                }
+                return "Ciclo Negativo Detectado", [], as_distance(distances[end_node]), cycle
     
-    final_path = reconstruct_path(predecessors, end_node)
-    final_distance = distances.get(end_node, INF)
-    return "OK", final_path, final_distance, steps
+    final_path = extract_path(predecessors, start_node, end_node)
+    final_distance = as_distance(distances[end_node])
+    return "OK", final_path, final_distance, None
+
+
+def iter_spfa_steps(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    """
+    Pasos de Bellman-Ford con cola (SPFA). Cada ronda procesa los nodos que estaban en la cola al
+    empezarla (equivale a un pase de Bellman-Ford, pero sin recorrer los nodos que no cambiaron).
+    Con early_cycle_detection el grafo de predecesores se revisa al terminar cada ronda.
+    """
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    enqueue_counts = array('l', [0]) * num_nodes
+    in_queue = bytearray(num_nodes)
+    queue = deque([start_node])
+    in_queue[start_node] = 1
+    enqueue_counts[start_node] = 1
+
+    yield {
+        'description': f"Inicialización: Distancia a {node_name_from_index(start_node)} = 0, el resto es ∞. {node_name_from_index(start_node)} entra en la cola.",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [start_node],
+        'distanceChanges': [[start_node, 0]],
+        'iteration': 0,
+        'negativeCycleDetected': False,
+    }
+
+    round_number, remaining_in_round = 1, 1
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        distance_u = distances[u]
+        for v, weight in rows[u]:
+            if distance_u + weight < distances[v]:
+                distances[v] = distance_u + weight
+                predecessors[v] = u
+                enqueued = not in_queue[v]
+                if enqueued:
+                    enqueue_counts[v] += 1
+                    if enqueue_counts[v] >= num_nodes:
+                        cycle = negative_cycle_from_edge(graph, predecessors, u, v)
+                        yield {
+                            'description': f"¡Advertencia! Se detectó un ciclo negativo. {node_name_from_index(v)} entró en la cola {num_nodes} veces (el máximo sin ciclos negativos es |V| - 1).{describe_negative_cycle(cycle)}",
+                            'activeNodeIndex': u,
+                            'activeEdgeIndices': [u, v],
+                            'updatedNodeIndices': [v],
+                            'iteration': round_number,
+                            'negativeCycleDetected': True,
+                            'negativeCycleNodeIndices': cycle.nodes if cycle is not None else [],
+                        }
+                        return "Ciclo Negativo Detectado", [], as_distance(distances[end_node]), cycle
+                    in_queue[v] = 1
+                    queue.append(v)
+
+                yield {
+                    'description': f"Ronda {round_number}: Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia a {node_name_from_index(v)} actualizada a {as_distance(distances[v])}." + (f" {node_name_from_index(v)} entra en la cola." if enqueued else ""),
+                    'activeNodeIndex': u,
+                    'activeEdgeIndices': [u, v],
+                    'updatedInPass': v,
+                    'distanceChanges': [[v, display_distance(distances[v])]],
+                    'predecessorChanges': [[v, u]],
+                    'iteration': round_number,
+                    'negativeCycleDetected': False,
+                }
+
+        remaining_in_round -= 1
+        if remaining_in_round == 0:
+            if early_cycle_detection and queue:
+                cycle = negative_cycle_in_predecessors(graph, predecessors)
+                if cycle is not None:
+                    yield {
+                        'description': f"¡Advertencia! Se detectó un ciclo negativo al terminar la ronda {round_number}: el grafo de predecesores contiene un ciclo.{describe_negative_cycle(cycle)}",
+                        'activeNodeIndex': None,
+                        'activeEdgeIndices': None,
+                        'updatedNodeIndices': cycle.nodes,
+                        'iteration': round_number,
+                        'negativeCycleDetected': True,
+                        'negativeCycleNodeIndices': cycle.nodes,
+                    }
+                    return "Ciclo Negativo Detectado", [], as_distance(distances[end_node]), cycle
+            round_number, remaining_in_round = round_number + 1, len(queue)
+
+    yield {
+        'description': f"Ronda {round_number}: La cola está vacía, ninguna distancia cambió. El algoritmo converge y se detiene.",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [],
+        'settledNodes': list(range(num_nodes)),
+        'iteration': round_number,
+        'negativeCycleDetected': False,
+    }
+
+    final_path = extract_path(predecessors, start_node, end_node)
+    return "OK", final_path, as_distance(distances[end_node]), None
 
 
 # =======================================================
 # NUEVA FUNCIÓN CON PASOS: DIJKSTRA
 # =======================================================
-def dijkstra_with_steps(graph, start_node, end_node, num_nodes):
-    distances = {i: INF for i in range(num_nodes)}
-    distances[start_node] = 0
-    predecessors = {i: None for i in range(num_nodes)}
-    priority_queue = [(0, start_node)]
-    steps = []
+def iter_dijkstra_steps(graph, start_node, end_node, num_nodes, priority_queue=None):
+    """priority_queue: cola de priority_queues.py (por defecto heapq con borrado perezoso)."""
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    if priority_queue is None:
+        priority_queue = LazyBinaryHeap(num_nodes)
+    priority_queue.push(start_node, 0)
     settled_nodes = set()
 
     # Estado Inicial
-    steps.append({
+    yield {
         'description': f"Inicialización: Distancia a {node_name_from_index(start_node)} = 0. Nodo inicial añadido a la cola de prioridad.",
         'activeNodeIndex': None,
         'activeEdgeIndices': None,
-        'settledNodeIndices': [],
         'updatedNodeIndices': [start_node],
-        'pathEdgesIndices': [],
-        'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
+        'distanceChanges': [[start_node, 0]],
         'iteration': 0,
-    })
+    }
 
     iteration_count = 1
-    while priority_queue:
-        current_distance, u = heapq.heappop(priority_queue)
+    while True:
+        entry = priority_queue.pop()
+        if entry is None:
+            break
+        current_distance, u = entry
 
         if u in settled_nodes:
             continue
@@ -251,195 +471,813 @@ def dijkstra_with_steps(graph, start_node, end_node, num_nodes):
         settled_nodes.add(u)
         
         # Capturar paso: Selección/Asentamiento
-        steps.append({
-            'description': f"Iteración {iteration_count}: Nodo {node_name_from_index(u)} seleccionado (distancia mínima: {current_distance}). Este nodo se considera 'fijado'.",
+        yield {
+            'description': f"Iteración {iteration_count}: Nodo {node_name_from_index(u)} seleccionado (distancia mínima: {as_distance(current_distance)}). Este nodo se considera 'fijado'.",
             'activeNodeIndex': u,
             'activeEdgeIndices': None,
-            'settledNodeIndices': list(settled_nodes),
             'updatedNodeIndices': [u],
-            'pathEdgesIndices': get_path_edges(predecessors, num_nodes),
-            'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
+            'settledNodes': [u],
             'iteration': iteration_count,
-        })
+        }
         iteration_count += 1
 
         if u == end_node:
             break
 
         # Relajación
-        for v, weight in graph[u].items():
+        for v, weight in rows[u]:
             
             # Chequeo de pesos negativos
             if weight < 0:
-                 steps.append({
+                yield {
                     'description': f"¡Error de Dijkstra! El algoritmo ha encontrado un peso negativo en el borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso: {weight}.",
                     'activeNodeIndex': u,
                     'activeEdgeIndices': [u, v],
-                    'settledNodeIndices': list(settled_nodes),
                     'updatedNodeIndices': [v],
-                    'pathEdgesIndices': get_path_edges(predecessors, num_nodes),
-                    'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
                     'iteration': iteration_count,
-                })
-                 return "Peso Negativo Detectado", [], distances.get(end_node), steps
+                }
+                return "Peso Negativo Detectado", [], as_distance(distances[end_node]), None
 
             new_distance = current_distance + weight
             
             if new_distance < distances[v]:
                 distances[v] = new_distance
                 predecessors[v] = u
-                heapq.heappush(priority_queue, (new_distance, v))
+                priority_queue.push(v, new_distance)
 
                 # Capturar paso: Relajación
-                steps.append({
-                    'description': f"Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia a {node_name_from_index(v)} actualizada a {new_distance}. Añadido/Actualizado en la cola de prioridad.",
+                yield {
+                    'description': f"Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia a {node_name_from_index(v)} actualizada a {as_distance(new_distance)}. Añadido/Actualizado en la cola de prioridad.",
                     'activeNodeIndex': u,
                     'activeEdgeIndices': [u, v],
-                    'settledNodeIndices': list(settled_nodes),
                     'updatedNodeIndices': [v],
-                    'pathEdgesIndices': get_path_edges(predecessors, num_nodes),
-                    'currentDistances': {k: v if v != INF else "∞" for k, v in distances.items()},
+                    'distanceChanges': [[v, display_distance(new_distance)]],
+                    'predecessorChanges': [[v, u]],
                     'iteration': iteration_count - 1,
-                })
+                }
 
-    final_path = reconstruct_path(predecessors, end_node)
-    final_distance = distances.get(end_node, INF)
-    return "OK", final_path, final_distance, steps
+    final_path = extract_path(predecessors, start_node, end_node)
+    final_distance = as_distance(distances[end_node])
+    return "OK", final_path, final_distance, None
 
 
+def iter_dijkstra_indexed_heap_steps(graph, start_node, end_node, num_nodes):
+    return iter_dijkstra_steps(graph, start_node, end_node, num_nodes, IndexedBinaryHeap(num_nodes))
 
-@app.route('/', methods=['GET'])
-def index():
-    info = {
-        "message": "Backend del proyecto Grafos (usa el frontend en React para interfaz).",
-        "endpoints": ["/find_path (POST)"]
+
+def iter_dijkstra_dial_steps(graph, start_node, end_node, num_nodes):
+    return iter_dijkstra_steps(graph, start_node, end_node, num_nodes, dial_queue(graph, num_nodes))
+
+
+# =======================================================
+# BELLMAN-FORD VECTORIZADO (NumPy)
+# =======================================================
+def bellman_ford_vectorized(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    """Bellman-Ford con cada pase de relajación como operación de arreglos; mismo resultado que bellman_ford."""
+    tree_function = partial(bellman_ford_vectorized_tree, early_cycle_detection=early_cycle_detection)
+    return path_from_pruned_tree(tree_function, graph, start_node, end_node, num_nodes)
+
+
+def iter_bellman_ford_vectorized_steps(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    """Versión con pasos del Bellman-Ford vectorizado: un paso por pase completo de relajación."""
+    sources, targets, weights = vectorized_edge_arrays(graph, num_nodes)
+    distances = np.full(num_nodes, INF)
+    distances[start_node] = 0
+    predecessors = np.full(num_nodes, NO_PREDECESSOR, dtype=np.int64)
+
+    yield {
+        'description': f"Inicialización: Distancia a {node_name_from_index(start_node)} = 0, el resto es ∞.",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [start_node],
+        'distanceChanges': [[start_node, 0]],
+        'iteration': 0,
+        'negativeCycleDetected': False,
     }
-    return jsonify(info)
 
-@app.route('/test', methods=['GET'])
-def test_route():
-    print("--- LA RUTA DE TEST SÍ FUNCIONA ---")
-    return jsonify({"message": "El test funcionó. El servidor está actualizado."})
+    converged = False
+    for i in range(1, num_nodes):
+        updated = vectorized_relaxation_pass(distances, predecessors, sources, targets, weights)
+        converged = len(updated) == 0
+        if converged:
+            yield {
+                'description': f"Paso {i}: No hubo relajaciones. El algoritmo converge y se detiene.",
+                'activeNodeIndex': None,
+                'activeEdgeIndices': None,
+                'updatedNodeIndices': [],
+                'settledNodes': list(range(num_nodes)),
+                'iteration': i,
+                'negativeCycleDetected': False,
+            }
+            break
+        yield {
+            'description': f"Paso {i}: Relajación simultánea de las {len(sources)} aristas. {len(updated)} distancias actualizadas.",
+            'activeNodeIndex': None,
+            'activeEdgeIndices': None,
+            'updatedNodeIndices': updated.tolist(),
+            'distanceChanges': [[v, display_distance(d)] for v, d in zip(updated.tolist(), distances[updated].tolist())],
+            'predecessorChanges': [[v, u] for v, u in zip(updated.tolist(), predecessors[updated].tolist())],
+            'iteration': i,
+            'negativeCycleDetected': False,
+        }
+        if early_cycle_detection:
+            cycle = vectorized_predecessor_cycle(graph, predecessors)
+            if cycle is not None:
+                yield {
+                    'description': f"¡Advertencia! Se detectó un ciclo negativo en el paso {i}: el grafo de predecesores contiene un ciclo.{describe_negative_cycle(cycle)}",
+                    'activeNodeIndex': None,
+                    'activeEdgeIndices': None,
+                    'updatedNodeIndices': cycle.nodes,
+                    'iteration': i,
+                    'negativeCycleDetected': True,
+                    'negativeCycleNodeIndices': cycle.nodes,
+                }
+                return "Ciclo Negativo Detectado", [], as_distance(distances[end_node]), cycle
 
-@app.route('/find_path', methods=['POST', 'OPTIONS'])
-def find_path_route():
+    relaxable = [] if converged else relaxable_edges(distances, sources, targets, weights)
+    if len(relaxable):
+        u, v = int(sources[relaxable[0]]), int(targets[relaxable[0]])
+        cycle = negative_cycle_from_edge(graph, predecessors.tolist(), u, v)
+        yield {
+            'description': f"¡Advertencia! Se detectó un ciclo negativo. El borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) se relajó en la iteración |V|.{describe_negative_cycle(cycle)}",
+            'activeNodeIndex': u,
+            'activeEdgeIndices': [u, v],
+            'updatedNodeIndices': [v],
+            'iteration': num_nodes,
+            'negativeCycleDetected': True,
+            'negativeCycleNodeIndices': cycle.nodes if cycle is not None else [],
+        }
+        return "Ciclo Negativo Detectado", [], as_distance(distances[end_node]), cycle
+
+    final_path = extract_path(predecessors.tolist(), start_node, end_node)
+    final_distance = as_distance(distances[end_node])
+    return "OK", final_path, final_distance, None
+
+
+# =======================================================
+# DIJKSTRA BIDIRECCIONAL Y A* (CONSULTAS PUNTO A PUNTO)
+# =======================================================
+# Ambos requieren pesos no negativos y se detienen en cuanto el camino a end_node es definitivo,
+# así que fijan muchos menos nodos que Dijkstra en grafos grandes. La búsqueda hacia atrás del
+# bidireccional recorre graph.reverse().
+def _join_bidirectional_path(forward_predecessors, backward_successors, start_node, end_node, meeting_node):
+    """Camino start -> meeting (árbol hacia adelante) + meeting -> end (árbol hacia atrás)."""
+    path = extract_path(forward_predecessors, start_node, meeting_node)
+    current = meeting_node
+    while current != end_node:
+        current = backward_successors[current]
+        path.append(current)
+    return path
+
+
+def bidirectional_dijkstra(graph, start_node, end_node, num_nodes):
+    """Dijkstra simultáneo desde el origen y (sobre el grafo inverso) desde el destino."""
+    if start_node == end_node:
+        return 0, [start_node]
+    rows = (graph.rows(), graph.reverse().rows())
+    distances = (new_distances(num_nodes, start_node), new_distances(num_nodes, end_node))
+    parents = (new_predecessors(num_nodes), new_predecessors(num_nodes))
+    queues = ([(0, start_node)], [(0, end_node)])
+    settled = (set(), set())
+    best_distance, meeting_node = INF, NO_PREDECESSOR
+    pops = relaxations = 0
+
+    while queues[0] and queues[1]:
+        # Criterio de parada: ningún camino no explorado puede mejorar el mejor encontrado
+        if queues[0][0][0] + queues[1][0][0] >= best_distance:
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        current_distance, u = heapq.heappop(queues[side])
+        pops += 1
+        if pops % CHECKPOINT_POPS == 0:
+            checkpoint()
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
+        own, other = distances[side], distances[1 - side]
+        for v, weight in rows[side][u]:
+            distance = current_distance + weight
+            if distance < own[v]:
+                own[v] = distance
+                parents[side][v] = u
+                heapq.heappush(queues[side], (distance, v))
+                relaxations += 1
+            if own[v] + other[v] < best_distance:
+                best_distance, meeting_node = own[v] + other[v], v
+
+    count(relaxations=relaxations, heap_pushes=relaxations + 2, heap_pops=pops)
+    if best_distance == INF:
+        return INF, []
+    return as_distance(best_distance), _join_bidirectional_path(*parents, start_node, end_node, meeting_node)
+
+
+def euclidean_heuristic(graph, positions, end_node):
     """
-    Ruta principal para encontrar el camino más corto utilizando Dijkstra o Bellman-Ford.
-    También maneja la solicitud OPTIONS (preflight de CORS).
+    h(v) = c · ‖p(v) - p(end_node)‖, con c = min w(u, v) / ‖p(u) - p(v)‖ sobre las aristas.
+    Con esa escala h es consistente para cualquier sistema de coordenadas (w >= h(u) - h(v)),
+    así que A* sigue siendo exacto. Sin posiciones h = 0 y A* se comporta como Dijkstra.
     """
-    if request.method == 'OPTIONS':
-        response = app.make_response(jsonify({"message": "Preflight OK"}))
-        response.headers.add("Access-Control-Allow-Origin", "*")
-        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
-        response.headers.add("Access-Control-Allow-Methods", "POST,OPTIONS")
-        return response
+    if positions is None:
+        return [0.0] * graph.num_nodes
+    sources = graph.edge_sources()
+    edge_lengths = np.hypot(*(positions[sources] - positions[graph.indices]).T)
+    measurable = edge_lengths > 0
+    scale = float((graph.weights[measurable] / edge_lengths[measurable]).min()) if measurable.any() else 0.0
+    return (max(scale, 0.0) * np.hypot(*(positions - positions[end_node]).T)).tolist()
 
-    # --- Lógica POST ---
-    try:
-        data = request.get_json()
-        matrix_data = data['matrix']
-        is_directed = data['is_directed']
-        start_node_index = int(data['start_node_index'])
-        end_node_index = int(data['end_node_index'])
-        algorithm = data.get('algorithm', 'bellman-ford') # Bellman-Ford por defecto
-    except Exception as e:
-        # Captura errores de parsing JSON o de claves faltantes
-        return jsonify({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}), 400
 
-    
-    # Lógica de construcción de grafo
-    n = len(matrix_data)
-    graph = {i: {} for i in range(n)}
-    has_negative_weights = False
+def astar(graph, start_node, end_node, num_nodes, positions=None):
+    """A* con la heurística euclidiana de euclidean_heuristic; se detiene al fijar end_node."""
+    if start_node == end_node:
+        return 0, [start_node]
+    return astar_search(graph, start_node, end_node, num_nodes, euclidean_heuristic(graph, positions, end_node))
 
-    try:
-        for i in range(n):
-            for j in range(n):
-                cell_value = str(matrix_data[i][j]).strip()
-                if cell_value != "":
-                    # Intentar convertir a entero, si falla, es un valor inválido
-                    weight = int(cell_value)
-                    
-                    graph[i][j] = weight
-                    if weight < 0:
-                        has_negative_weights = True
-                        
-                    # Manejo de grafo no dirigido
-                    if not is_directed and i != j:
-                        # Si la celda simétrica está vacía, la llenamos con el peso
-                        # (La construcción del grafo debe ser simétrica para no dirigido)
-                        if str(matrix_data[j][i]).strip() == "":
-                            graph[j][i] = weight
-                        
-    except ValueError:
-        return jsonify({'error': 'La matriz debe contener solo números enteros o celdas vacías.'}), 400
-    except Exception as e:
-        return jsonify({'error': f'Error construyendo el grafo: {str(e)}'}), 500
 
-    
-    # Validar índices de nodos
-    if not (0 <= start_node_index < n and 0 <= end_node_index < n):
-        return jsonify({'error': 'Índices de nodo inicial o final fuera de rango.'}), 400
+def astar_search(graph, start_node, end_node, num_nodes, heuristic):
+    """A* con una heurística consistente cualquiera (lista indexada por nodo)."""
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    priority_queue = [(heuristic[start_node], start_node)]
+    settled_nodes = set()
+    pops = relaxations = 0
 
-    
-    # Llamar al algoritmo con pasos
-    status = "OK"
-    path_result = []
-    min_distance = INF
-    steps = []
+    while priority_queue:
+        _, u = heapq.heappop(priority_queue)
+        pops += 1
+        if pops % CHECKPOINT_POPS == 0:
+            checkpoint()
+        if u in settled_nodes:
+            continue
+        if u == end_node:
+            count(relaxations=relaxations, heap_pushes=relaxations + 1, heap_pops=pops)
+            return as_distance(distances[u]), extract_path(predecessors, start_node, end_node)
+        settled_nodes.add(u)
+        for v, weight in rows[u]:
+            distance = distances[u] + weight
+            if distance < distances[v]:
+                distances[v] = distance
+                predecessors[v] = u
+                heapq.heappush(priority_queue, (distance + heuristic[v], v))
+                relaxations += 1
 
-    if algorithm == 'dijkstra':
-        if has_negative_weights:
-            status = "Peso Negativo Detectado"
-            # FIX para evitar IndexError: Se añade un paso de error
-            steps.append({
-                'description': "Peso Negativo Detectado. Dijkstra no es aplicable a grafos con aristas de peso negativo.",
-                'activeNodeIndex': None,
+    count(relaxations=relaxations, heap_pushes=relaxations + 1, heap_pops=pops)
+    return INF, []
+
+
+def iter_bidirectional_dijkstra_steps(graph, start_node, end_node, num_nodes):
+    """
+    Pasos del Dijkstra bidireccional. currentDistances y los predecesores muestran la búsqueda
+    hacia adelante; la búsqueda hacia atrás se ve en los nodos fijados y en las aristas activas.
+    Al terminar, el tramo hacia atrás del camino se incorpora a distancias y predecesores.
+    """
+    start_name, end_name = node_name_from_index(start_node), node_name_from_index(end_node)
+    rows = (graph.rows(), graph.reverse().rows())
+    distances = (new_distances(num_nodes, start_node), new_distances(num_nodes, end_node))
+    parents = (new_predecessors(num_nodes), new_predecessors(num_nodes))
+    queues = ([(0, start_node)], [(0, end_node)])
+    settled = (set(), set())
+    best_distance, meeting_node = (0, start_node) if start_node == end_node else (INF, NO_PREDECESSOR)
+
+    yield {
+        'description': f"Inicialización: búsqueda hacia adelante desde {start_name} y hacia atrás desde {end_name} (distancia 0 en ambos extremos).",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [start_node, end_node],
+        'distanceChanges': [[start_node, 0]],
+        'iteration': 0,
+    }
+
+    iteration_count = 1
+    while queues[0] and queues[1]:
+        if queues[0][0][0] + queues[1][0][0] >= best_distance:
+            yield {
+                'description': f"Criterio de parada: la suma de los mínimos de ambas colas ({as_distance(queues[0][0][0] + queues[1][0][0])}) no mejora el mejor camino encontrado ({as_distance(best_distance)}).",
+                'activeNodeIndex': meeting_node,
                 'activeEdgeIndices': None,
-                'settledNodeIndices': [],
                 'updatedNodeIndices': [],
-                'pathEdgesIndices': [],
-                'currentDistances': {},
-                'iteration': 0,
-                'negativeCycleDetected': False,
-            })
-        else:
-            status, path_result, min_distance, steps = dijkstra_with_steps(graph, start_node_index, end_node_index, n)
-            
-    elif algorithm == 'bellman-ford':
-        status, path_result, min_distance, steps = bellman_ford_with_steps(graph, start_node_index, end_node_index, n)
-    else:
-        return jsonify({'error': 'Algoritmo no válido'}), 400
+                'iteration': iteration_count,
+            }
+            break
+        side = 0 if queues[0][0][0] <= queues[1][0][0] else 1
+        direction = "hacia adelante" if side == 0 else "hacia atrás"
+        current_distance, u = heapq.heappop(queues[side])
+        if u in settled[side]:
+            continue
+        settled[side].add(u)
 
-    # Estructurar la respuesta final (incluyendo el objeto steps)
-    base_response = {
-        'algorithm': algorithm,
-        'steps': {
-            'algorithm': algorithm,
-            'steps': steps
+        yield {
+            'description': f"Iteración {iteration_count} (búsqueda {direction}): Nodo {node_name_from_index(u)} fijado (distancia {'desde ' + start_name if side == 0 else 'hasta ' + end_name}: {as_distance(current_distance)}).",
+            'activeNodeIndex': u,
+            'activeEdgeIndices': None,
+            'updatedNodeIndices': [u],
+            'settledNodes': [u],
+            'iteration': iteration_count,
         }
+        iteration_count += 1
+
+        own, other = distances[side], distances[1 - side]
+        for v, weight in rows[side][u]:
+            distance = current_distance + weight
+            if distance < own[v]:
+                own[v] = distance
+                parents[side][v] = u
+                heapq.heappush(queues[side], (distance, v))
+                if side == 0:
+                    yield {
+                        'description': f"Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia desde {start_name} a {node_name_from_index(v)} actualizada a {as_distance(distance)}.",
+                        'activeNodeIndex': u,
+                        'activeEdgeIndices': [u, v],
+                        'updatedNodeIndices': [v],
+                        'distanceChanges': [[v, display_distance(distance)]],
+                        'predecessorChanges': [[v, u]],
+                        'iteration': iteration_count - 1,
+                    }
+                else:
+                    yield {
+                        'description': f"Relajación hacia atrás del borde ({node_name_from_index(v)} -> {node_name_from_index(u)}) con peso {weight}. Distancia de {node_name_from_index(v)} hasta {end_name} actualizada a {as_distance(distance)}.",
+                        'activeNodeIndex': u,
+                        'activeEdgeIndices': [v, u],
+                        'updatedNodeIndices': [v],
+                        'iteration': iteration_count - 1,
+                    }
+            if own[v] + other[v] < best_distance:
+                best_distance, meeting_node = own[v] + other[v], v
+                yield {
+                    'description': f"Las búsquedas se encuentran en {node_name_from_index(v)}: nuevo mejor camino de {start_name} a {end_name} con distancia {as_distance(best_distance)}.",
+                    'activeNodeIndex': v,
+                    'activeEdgeIndices': None,
+                    'updatedNodeIndices': [v],
+                    'iteration': iteration_count - 1,
+                }
+
+    if best_distance == INF:
+        return "OK", [], INF, None
+
+    path = _join_bidirectional_path(*parents, start_node, end_node, meeting_node)
+    backward_half = path[path.index(meeting_node):]
+    distance_changes, predecessor_changes = [], []
+    for previous, node in zip(backward_half, backward_half[1:]):
+        distances[0][node] = distances[0][previous] + graph[previous][node]
+        distance_changes.append([node, display_distance(distances[0][node])])
+        predecessor_changes.append([node, previous])
+    yield {
+        'description': f"Camino completo unido en {node_name_from_index(meeting_node)}: distancia final {as_distance(best_distance)}.",
+        'activeNodeIndex': end_node,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': backward_half[1:],
+        'distanceChanges': distance_changes,
+        'predecessorChanges': predecessor_changes,
+        'iteration': iteration_count,
     }
+    return "OK", path, as_distance(best_distance), None
 
-    if status == "Ciclo Negativo Detectado":
-        response = {
-            'distance': "N/A",
-            'path': "Ciclo Negativo Detectado. La ruta más corta es indefinida.",
-            'path_indices': [],
-            **base_response
+
+def iter_astar_steps(graph, start_node, end_node, num_nodes, positions=None, heuristic=None):
+    """
+    Pasos de A*: como Dijkstra, pero la cola se ordena por f = g + h (por defecto h es la de
+    euclidean_heuristic).
+    """
+    if heuristic is None:
+        heuristic = euclidean_heuristic(graph, positions, end_node)
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    priority_queue = [(heuristic[start_node], start_node)]
+    settled_nodes = set()
+
+    yield {
+        'description': f"Inicialización: Distancia a {node_name_from_index(start_node)} = 0. Nodo inicial añadido a la cola con f = g + h = {heuristic[start_node]:.2f}.",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [start_node],
+        'distanceChanges': [[start_node, 0]],
+        'iteration': 0,
+    }
+
+    iteration_count = 1
+    while priority_queue:
+        estimate, u = heapq.heappop(priority_queue)
+        if u in settled_nodes:
+            continue
+        settled_nodes.add(u)
+
+        yield {
+            'description': f"Iteración {iteration_count}: Nodo {node_name_from_index(u)} seleccionado (g = {as_distance(distances[u])}, f = {estimate:.2f}). Este nodo se considera 'fijado'.",
+            'activeNodeIndex': u,
+            'activeEdgeIndices': None,
+            'updatedNodeIndices': [u],
+            'settledNodes': [u],
+            'iteration': iteration_count,
         }
-    elif status == "Peso Negativo Detectado":
-        response = {
-            'distance': "N/A",
-            'path': "Dijkstra no es compatible con pesos negativos. Use Bellman-Ford.",
+        iteration_count += 1
+
+        if u == end_node:
+            break
+
+        for v, weight in rows[u]:
+            new_distance = distances[u] + weight
+            if new_distance < distances[v]:
+                distances[v] = new_distance
+                predecessors[v] = u
+                heapq.heappush(priority_queue, (new_distance + heuristic[v], v))
+                yield {
+                    'description': f"Relajación del borde ({node_name_from_index(u)} -> {node_name_from_index(v)}) con peso {weight}. Distancia a {node_name_from_index(v)} actualizada a {as_distance(new_distance)} (f = {new_distance + heuristic[v]:.2f}).",
+                    'activeNodeIndex': u,
+                    'activeEdgeIndices': [u, v],
+                    'updatedNodeIndices': [v],
+                    'distanceChanges': [[v, display_distance(new_distance)]],
+                    'predecessorChanges': [[v, u]],
+                    'iteration': iteration_count - 1,
+                }
+
+    final_path = extract_path(predecessors, start_node, end_node)
+    return "OK", final_path, as_distance(distances[end_node]), None
+
+
+# =======================================================
+# ALT: A* CON COTAS DE LANDMARKS (GRAFOS PREPROCESADOS)
+# =======================================================
+# La heurística sale del índice de landmarks del grafo (POST /graphs/<graph_id>/index). Sin índice
+# vigente h = 0 y la búsqueda equivale a Dijkstra con parada temprana, así que siempre es exacta.
+def landmark_index_for(graph):
+    """Índice vigente del grafo: en memoria o, con GRAPH_STORE_DIR, el guardado en disco."""
+    index = landmark_indexes.get(graph)
+    if index is None and GRAPH_STORE_DIR and os.path.isdir(GRAPH_STORE_DIR):
+        index = load_index(GRAPH_STORE_DIR, graph)
+        if index is not None:
+            landmark_indexes.put(index)
+    return index
+
+
+def discard_landmark_index(graph_id):
+    """
+    Olvida el índice del grafo en memoria y, con GRAPH_STORE_DIR, su archivo (si no, landmark_index_for
+    lo volvería a cargar). Devuelve True si existía en alguno de los dos.
+    """
+    removed = landmark_indexes.remove(graph_id)
+    if GRAPH_STORE_DIR and delete_index(GRAPH_STORE_DIR, graph_id):
+        removed = True
+    return removed
+
+
+def landmark_heuristic(graph, end_node):
+    index = landmark_index_for(graph)
+    if index is None:
+        return [0.0] * graph.num_nodes
+    return index.lower_bounds(end_node).tolist()
+
+
+def alt_search(graph, start_node, end_node, num_nodes):
+    """Consulta punto a punto con A* y la heurística del índice de landmarks."""
+    if start_node == end_node:
+        return 0, [start_node]
+    heuristic = landmark_heuristic(graph, end_node)
+    if heuristic[start_node] == INF:
+        # Los landmarks prueban que end_node es inalcanzable desde start_node
+        return INF, []
+    return astar_search(graph, start_node, end_node, num_nodes, heuristic)
+
+
+def iter_alt_steps(graph, start_node, end_node, num_nodes):
+    return iter_astar_steps(graph, start_node, end_node, num_nodes, heuristic=landmark_heuristic(graph, end_node))
+
+
+# =======================================================
+# EJECUCIÓN DE LOS ALGORITMOS CON PASOS
+# =======================================================
+# Los iter_*_steps son generadores: emiten un delta por paso (ver step_trace.py) en cuanto se
+# produce y devuelven (estado, camino, distancia, ciclo): el camino es siempre una lista y ciclo es
+# el NegativeCycle encontrado o None. Los *_with_steps los consumen completos y expanden los deltas
+# al formato clásico de pasos con instantánea completa.
+def collect_deltas(step_iterator):
+    """Consume un generador de pasos y devuelve (estado, camino, distancia, ciclo, deltas)."""
+    run = StepRun(step_iterator)
+    deltas = list(run)
+    count(steps=len(deltas))
+    status, path, distance, cycle = run.result
+    return status, path, distance, cycle, deltas
+
+
+def collect_steps(step_iterator, num_nodes):
+    """
+    Como collect_deltas, pero con los pasos expandidos a instantáneas completas. Devuelve
+    (estado, camino, distancia, pasos); los nodos del ciclo negativo van en el último paso.
+    """
+    status, path, distance, _, deltas = collect_deltas(step_iterator)
+    return status, path, distance, list(iter_full_steps(deltas, num_nodes))
+
+
+def bellman_ford_with_steps(graph, start_node, end_node, num_nodes, queue_based=False, early_cycle_detection=False):
+    """queue_based=True usa la variante con cola de trabajo (SPFA). Solo recorre los nodos de algún camino."""
+    step_function = iter_spfa_steps if queue_based else iter_bellman_ford_steps
+    step_iterator = iter_pruned_steps(
+        step_function, graph, start_node, end_node, num_nodes, early_cycle_detection=early_cycle_detection
+    )
+    return collect_steps(step_iterator, num_nodes)
+
+
+def dijkstra_with_steps(graph, start_node, end_node, num_nodes):
+    return collect_steps(iter_dijkstra_steps(graph, start_node, end_node, num_nodes), num_nodes)
+
+
+def bellman_ford_vectorized_with_steps(graph, start_node, end_node, num_nodes, early_cycle_detection=False):
+    step_iterator = iter_pruned_steps(
+        iter_bellman_ford_vectorized_steps, graph, start_node, end_node, num_nodes,
+        early_cycle_detection=early_cycle_detection,
+    )
+    return collect_steps(step_iterator, num_nodes)
+
+def bidirectional_dijkstra_with_steps(graph, start_node, end_node, num_nodes):
+    return collect_steps(iter_bidirectional_dijkstra_steps(graph, start_node, end_node, num_nodes), num_nodes)
+
+def astar_with_steps(graph, start_node, end_node, num_nodes, positions=None):
+    return collect_steps(iter_astar_steps(graph, start_node, end_node, num_nodes, positions), num_nodes)
+
+
+def iter_negative_weight_rejection_steps():
+    """Único paso (delta sin cambios) emitido cuando se pide Dijkstra sobre un grafo con pesos negativos."""
+    yield {
+        'description': "Peso Negativo Detectado. Dijkstra no es aplicable a grafos con aristas de peso negativo.",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [],
+        'iteration': 0,
+        'negativeCycleDetected': False,
+    }
+    return "Peso Negativo Detectado", [], INF, None
+
+
+def iter_unreachable_steps(start_node, end_node):
+    """Único paso emitido cuando end_node no es alcanzable desde start_node: el algoritmo no se ejecuta."""
+    yield {
+        'description': f"No hay camino: {node_name_from_index(end_node)} no es alcanzable desde {node_name_from_index(start_node)}. No es necesario ejecutar el algoritmo.",
+        'activeNodeIndex': None,
+        'activeEdgeIndices': None,
+        'updatedNodeIndices': [start_node],
+        'distanceChanges': [[start_node, 0]],
+        'iteration': 0,
+        'negativeCycleDetected': False,
+    }
+    return "OK", [], INF, None
+
+
+def iter_pruned_steps(step_function, graph, start_node, end_node, num_nodes, *extra, prune=True, **options):
+    """Pasos de step_function sobre path_search_graph, o el paso único de iter_unreachable_steps."""
+    search_graph = path_search_graph(graph, start_node, end_node, prune)
+    if search_graph is None:
+        return iter_unreachable_steps(start_node, end_node)
+    return step_function(search_graph, start_node, end_node, num_nodes, *extra, **options)
+
+
+# Algoritmos seleccionables en /find_path:
+#   step_function  -> generador de pasos (visualización)
+#   tree_function  -> árbol de caminos mínimos completo desde el origen (cacheable; usado por lotes)
+#   path_function  -> consulta punto a punto sin pasos; si existe se usa en lugar del árbol
+#   uses_positions -> step_function y path_function reciben además las coordenadas de los nodos
+# Los que admiten pesos negativos (familia Bellman-Ford) aceptan además early_cycle_detection.
+AlgorithmSpec = namedtuple(
+    'AlgorithmSpec',
+    ['step_function', 'tree_function', 'supports_negative_weights', 'path_function', 'uses_positions'],
+    defaults=(None, False),
+)
+
+ALGORITHMS = {
+    'dijkstra': AlgorithmSpec(iter_dijkstra_steps, dijkstra_tree, False),
+    'dijkstra-indexed-heap': AlgorithmSpec(iter_dijkstra_indexed_heap_steps, dijkstra_indexed_heap_tree, False),
+    'dijkstra-dial': AlgorithmSpec(iter_dijkstra_dial_steps, dijkstra_dial_tree, False),
+    'bellman-ford': AlgorithmSpec(iter_bellman_ford_steps, bellman_ford_tree, True),
+    'bellman-ford-vectorized': AlgorithmSpec(iter_bellman_ford_vectorized_steps, bellman_ford_vectorized_tree, True),
+    'spfa': AlgorithmSpec(iter_spfa_steps, spfa_tree, True),
+    'bidirectional-dijkstra': AlgorithmSpec(iter_bidirectional_dijkstra_steps, dijkstra_tree, False, bidirectional_dijkstra),
+    'astar': AlgorithmSpec(iter_astar_steps, dijkstra_tree, False, astar, True),
+    'alt': AlgorithmSpec(iter_alt_steps, dijkstra_tree, False, alt_search),
+}
+
+
+def cycle_detection_options(spec, early_cycle_detection):
+    """Argumentos extra del algoritmo para la detección temprana de ciclos negativos (si la admite)."""
+    if early_cycle_detection and spec.supports_negative_weights:
+        return {'early_cycle_detection': True}
+    return {}
+
+
+def iter_algorithm_steps(algorithm, graph, start_node, end_node, num_nodes, has_negative_weights, positions=None,
+                         early_cycle_detection=False):
+    """Devuelve el generador de pasos del algoritmo pedido (el nombre debe estar en ALGORITHMS)."""
+    spec = ALGORITHMS[algorithm]
+    if has_negative_weights and not spec.supports_negative_weights:
+        return iter_negative_weight_rejection_steps()
+    extra = (positions,) if spec.uses_positions else ()
+    return iter_pruned_steps(
+        spec.step_function, graph, start_node, end_node, num_nodes, *extra, prune=spec.supports_negative_weights,
+        **cycle_detection_options(spec, early_cycle_detection),
+    )
+
+
+def cached_shortest_path_tree(algorithm, graph, start_node, num_nodes, early_cycle_detection=False):
+    """Árbol de caminos mínimos desde start_node, tomado de spt_cache si ya se calculó. Devuelve (árbol, acierto)."""
+    spec = ALGORITHMS[algorithm]
+    options = cycle_detection_options(spec, early_cycle_detection)
+    # Sin ciclo negativo ambos modos dan el mismo árbol y, con él, el árbol solo sirve para
+    # informar del ciclo, así que comparten la entrada de la caché
+    return spt_cache.get_or_compute(
+        graph, start_node, algorithm, lambda: spec.tree_function(graph, start_node, num_nodes, **options)
+    )
+
+
+def repair_cached_trees(old_graph, new_graph, changes):
+    """
+    Tras editar aristas, repara los árboles cacheados del grafo anterior y los guarda bajo el hash
+    del grafo nuevo, en lugar de recalcularlos. Devuelve cuántos árboles se repararon.
+    """
+    repaired = 0
+    for source, algorithm, tree in spt_cache.trees_for_graph(old_graph.content_hash()):
+        if new_graph.has_negative_weights and not ALGORITHMS[algorithm].supports_negative_weights:
+            continue
+        new_tree = repair_tree(tree, new_graph, changes)
+        if new_tree is not None:
+            spt_cache.put(spt_cache.key(new_graph, source, algorithm), new_tree)
+            repaired += 1
+    return repaired
+
+
+def find_paths_batch(algorithm, graph, pairs, num_nodes, has_negative_weights):
+    """
+    Resuelve una lista de pares (origen, destino) agrupándolos por origen: cada origen distinto
+    toma su árbol de la caché o lo calcula una sola vez; los que faltan se calculan en paralelo con
+    parallel_executor. Devuelve los resultados en el orden de la solicitud y la cantidad de árboles
+    que hubo que calcular.
+    """
+    pairs_by_source = {}
+    for index, (source, target) in enumerate(pairs):
+        pairs_by_source.setdefault(source, []).append((index, target))
+
+    trees = {}
+    missing = []
+    if not (has_negative_weights and not ALGORITHMS[algorithm].supports_negative_weights):
+        for source in pairs_by_source:
+            trees[source] = spt_cache.get(spt_cache.key(graph, source, algorithm))
+            if trees[source] is None:
+                missing.append(source)
+        computed = parallel_executor.run_sources(graph, missing, ALGORITHMS[algorithm].tree_function)
+        for source, tree in zip(missing, computed):
+            spt_cache.put(spt_cache.key(graph, source, algorithm), tree)
+            trees[source] = tree
+
+    results = [None] * len(pairs)
+    for source, targets in pairs_by_source.items():
+        tree = trees.get(source)
+        for index, target in targets:
+            cycle = None
+            if tree is None:
+                status, path, distance = "Peso Negativo Detectado", [], INF
+            else:
+                distance, path = tree.path_to(target)
+                status = "Ciclo Negativo Detectado" if distance is None else "OK"
+                if distance is None:
+                    path, cycle = [], tree.cycle
+            results[index] = {
+                'start_node_index': source,
+                'end_node_index': target,
+                **build_path_response(algorithm, status, path, distance, cycle),
+            }
+    return results, len(missing)
+
+
+# Yen sobre Dijkstra: con 'k' > 1 solo se acepta el algoritmo que realmente se ejecuta
+K_SHORTEST_ALGORITHMS = ('dijkstra',)
+
+
+def find_k_shortest_paths(graph, start_node, end_node, num_nodes, k):
+    """
+    Los k caminos simples más cortos (Yen) como [(distancia, camino)]. El árbol hacia end_node
+    (Dijkstra sobre el grafo inverso) sale de spt_cache y las búsquedas de desvío de cada
+    iteración se reparten con parallel_executor.
+    """
+    if start_node == end_node:
+        return [(0, [start_node])]
+    reverse_tree, _ = cached_shortest_path_tree('dijkstra', graph.reverse(), end_node, num_nodes)
+    shared_args = (end_node, reverse_tree.distances, reverse_tree.predecessors)
+    paths = yen_k_shortest_paths(
+        graph, start_node, end_node, k, reverse_tree,
+        lambda tasks: parallel_executor.run_tasks(graph, spur_search, tasks, shared_args),
+    )
+    count(k_paths=len(paths))
+    return paths
+
+
+# Motores de /all_pairs; 'auto' elige según la densidad del grafo
+ALL_PAIRS_ENGINES = ('auto', 'floyd-warshall', 'johnson')
+
+
+def compute_all_pairs(graph, engine='auto'):
+    """Caminos mínimos entre todos los pares: Floyd-Warshall (denso) o Johnson (disperso)."""
+    if engine == 'auto':
+        engine = choose_engine(graph)
+    if engine == 'floyd-warshall':
+        return floyd_warshall(graph)
+    return johnson(graph, bellman_ford_vectorized_tree, dijkstra_tree, parallel_executor.run_sources)
+
+
+def build_all_pairs_response(result):
+    """Matriz de distancias ("∞" si no hay camino) y de sucesores (null si no hay camino)."""
+    if result.negative_cycle:
+        return {
+            'engine': result.engine,
+            'status': "Ciclo Negativo Detectado",
+            'distances': None,
+            'successors': None,
+        }
+    return {
+        'engine': result.engine,
+        'status': "OK",
+        'distances': [[display_distance(d) for d in row] for row in result.distances.tolist()],
+        'successors': [
+            [s if s != NO_SUCCESSOR else None for s in row] for row in result.successors.tolist()
+        ],
+    }
+
+
+def find_path_without_steps(algorithm, graph, start_node, end_node, num_nodes, has_negative_weights, positions=None,
+                            early_cycle_detection=False):
+    """
+    Resultado (estado, camino, distancia, acierto de caché) sin traza de pasos: consulta punto a
+    punto para los algoritmos que la tienen, o árbol completo vía spt_cache para el resto.
+    En la familia Bellman-Ford el árbol del grafo completo se cachea por origen; si no estaba
+    cacheado y end_node es inalcanzable, se responde sin ejecutar el algoritmo. Si el árbol tiene un
+    ciclo negativo, la poda decide si afecta al camino pedido: se recalcula (sin caché) sobre los
+    nodos de algún camino start_node -> end_node, igual que la traza de pasos.
+    Devuelve (estado, camino, distancia, ciclo, acierto); ciclo es el NegativeCycle encontrado o None.
+    """
+    spec = ALGORITHMS[algorithm]
+    if has_negative_weights and not spec.supports_negative_weights:
+        return "Peso Negativo Detectado", [], INF, None, False
+    if spec.path_function is not None:
+        extra = (positions,) if spec.uses_positions else ()
+        distance, path = spec.path_function(graph, start_node, end_node, num_nodes, *extra)
+        return "OK", path, distance, None, False
+    if not spec.supports_negative_weights:
+        tree, hit = cached_shortest_path_tree(algorithm, graph, start_node, num_nodes)
+        distance, path = tree.path_to(end_node)
+        return "OK", path, distance, None, hit
+
+    options = cycle_detection_options(spec, early_cycle_detection)
+    key = spt_cache.key(graph, start_node, algorithm)
+    tree = spt_cache.get(key)
+    hit = tree is not None
+    if tree is None:
+        if not graph.reachable_from(start_node, target=end_node)[end_node]:
+            return "OK", [], INF, None, False
+        tree = spec.tree_function(graph, start_node, num_nodes, **options)
+        spt_cache.put(key, tree)
+    if not tree.negative_cycle:
+        distance, path = tree.path_to(end_node)
+        return "OK", path, distance, None, hit
+
+    pruned = restrict_to_path(graph, start_node, end_node)
+    if pruned is None:
+        return "OK", [], INF, None, hit
+    pruned_tree = spec.tree_function(pruned, start_node, num_nodes, **options)
+    if pruned_tree.negative_cycle:
+        return "Ciclo Negativo Detectado", [], INF, pruned_tree.cycle, hit
+    distance, path = pruned_tree.path_to(end_node)
+    return "OK", path, distance, None, hit
+
+
+def negative_cycle_response(cycle):
+    """Ciclo negativo para la respuesta: nodos, recorrido cerrado legible y peso total."""
+    return {
+        'nodes': cycle.nodes,
+        'path': " -> ".join(node_name_from_index(i) for i in cycle.nodes + cycle.nodes[:1]),
+        'weight': cycle.weight,
+    }
+
+
+def build_path_response(algorithm, status, path_result, min_distance, cycle=None):
+    """
+    Campos de resultado comunes (distance, path, path_indices) según el estado del algoritmo.
+    El NegativeCycle encontrado, si lo hay, va en 'negative_cycle'.
+    """
+    if status == "Ciclo Negativo Detectado":
+        response = {
+            'distance': "N/A",
+            'path': "Ciclo Negativo Detectado. La ruta más corta es indefinida.",
+            'path_indices': [],
+        }
+        if cycle is not None:
+            response['negative_cycle'] = negative_cycle_response(cycle)
+    elif status == "Peso Negativo Detectado":
+        response = {
+            'distance': "N/A",
+            'path': "Dijkstra no es compatible con pesos negativos. Use Bellman-Ford.",
             'path_indices': [],
-            **base_response
         }
     elif min_distance == INF:
         response = {
             'distance': "No hay camino",
             'path': "No hay camino posible entre los nodos seleccionados.",
             'path_indices': [],
-            **base_response
         }
     else:
         path_string = " -> ".join([node_name_from_index(i) for i in path_result])
@@ -447,13 +1285,923 @@ def find_path_route():
             'distance': min_distance,
             'path': path_string,
             'path_indices': path_result,
-            **base_response
         }
+    response['algorithm'] = algorithm
+    return response
+
+
+def build_k_paths_response(algorithm, k, paths):
+    """Resultado del mejor camino (como build_path_response) más 'paths': los k caminos en orden."""
+    best_distance, best_path = paths[0] if paths else (INF, [])
+    response = build_path_response(algorithm, "OK", best_path, best_distance)
+    response['k'] = k
+    response['paths'] = [
+        {
+            'rank': rank,
+            'distance': distance,
+            'path': " -> ".join(node_name_from_index(i) for i in path),
+            'path_indices': path,
+        }
+        for rank, (distance, path) in enumerate(paths, start=1)
+    ]
+    return response
+
+
+def build_step_trace(algorithm, deltas, num_nodes, trace_format, keyframe_interval, distance_format='map'):
+    """
+    Objeto 'steps' de la respuesta: pasos completos (formato clásico) o traza de deltas.
+    distance_format='list' codifica currentDistances como lista indexada por nodo.
+    """
+    if trace_format == 'delta':
+        return {'algorithm': algorithm, **build_delta_trace(deltas, num_nodes, keyframe_interval)}
+    steps = iter_full_steps(deltas, num_nodes, distances_as_list=distance_format == 'list')
+    return {'algorithm': algorithm, 'steps': list(steps)}
+
+
+def store_lazy_trace(algorithm, graph, start_node, end_node, num_nodes, step_iterator, keyframe_interval, positions=None,
+                     early_cycle_detection=False):
+    """
+    Ejecuta el algoritmo (si la misma consulta no está ya guardada) y guarda su traza en
+    trace_store. Devuelve (trace_id, StoredTrace).
+    """
+    extra = positions.tobytes() if positions is not None else None
+    if early_cycle_detection:
+        # Con ciclo negativo la traza se detiene antes: es otra consulta
+        extra = (extra or b'') + b'early-cycle-detection'
+    trace_id = trace_id_for(graph, algorithm, start_node, end_node, keyframe_interval, extra)
+    stored = trace_store.get(trace_id)
+    if stored is None:
+        status, path_result, min_distance, cycle, deltas = collect_deltas(step_iterator)
+        stored = StoredTrace(
+            algorithm,
+            build_delta_trace(deltas, num_nodes, keyframe_interval),
+            build_path_response(algorithm, status, path_result, min_distance, cycle),
+        )
+        trace_store.put(trace_id, stored)
+    return trace_id, stored
+
+
+def iter_ndjson_records(algorithm, step_iterator, num_nodes, trace_format='full', keyframe_interval=DEFAULT_KEYFRAME_INTERVAL, distance_format='map'):
+    """
+    Serializa la ejecución como NDJSON: una línea {"type": "step"} por paso a medida que se
+    generan y una línea final {"type": "summary"} con distancia, camino y estado.
+    En formato 'delta' se emiten líneas {"type": "delta"} y, periódicamente, {"type": "keyframe"}.
+    """
+    run = StepRun(step_iterator)
+    if trace_format == 'delta':
+        records = iter_delta_records(run, num_nodes, keyframe_interval)
+    else:
+        steps = iter_full_steps(run, num_nodes, distances_as_list=distance_format == 'list')
+        records = (('step', step) for step in steps)
+
+    index = 0
+    for kind, record in records:
+        if kind == 'keyframe':
+            yield dumps({'type': 'keyframe', 'keyframe': record}) + b"\n"
+            continue
+        yield dumps({'type': kind, 'index': index, kind: record}) + b"\n"
+        index += 1
+
+    count(steps=index)
+    status, path_result, min_distance, cycle = run.result
+    summary = build_path_response(algorithm, status, path_result, min_distance, cycle)
+    yield dumps({'type': 'summary', 'status': status, 'step_count': index, 'format': trace_format, **summary}) + b"\n"
+
+def run_find_path_job(job, algorithm, graph, start_node, end_node, num_nodes, has_negative_weights,
+                      positions, include_steps, trace_format, keyframe_interval, distance_format,
+                      early_cycle_detection=False):
+    """
+    Tarea de un trabajo asíncrono de /find_path: misma respuesta que la ruta síncrona. Los pasos
+    pasan por job.track_steps (progreso, cancelación y límites); antes de expandir la traza a pasos
+    completos se reserva su memoria estimada, que es la parte que crece con V × pasos.
+    """
+    if not include_steps:
+        status, path_result, min_distance, cycle, _ = find_path_without_steps(
+            algorithm, graph, start_node, end_node, num_nodes, has_negative_weights, positions, early_cycle_detection
+        )
+        return build_path_response(algorithm, status, path_result, min_distance, cycle)
+
+    step_iterator = iter_algorithm_steps(
+        algorithm, graph, start_node, end_node, num_nodes, has_negative_weights, positions, early_cycle_detection
+    )
+    status, path_result, min_distance, cycle, deltas = collect_deltas(job.track_steps(step_iterator))
+    if trace_format == 'full':
+        job.reserve_memory(estimate_full_trace_bytes(len(deltas), num_nodes))
+    response = build_path_response(algorithm, status, path_result, min_distance, cycle)
+    response['steps'] = build_step_trace(algorithm, deltas, num_nodes, trace_format, keyframe_interval, distance_format)
+    return response
+
+
+def parse_job_limit(raw_value, server_limit, cast):
+    """Límite pedido por el cliente (positivo), acotado por el máximo del servidor."""
+    if raw_value is None:
+        return server_limit
+    value = cast(raw_value)
+    if value <= 0:
+        raise ValueError("los límites del trabajo deben ser positivos")
+    return min(value, server_limit)
+
+# =======================================================
+# CONSTRUCCIÓN DEL GRAFO A PARTIR DE LA SOLICITUD
+# =======================================================
+class GraphInputError(ValueError):
+    """Error de validación del grafo enviado por el cliente (se responde con 400)."""
+    status_code = 400
+
+
+class GraphNotFoundError(GraphInputError):
+    """El graph_id pedido no está (o ya no está) en el registro."""
+    status_code = 404
+
+
+class GraphConflictError(GraphInputError):
+    """El mismo grafo ya está registrado con otro valor de is_directed."""
+    status_code = 409
+
+
+def detect_graph_format(data):
+    """Determina qué representación del grafo trae la solicitud: 'graph_id', 'matrix', 'edges' o 'csr'."""
+    if 'graph_id' in data:
+        return 'graph_id'
+    if 'matrix' in data:
+        return 'matrix'
+    if 'edges' in data:
+        return 'edges'
+    if 'indptr' in data:
+        if 'indices' not in data or 'weights' not in data:
+            raise KeyError("el formato CSR requiere 'indptr', 'indices' y 'weights'")
+        return 'csr'
+    raise KeyError("se requiere 'matrix', 'edges' o 'indptr'/'indices'/'weights'")
+
+
+def parse_weight(value):
+    """Convierte un peso a entero con las mismas reglas que las celdas de la matriz."""
+    return int(str(value).strip())
+
+
+def build_graph_from_matrix(matrix_data, is_directed):
+    """
+    Construye el grafo CSR a partir de la matriz densa (O(n²)). Las matrices canónicas (cadenas
+    con enteros o vacías) se leen vectorizadas con parse_dense_matrix; el resto, celda a celda.
+    """
+    n = len(matrix_data)
+    cells = parse_dense_matrix(matrix_data)
+    if cells is not None:
+        graph = CSRGraph.from_dense_cells(n, *cells, symmetrize=not is_directed)
+        return graph, n, graph.has_negative_weights
+
+    sources, targets, weights = [], [], []
+
+    try:
+        for i in range(n):
+            for j in range(n):
+                cell_value = str(matrix_data[i][j]).strip()
+                if cell_value != "":
+                    # Intentar convertir a entero, si falla, es un valor inválido
+                    sources.append(i)
+                    targets.append(j)
+                    weights.append(int(cell_value))
+    except ValueError:
+        raise GraphInputError('La matriz debe contener solo números enteros o celdas vacías.')
+
+    # Manejo de grafo no dirigido: si la celda simétrica está vacía, se llena con el mismo peso
+    graph = CSRGraph.from_edges(n, sources, targets, weights, symmetrize=not is_directed)
+    return graph, n, graph.has_negative_weights
+
+
+def build_graph_from_edges(edges, is_directed, num_nodes=None):
+    """
+    Construye el grafo CSR a partir de una lista de aristas [[u, v, peso], ...] en O(V+E).
+    Si no se indica num_nodes, se infiere del mayor índice usado.
+    Las aristas repetidas conservan el menor peso. En grafos no dirigidos, la arista inversa
+    solo se añade si no fue enviada explícitamente (igual que la celda simétrica vacía de la matriz).
+    """
+    try:
+        sources, targets, weights = [], [], []
+        for u, v, w in edges:
+            sources.append(int(u))
+            targets.append(int(v))
+            weights.append(parse_weight(w))
+    except (TypeError, ValueError):
+        raise GraphInputError('Cada arista debe tener la forma [origen, destino, peso] con valores enteros.')
+
+    n = num_nodes if num_nodes is not None else 1 + max(max(sources, default=-1), max(targets, default=-1))
+    for u, v in zip(sources, targets):
+        if not (0 <= u < n and 0 <= v < n):
+            raise GraphInputError(f'La arista ({u}, {v}) hace referencia a un nodo fuera de rango.')
+
+    graph = CSRGraph.from_edges(n, sources, targets, weights, symmetrize=not is_directed)
+    return graph, n, graph.has_negative_weights
+
+
+def build_graph_from_csr(indptr, indices, weights, is_directed):
+    """Construye el grafo CSR a partir de arreglos (indptr, indices, weights) en O(V+E)."""
+    try:
+        indptr = np.asarray([int(x) for x in indptr], dtype=np.int64)
+        indices = np.asarray([int(x) for x in indices], dtype=np.int64)
+        weights = [parse_weight(w) for w in weights]
+    except (TypeError, ValueError):
+        raise GraphInputError("'indptr', 'indices' y 'weights' deben ser listas de enteros.")
+    if len(indptr) == 0 or indptr[0] != 0 or np.any(np.diff(indptr) < 0):
+        raise GraphInputError("'indptr' debe empezar en 0 y ser no decreciente.")
+    if len(indices) != len(weights) or indptr[-1] != len(indices):
+        raise GraphInputError("'indices' y 'weights' deben tener longitud indptr[-1].")
+
+    n = len(indptr) - 1
+    if len(indices) and (indices.min() < 0 or indices.max() >= n):
+        raise GraphInputError("'indices' contiene nodos fuera de rango.")
+
+    sources = np.repeat(np.arange(n, dtype=np.int64), np.diff(indptr))
+    graph = CSRGraph.from_edges(n, sources, indices, weights, symmetrize=not is_directed)
+    return graph, n, graph.has_negative_weights
+
+
+def build_graph_from_payload(data, graph_format, is_directed):
+    """Despacha la construcción del grafo según el formato detectado en la solicitud."""
+    if graph_format == 'matrix':
+        return build_graph_from_matrix(data['matrix'], is_directed)
+
+    if graph_format == 'edges':
+        num_nodes = data.get('num_nodes')
+        if num_nodes is not None:
+            try:
+                num_nodes = int(num_nodes)
+            except (TypeError, ValueError):
+                raise GraphInputError("'num_nodes' debe ser un entero.")
+            if not 1 <= num_nodes <= MAX_NUM_NODES:
+                raise GraphInputError(f"'num_nodes' debe estar entre 1 y {MAX_NUM_NODES}.")
+        return build_graph_from_edges(data['edges'], is_directed, num_nodes=num_nodes)
+
+    return build_graph_from_csr(data['indptr'], data['indices'], data['weights'], is_directed)
+
+
+def resolve_request_graph(data, graph_format, is_directed):
+    """Grafo de la solicitud: compilado del registro si trae graph_id, o construido del payload."""
+    if graph_format == 'graph_id':
+        entry = graph_registry.get(str(data['graph_id']))
+        if entry is None:
+            raise GraphNotFoundError(f"Grafo no encontrado: {data['graph_id']}. Vuelva a registrarlo en /graphs.")
+        return entry.graph, entry.num_nodes, entry.has_negative_weights
+    return build_graph_from_payload(data, graph_format, is_directed)
+
+
+def graph_to_matrix(graph):
+    """Matriz densa de cadenas (formato del editor): peso en cada arista, "" donde no hay arista."""
+    matrix = [[""] * graph.num_nodes for _ in range(graph.num_nodes)]
+    for u, v, weight in zip(graph.edge_sources().tolist(), graph.indices.tolist(), graph.weights.tolist()):
+        matrix[u][v] = str(weight)
+    return matrix
+
+
+def graph_to_edges(graph):
+    return [list(edge) for edge in zip(graph.edge_sources().tolist(), graph.indices.tolist(), graph.weights.tolist())]
+
+
+def register_graph(graph, is_directed):
+    """graph_registry.add, con el conflicto de is_directed como GraphConflictError (409)."""
+    try:
+        return graph_registry.add(graph, is_directed)
+    except GraphRegistryConflict as e:
+        raise GraphConflictError(str(e))
+
+
+def import_binary_graph(data):
+    """
+    Registra un grafo recibido en formato binario. Con GRAPH_STORE_DIR se guarda en disco y se
+    registra la versión mapeada en memoria; si no, vistas sin copia sobre los bytes recibidos.
+    """
+    try:
+        graph, is_directed = from_bytes(data)
+    except BinaryGraphFormatError as e:
+        raise GraphInputError(str(e))
+    if GRAPH_STORE_DIR:
+        os.makedirs(GRAPH_STORE_DIR, exist_ok=True)
+        path = os.path.join(GRAPH_STORE_DIR, graph.content_hash() + BINARY_GRAPH_EXTENSION)
+        if not os.path.exists(path):
+            write_graph(path, graph, is_directed)
+        graph, stored_directed = load_graph(path, validate=False)
+        if stored_directed != is_directed:
+            raise GraphConflictError(
+                f"El grafo {graph.content_hash()} ya está guardado como "
+                f"{'dirigido' if stored_directed else 'no dirigido'}; elimínelo antes de importarlo con otro is_directed."
+            )
+    return register_graph(graph, is_directed)
+
+
+def parse_edge_edits(raw_edits, num_nodes, is_directed):
+    """
+    Ediciones [{"source": u, "target": v, "weight": w}] como tuplas (u, v, peso); weight null o ""
+    borra la arista. En grafos no dirigidos cada edición se aplica también a (v, u).
+    """
+    edits = []
+    try:
+        for edit in raw_edits:
+            u, v = int(edit['source']), int(edit['target'])
+            raw_weight = edit.get('weight')
+            weight = None if raw_weight is None or str(raw_weight).strip() == "" else parse_weight(raw_weight)
+            edits.append((u, v, weight))
+    except (KeyError, TypeError, ValueError):
+        raise GraphInputError('Cada edición debe tener la forma {"source": u, "target": v, "weight": entero o null}.')
+
+    for u, v, _ in edits:
+        if not (0 <= u < num_nodes and 0 <= v < num_nodes):
+            raise GraphInputError(f'La arista ({u}, {v}) hace referencia a un nodo fuera de rango.')
+    if not is_directed:
+        edits = [mirrored for u, v, w in edits for mirrored in ((u, v, w), (v, u, w))]
+    return edits
+
+
+def parse_positions(raw_positions, num_nodes):
+    """
+    Coordenadas de los nodos para la heurística de A*: {"0": {"x": .., "y": ..}, ...} (VisPositions
+    del frontend) o lista [[x, y], ...] indexada por nodo. Devuelve un arreglo float64 (num_nodes, 2).
+    """
+    if isinstance(raw_positions, dict):
+        raw_positions = {int(node): point for node, point in raw_positions.items()}
+        missing = [node for node in range(num_nodes) if node not in raw_positions]
+        if missing:
+            raise GraphInputError(f"Faltan las posiciones de los nodos: {missing[:10]}")
+        raw_positions = [raw_positions[node] for node in range(num_nodes)]
+    if len(raw_positions) != num_nodes:
+        raise GraphInputError(f"Se esperaban {num_nodes} posiciones y se recibieron {len(raw_positions)}.")
+    try:
+        points = [(point['x'], point['y']) if isinstance(point, dict) else tuple(point) for point in raw_positions]
+        positions = np.array(points, dtype=np.float64).reshape(num_nodes, 2)
+    except (KeyError, TypeError, ValueError):
+        raise GraphInputError("Las posiciones deben ser pares numéricos (x, y).")
+    if not np.isfinite(positions).all():
+        raise GraphInputError("Las posiciones deben ser pares numéricos (x, y).")
+    return positions
+
+
+def parse_flag(data, key, default):
+    """Flag booleano de la solicitud: solo true/false de JSON (la cadena "false" sería verdadera con bool())."""
+    value = data.get(key, default)
+    if not isinstance(value, bool):
+        raise ValueError(f"'{key}' debe ser true o false.")
+    return value
+
+
+def parse_graph_request(data):
+    """Formato y flag is_directed de la solicitud (is_directed no se requiere al usar graph_id)."""
+    graph_format = detect_graph_format(data)
+    is_directed = data['is_directed'] if graph_format != 'graph_id' else None
+    return graph_format, is_directed
+
+
+
+@app.route('/', methods=['GET'])
+def index():
+    info = {
+        "message": "Backend del proyecto Grafos (usa el frontend en React para interfaz).",
+        "endpoints": ["/find_path (POST)", "/find_paths (POST)", "/trace/<trace_id> (GET)", "/all_pairs (POST)", "/graphs (POST)", "/graphs/<graph_id> (GET, DELETE)", "/graphs/<graph_id>/edits (POST)", "/graphs/import (POST)", "/graphs/<graph_id>/export (GET)", "/graphs/<graph_id>/index (POST, GET, DELETE)", "/cache/stats (GET)", "/jobs (POST)", "/jobs/<job_id> (GET, DELETE)", "/jobs/<job_id>/events (GET)", "/jobs/<job_id>/result (GET)", "/metrics (GET)"]
+    }
+    return json_response(info)
+
+@app.route('/test', methods=['GET'])
+def test_route():
+    return json_response({"message": "El test funcionó. El servidor está actualizado."})
+
+@app.route('/find_path', methods=['POST', 'OPTIONS'])
+@profiled
+def find_path_route():
+    """
+    Ruta principal para encontrar el camino más corto utilizando Dijkstra, Bellman-Ford,
+    Dijkstra bidireccional o A* (con 'positions' como heurística). Con 'k' > 1 devuelve además
+    los k caminos simples más cortos en 'paths' (algoritmo de Yen, sin traza de pasos; requiere
+    algorithm='dijkstra'). Con ciclo
+    negativo la respuesta trae el ciclo en 'negative_cycle'; 'early_cycle_detection' detiene la
+    familia Bellman-Ford en cuanto el grafo de predecesores forma un ciclo.
+    También maneja la solicitud OPTIONS (preflight de CORS). Con ?profile=1 la respuesta incluye
+    un resumen de cProfile; las fases (parse, build, algorithm, serialize) van en Server-Timing.
+    """
+    if request.method == 'OPTIONS':
+        response = json_response({"message": "Preflight OK"})
+        response.headers.add("Access-Control-Allow-Origin", "*")
+        response.headers.add("Access-Control-Allow-Headers", "Content-Type,Authorization")
+        response.headers.add("Access-Control-Allow-Methods", "POST,OPTIONS")
+        return response
+
+    # --- Lógica POST ---
+    try:
+        data = request.get_json()
+        graph_format, is_directed = parse_graph_request(data)
+        start_node_index = int(data['start_node_index'])
+        end_node_index = int(data['end_node_index'])
+        algorithm = data.get('algorithm', 'bellman-ford') # Bellman-Ford por defecto
+        stream = parse_flag(data, 'stream', False)
+        include_steps = parse_flag(data, 'include_steps', True)
+        trace_format = data.get('trace_format', 'full')
+        keyframe_interval = int(data.get('keyframe_interval', DEFAULT_KEYFRAME_INTERVAL))
+        distance_format = data.get('distance_format', 'map')
+        k = int(data.get('k', 1))
+        early_cycle_detection = parse_flag(data, 'early_cycle_detection', False)
+    except Exception as e:
+        # Captura errores de parsing JSON o de claves faltantes
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+    lap('parse')
+
+    
+    # Lógica de construcción de grafo (registro, matriz densa, lista de aristas o CSR)
+    try:
+        graph, n, has_negative_weights = resolve_request_graph(data, graph_format, is_directed)
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+    except Exception as e:
+        return json_response({'error': f'Error construyendo el grafo: {str(e)}'}, 500)
+    lap('build')
+
+    
+    # Validar índices de nodos
+    if not (0 <= start_node_index < n and 0 <= end_node_index < n):
+        return json_response({'error': 'Índices de nodo inicial o final fuera de rango.'}, 400)
+
+    
+    if algorithm not in ALGORITHMS:
+        return json_response({'error': 'Algoritmo no válido'}, 400)
+    if trace_format not in ('full', 'delta', 'lazy') or keyframe_interval < 1:
+        return json_response({'error': "Formato de traza no válido: use 'full', 'delta' o 'lazy' con keyframe_interval >= 1."}, 400)
+    keyframe_interval = max(keyframe_interval, MIN_KEYFRAME_INTERVAL)
+    if distance_format not in ('map', 'list'):
+        return json_response({'error': "Formato de distancias no válido: use 'map' o 'list'."}, 400)
+    if not 1 <= k <= DEFAULT_MAX_K:
+        return json_response({'error': f"'k' debe estar entre 1 y {DEFAULT_MAX_K}."}, 400)
+
+    # Coordenadas de los nodos para la heurística de A* (opcionales)
+    positions = None
+    if ALGORITHMS[algorithm].uses_positions and data.get('positions') is not None:
+        try:
+            positions = parse_positions(data['positions'], n)
+        except GraphInputError as e:
+            return json_response({'error': str(e)}, e.status_code)
+
+    # k > 1: los k caminos más cortos (Yen sobre Dijkstra), sin traza de pasos
+    if k > 1:
+        if algorithm not in K_SHORTEST_ALGORITHMS:
+            return json_response({'error': f"'k' > 1 usa el algoritmo de Yen sobre Dijkstra: use algorithm 'dijkstra' (no '{algorithm}')."}, 400)
+        if has_negative_weights:
+            return json_response({'error': "'k' > 1 requiere pesos no negativos (el algoritmo de Yen usa Dijkstra)."}, 400)
+        paths = find_k_shortest_paths(graph, start_node_index, end_node_index, n, k)
+        lap('algorithm')
+        response_json = json_response(build_k_paths_response(algorithm, k, paths))
+        response_json.headers.add("Access-Control-Allow-Origin", "*")
+        lap('serialize')
+        return response_json
+
+    # Sin pasos: consulta punto a punto, o árbol de caminos mínimos cacheado para este origen
+    if not include_steps:
+        status, path_result, min_distance, cycle, hit = find_path_without_steps(
+            algorithm, graph, start_node_index, end_node_index, n, has_negative_weights, positions,
+            early_cycle_detection,
+        )
+        lap('algorithm')
+        response_json = json_response(build_path_response(algorithm, status, path_result, min_distance, cycle))
+        response_json.headers.add("Access-Control-Allow-Origin", "*")
+        response_json.headers.add("X-SPT-Cache", "hit" if hit else "miss")
+        lap('serialize')
+        return response_json
+
+    # Llamar al algoritmo con pasos
+    step_iterator = iter_algorithm_steps(
+        algorithm, graph, start_node_index, end_node_index, n, has_negative_weights, positions, early_cycle_detection
+    )
+
+    # Traza perezosa: solo el resultado, el trace_id y el número de pasos; las páginas se piden a /trace
+    if trace_format == 'lazy':
+        trace_id, stored = store_lazy_trace(
+            algorithm, graph, start_node_index, end_node_index, n, step_iterator, keyframe_interval, positions,
+            early_cycle_detection,
+        )
+        lap('algorithm')
+        response = dict(stored.summary)
+        response['steps'] = {
+            'algorithm': algorithm,
+            'format': 'lazy',
+            'trace_id': trace_id,
+            'step_count': stored.step_count,
+        }
+        response_json = json_response(response)
+        response_json.headers.add("Access-Control-Allow-Origin", "*")
+        lap('serialize')
+        return response_json
+
+    # Modo streaming: los pasos se envían como NDJSON en una respuesta chunked (algoritmo y
+    # serialización se intercalan después de retornar, así que no se miden por fases)
+    if stream:
+        records = iter_ndjson_records(algorithm, step_iterator, n, trace_format, keyframe_interval, distance_format)
+        response_stream = Response(records, mimetype='application/x-ndjson')
+        response_stream.headers.add("Access-Control-Allow-Origin", "*")
+        response_stream.headers.add("X-Accel-Buffering", "no")
+        return response_stream
+
+    status, path_result, min_distance, cycle, deltas = collect_deltas(step_iterator)
+    lap('algorithm')
+
+    # Estructurar la respuesta final (incluyendo el objeto steps)
+    response = build_path_response(algorithm, status, path_result, min_distance, cycle)
+    response['steps'] = build_step_trace(algorithm, deltas, n, trace_format, keyframe_interval, distance_format)
     
     # Asegurar que la respuesta JSON incluye la cabecera de CORS para el POST
-    response_json = jsonify(response)
+    response_json = json_response(response)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    lap('serialize')
+    return response_json
+
+@app.route('/trace/<trace_id>', methods=['GET'])
+def trace_page_route(trace_id):
+    """
+    Página de pasos completos de una traza guardada: ?offset=0&limit=50 (limit máximo 1000) y,
+    opcionalmente, distance_format=list.
+    """
+    stored = trace_store.get(trace_id)
+    if stored is None:
+        return json_response({'error': f'Traza no encontrada: {trace_id}'}, 404)
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', 50))
+    except ValueError:
+        return json_response({'error': 'offset y limit deben ser enteros.'}, 400)
+    if offset < 0 or not (1 <= limit <= 1000):
+        return json_response({'error': 'Se requiere offset >= 0 y 1 <= limit <= 1000.'}, 400)
+    distances_as_list = request.args.get('distance_format', 'map') == 'list'
+
+    response_json = json_response({
+        'trace_id': trace_id,
+        'algorithm': stored.algorithm,
+        'step_count': stored.step_count,
+        'offset': offset,
+        'steps': steps_from_delta_trace(stored.trace, offset, limit, distances_as_list),
+    })
     response_json.headers.add("Access-Control-Allow-Origin", "*")
     return response_json
 
+
+@app.route('/find_paths', methods=['POST'])
+@profiled
+def find_paths_route():
+    """
+    Consulta por lotes: un grafo (en línea o graph_id) y una lista 'pairs' de [origen, destino].
+    Cada origen distinto ejecuta el algoritmo una sola vez; los resultados siguen el orden de 'pairs'.
+    """
+    try:
+        data = request.get_json()
+        graph_format, is_directed = parse_graph_request(data)
+        pairs = [(int(source), int(target)) for source, target in data['pairs']]
+        algorithm = data.get('algorithm', 'bellman-ford')
+    except Exception as e:
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+
+    try:
+        graph, n, has_negative_weights = resolve_request_graph(data, graph_format, is_directed)
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+    except Exception as e:
+        return json_response({'error': f'Error construyendo el grafo: {str(e)}'}, 500)
+
+    if algorithm not in ALGORITHMS:
+        return json_response({'error': 'Algoritmo no válido'}, 400)
+    for source, target in pairs:
+        if not (0 <= source < n and 0 <= target < n):
+            return json_response({'error': f'Par ({source}, {target}) con índices de nodo fuera de rango.'}, 400)
+
+    results, computed = find_paths_batch(algorithm, graph, pairs, n, has_negative_weights)
+    response_json = json_response({
+        'algorithm': algorithm,
+        'results': results,
+        'distinct_sources': len({source for source, _ in pairs}),
+        'trees_computed': computed,
+    })
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/all_pairs', methods=['POST'])
+@profiled
+def all_pairs_route():
+    """
+    Caminos mínimos entre todos los pares de nodos de un grafo (en línea o graph_id).
+    'engine' puede ser 'auto' (por defecto), 'floyd-warshall' o 'johnson'. successors[i][j] es el
+    primer salto del camino i -> j, de modo que cualquier camino se reconstruye sin recalcular.
+    """
+    try:
+        data = request.get_json()
+        graph_format, is_directed = parse_graph_request(data)
+        engine = data.get('engine', 'auto')
+    except Exception as e:
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+
+    if engine not in ALL_PAIRS_ENGINES:
+        return json_response({'error': 'Motor no válido'}, 400)
+
+    try:
+        graph, n, _ = resolve_request_graph(data, graph_format, is_directed)
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+    except Exception as e:
+        return json_response({'error': f'Error construyendo el grafo: {str(e)}'}, 500)
+
+    response = build_all_pairs_response(compute_all_pairs(graph, engine))
+    response['num_nodes'] = n
+    response_json = json_response(response)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/graphs', methods=['POST'])
+def register_graph_route():
+    """
+    Registra un grafo (matriz, lista de aristas o CSR): lo valida y compila una sola vez y
+    devuelve su graph_id para consultarlo luego en /find_path sin reenviarlo.
+    """
+    try:
+        data = request.get_json()
+        graph_format = detect_graph_format(data)
+        if graph_format == 'graph_id':
+            raise KeyError("se requiere 'matrix', 'edges' o 'indptr'/'indices'/'weights'")
+        is_directed = data['is_directed']
+    except Exception as e:
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+
+    try:
+        graph, _, _ = build_graph_from_payload(data, graph_format, is_directed)
+        entry = register_graph(graph, is_directed)
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+    except Exception as e:
+        return json_response({'error': f'Error construyendo el grafo: {str(e)}'}, 500)
+
+    response_json = json_response(entry.describe(), 201)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/graphs/import', methods=['POST'])
+def import_graph_route():
+    """
+    Registra un grafo enviado en formato binario .ogcsr (cuerpo application/octet-stream).
+    Se valida la estructura CSR, pero los arreglos no se parsean ni se copian.
+    """
+    try:
+        entry = import_binary_graph(request.get_data())
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+
+    response_json = json_response(entry.describe(), 201)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/graphs/<graph_id>/export', methods=['GET'])
+def export_graph_route(graph_id):
+    """Exporta un grafo registrado: ?format=binary (por defecto), matrix o edges."""
+    entry = graph_registry.get(graph_id)
+    if entry is None:
+        return json_response({'error': f'Grafo no encontrado: {graph_id}'}, 404)
+
+    export_format = request.args.get('format', 'binary')
+    if export_format == 'binary':
+        response = Response(to_bytes(entry.graph, entry.is_directed), mimetype=BINARY_GRAPH_MIMETYPE)
+        response.headers['Content-Disposition'] = f'attachment; filename="{graph_id}{BINARY_GRAPH_EXTENSION}"'
+    elif export_format == 'matrix':
+        if entry.num_nodes > MATRIX_EXPORT_MAX_NODES:
+            return json_response({'error': f"Grafo demasiado grande para exportarlo como matriz (máximo {MATRIX_EXPORT_MAX_NODES} nodos); use 'binary' o 'edges'."}, 400)
+        response = json_response({'matrix': graph_to_matrix(entry.graph), 'is_directed': entry.is_directed})
+    elif export_format == 'edges':
+        response = json_response({
+            'edges': graph_to_edges(entry.graph),
+            'num_nodes': entry.num_nodes,
+            'is_directed': entry.is_directed,
+        })
+    else:
+        return json_response({'error': "Formato de exportación no válido: use 'binary', 'matrix' o 'edges'."}, 400)
+
+    response.headers.add("Access-Control-Allow-Origin", "*")
+    return response
+
+
+@app.route('/graphs/<graph_id>/edits', methods=['POST'])
+def edit_graph_route(graph_id):
+    """
+    Aplica ediciones de aristas (inserción, borrado o cambio de peso) a un grafo registrado.
+    El grafo editado se registra con su nuevo graph_id y los árboles de caminos mínimos cacheados
+    del grafo anterior se reparan de forma incremental en vez de recalcularse.
+    """
+    entry = graph_registry.get(graph_id)
+    if entry is None:
+        return json_response({'error': f'Grafo no encontrado: {graph_id}'}, 404)
+
+    try:
+        data = request.get_json()
+        raw_edits = data['edits']
+    except Exception as e:
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+
+    try:
+        edits = parse_edge_edits(raw_edits, entry.num_nodes, entry.is_directed)
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+
+    new_graph, changes = apply_edge_edits(entry.graph, edits)
+    try:
+        new_entry = register_graph(new_graph, entry.is_directed)
+    except GraphConflictError as e:
+        return json_response({'error': str(e)}, e.status_code)
+    trees_repaired = repair_cached_trees(entry.graph, new_graph, changes) if changes else 0
+
+    response_json = json_response({
+        **new_entry.describe(),
+        'previous_graph_id': graph_id,
+        'edges_changed': len(changes),
+        'trees_repaired': trees_repaired,
+    })
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/graphs/<graph_id>/index', methods=['POST', 'GET', 'DELETE'])
+def graph_index_route(graph_id):
+    """
+    Índice de landmarks (ALT) de un grafo registrado. POST lo construye (opcional 'landmarks',
+    por defecto DEFAULT_NUM_LANDMARKS) y, con GRAPH_STORE_DIR, lo guarda junto al grafo; luego
+    las consultas con algorithm='alt' lo usan como heurística. GET lo describe y DELETE lo descarta
+    (de memoria y del disco).
+    El índice está ligado al hash de contenido: un grafo editado necesita su propio índice.
+    """
+    entry = graph_registry.get(graph_id)
+    if entry is None:
+        return json_response({'error': f'Grafo no encontrado: {graph_id}'}, 404)
+
+    if request.method == 'GET':
+        index = landmark_index_for(entry.graph)
+        if index is None:
+            return json_response({'error': f'El grafo {graph_id} no tiene índice de landmarks.'}, 404)
+        return json_response(index.describe())
+
+    if request.method == 'DELETE':
+        if not discard_landmark_index(graph_id):
+            return json_response({'error': f'El grafo {graph_id} no tiene índice de landmarks.'}, 404)
+        return json_response({'deleted': graph_id})
+
+    try:
+        data = request.get_json(silent=True) or {}
+        num_landmarks = int(data.get('landmarks', DEFAULT_NUM_LANDMARKS))
+    except Exception as e:
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+    if not 1 <= num_landmarks <= MAX_LANDMARKS:
+        return json_response({'error': f"'landmarks' debe estar entre 1 y {MAX_LANDMARKS}."}, 400)
+    if entry.has_negative_weights:
+        return json_response({'error': 'Los índices de landmarks requieren pesos no negativos.'}, 400)
+
+    index = build_landmark_index(entry.graph, num_landmarks, dijkstra_tree)
+    landmark_indexes.put(index)
+    if GRAPH_STORE_DIR:
+        save_index(index, GRAPH_STORE_DIR)
+    response_json = json_response(index.describe(), 201)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/jobs', methods=['POST'])
+def submit_job_route():
+    """
+    Encola un /find_path asíncrono (mismo cuerpo, con trace_format 'full' o 'delta') y responde
+    202 con el job_id. Opcionales: 'time_limit' (segundos) y 'memory_limit' (bytes), acotados por
+    JOB_TIME_LIMIT y JOB_MEMORY_LIMIT. El grafo se valida antes de encolar.
+    """
+    try:
+        data = request.get_json()
+        graph_format, is_directed = parse_graph_request(data)
+        start_node_index = int(data['start_node_index'])
+        end_node_index = int(data['end_node_index'])
+        algorithm = data.get('algorithm', 'bellman-ford')
+        include_steps = parse_flag(data, 'include_steps', True)
+        trace_format = data.get('trace_format', 'full')
+        keyframe_interval = int(data.get('keyframe_interval', DEFAULT_KEYFRAME_INTERVAL))
+        distance_format = data.get('distance_format', 'map')
+        early_cycle_detection = parse_flag(data, 'early_cycle_detection', False)
+        time_limit = parse_job_limit(data.get('time_limit'), JOB_TIME_LIMIT, float)
+        memory_limit = parse_job_limit(data.get('memory_limit'), JOB_MEMORY_LIMIT, int)
+    except Exception as e:
+        return json_response({'error': f'Solicitud JSON inválida o incompleta: {str(e)}'}, 400)
+
+    try:
+        graph, n, has_negative_weights = resolve_request_graph(data, graph_format, is_directed)
+    except GraphInputError as e:
+        return json_response({'error': str(e)}, e.status_code)
+    except Exception as e:
+        return json_response({'error': f'Error construyendo el grafo: {str(e)}'}, 500)
+
+    if not (0 <= start_node_index < n and 0 <= end_node_index < n):
+        return json_response({'error': 'Índices de nodo inicial o final fuera de rango.'}, 400)
+    if algorithm not in ALGORITHMS:
+        return json_response({'error': 'Algoritmo no válido'}, 400)
+    if trace_format not in ('full', 'delta') or keyframe_interval < 1:
+        return json_response({'error': "Formato de traza no válido para un trabajo: use 'full' o 'delta' con keyframe_interval >= 1."}, 400)
+    keyframe_interval = max(keyframe_interval, MIN_KEYFRAME_INTERVAL)
+    if distance_format not in ('map', 'list'):
+        return json_response({'error': "Formato de distancias no válido: use 'map' o 'list'."}, 400)
+
+    positions = None
+    if ALGORITHMS[algorithm].uses_positions and data.get('positions') is not None:
+        try:
+            positions = parse_positions(data['positions'], n)
+        except GraphInputError as e:
+            return json_response({'error': str(e)}, e.status_code)
+
+    try:
+        job = job_queue.submit(
+            'find_path',
+            lambda job: run_find_path_job(
+                job, algorithm, graph, start_node_index, end_node_index, n, has_negative_weights,
+                positions, include_steps, trace_format, keyframe_interval, distance_format, early_cycle_detection,
+            ),
+            time_limit=time_limit,
+            memory_limit=memory_limit,
+        )
+    except JobQueueFull as e:
+        response_json = json_response({'error': str(e)}, 503)
+        response_json.headers['Retry-After'] = '1'
+        return response_json
+    response_json = json_response(job.describe(), 202)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    response_json.headers['Location'] = f'/jobs/{job.job_id}'
+    return response_json
+
+
+@app.route('/jobs/<job_id>', methods=['GET', 'DELETE'])
+def job_detail_route(job_id):
+    """Estado y progreso de un trabajo (GET) o solicitud de cancelación (DELETE)."""
+    job = job_queue.cancel(job_id) if request.method == 'DELETE' else job_queue.get(job_id)
+    if job is None:
+        return json_response({'error': f'Trabajo no encontrado: {job_id}'}, 404)
+    response_json = json_response(job.describe())
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/jobs/<job_id>/events', methods=['GET'])
+def job_events_route(job_id):
+    """Progreso del trabajo como NDJSON: una línea cada vez que cambia, hasta el estado final."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return json_response({'error': f'Trabajo no encontrado: {job_id}'}, 404)
+    records = (dumps(state) + b"\n" for state in job.iter_events(JOB_EVENTS_INTERVAL))
+    response_stream = Response(records, mimetype='application/x-ndjson')
+    response_stream.headers.add("Access-Control-Allow-Origin", "*")
+    response_stream.headers.add("X-Accel-Buffering", "no")
+    return response_stream
+
+
+@app.route('/jobs/<job_id>/result', methods=['GET'])
+def job_result_route(job_id):
+    """Resultado de un trabajo terminado (misma respuesta que /find_path); 409 si no terminó bien."""
+    job = job_queue.get(job_id)
+    if job is None:
+        return json_response({'error': f'Trabajo no encontrado: {job_id}'}, 404)
+    if job.status != JOB_DONE:
+        message = job.error or f"El trabajo no tiene resultado (estado: {job.status})."
+        return json_response({**job.describe(), 'error': message}, 409)
+    response_json = json_response(job.result)
+    response_json.headers.add("Access-Control-Allow-Origin", "*")
+    return response_json
+
+
+@app.route('/cache/stats', methods=['GET'])
+def cache_stats_route():
+    """Estado del registro de grafos y de la caché de árboles de caminos mínimos (aciertos/fallos)."""
+    return json_response({
+        'graph_registry': graph_registry.stats(),
+        'spt_cache': spt_cache.stats(),
+        'landmark_indexes': landmark_indexes.stats(),
+        'trace_store': trace_store.stats(),
+        'jobs': job_queue.stats(),
+    })
+
+
+@app.route('/metrics', methods=['GET'])
+def metrics_route():
+    """
+    Histogramas de latencia por ruta y por fase y totales de operaciones de los algoritmos
+    (relajaciones, push/pop de la cola de prioridad, pasos emitidos), en formato de Prometheus.
+    """
+    return Response(metrics_registry.prometheus_text(), content_type='text/plain; version=0.0.4; charset=utf-8')
+
+
+@app.route('/graphs/<graph_id>', methods=['GET', 'DELETE'])
+def graph_detail_route(graph_id):
+    """Consulta (GET) o elimina (DELETE) un grafo registrado."""
+    if request.method == 'DELETE':
+        if not graph_registry.remove(graph_id):
+            return json_response({'error': f'Grafo no encontrado: {graph_id}'}, 404)
+        spt_cache.invalidate_graph(graph_id)
+        discard_landmark_index(graph_id)
+        return json_response({'deleted': graph_id})
+
+    entry = graph_registry.get(graph_id)
+    if entry is None:
+        return json_response({'error': f'Grafo no encontrado: {graph_id}'}, 404)
+    return json_response(entry.describe())
+
+
 if __name__ == '__main__':
     app.run(debug=True, port=5000, host="0.0.0.0")
\ No newline at end of file
@@ -0,0 +1,152 @@
+# backend/parallel.py
+"""
+Ejecución en paralelo de cargas con muchos orígenes (consultas por lotes, etapa por origen de Johnson)
+y de otras tareas independientes sobre el mismo grafo (búsquedas de desvío de Yen).
+
+Cada origen es independiente, así que se reparten por bloques entre los procesos de un
+ProcessPoolExecutor. El grafo no se serializa por tarea: sus arreglos CSR se copian una vez a un
+bloque de memoria compartida (multiprocessing.shared_memory) y los procesos trabajadores construyen
+vistas de NumPy sobre él sin copiarlo. Solo viajan el descriptor del bloque, los orígenes y los
+árboles resultantes. El código que corre en los trabajadores está en parallel_worker.py.
+
+Repartir solo compensa con varias CPU disponibles: con una sola (o con pocos orígenes o poco
+trabajo) todo se ejecuta en serie en el hilo de la solicitud, porque el pool sería más lento.
+"""
+
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import get_context
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from instrumentation import count
+from parallel_worker import run_sources_in_worker, run_tasks_in_worker
+
+# Por debajo de este trabajo estimado (orígenes × aristas) no compensa el coste de repartir
+DEFAULT_MIN_PARALLEL_WORK = 2_000_000
+# Con menos orígenes (o tareas) el arranque de los bloques pesa más que lo que se reparte
+DEFAULT_MIN_PARALLEL_SOURCES = 4
+# Bloques por proceso: más de uno equilibra orígenes con árboles de tamaño muy distinto
+CHUNKS_PER_WORKER = 4
+
+
+class SharedGraph:
+    """
+    Copia los arreglos CSR de un grafo a memoria compartida. Se usa como gestor de contexto:
+    al salir se libera el bloque. descriptor es lo único que se envía a los trabajadores.
+    """
+
+    def __init__(self, graph):
+        arrays = (graph.indptr, graph.indices, graph.weights)
+        self._shm = SharedMemory(create=True, size=max(1, sum(a.nbytes for a in arrays)))
+        offset = 0
+        for array in arrays:
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=self._shm.buf, offset=offset)
+            view[:] = array
+            offset += array.nbytes
+        del view
+        self.descriptor = (self._shm.name, graph.num_nodes, graph.num_edges)
+
+    def close(self):
+        self._shm.close()
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def available_cpus():
+    """CPU que puede usar este proceso (respeta la afinidad, p. ej. en contenedores)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:  # pragma: no cover - sched_getaffinity no existe en macOS ni Windows
+        return os.cpu_count() or 1
+
+
+def _chunks(items, num_chunks):
+    size = max(1, -(-len(items) // num_chunks))
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def _gather(futures):
+    """Resultados de los bloques en orden; los contadores de cada trabajador se suman a la solicitud."""
+    results = []
+    for future in futures:
+        chunk_results, counters = future.result()
+        count(**counters)
+        results.extend(chunk_results)
+    return results
+
+
+class ParallelExecutor:
+    """
+    Reparte ejecuciones por origen entre procesos. El pool se crea al primer uso y se reutiliza;
+    las cargas pequeñas, con pocos orígenes, con max_workers <= 1 o con una sola CPU disponible se
+    ejecutan en el propio hilo de la solicitud. cpus sustituye a available_cpus() (pruebas y
+    benchmark). tree_function debe ser una función de nivel de módulo (se envía por referencia).
+    """
+
+    def __init__(self, max_workers=None, min_parallel_work=DEFAULT_MIN_PARALLEL_WORK,
+                 min_parallel_sources=DEFAULT_MIN_PARALLEL_SOURCES, cpus=None):
+        self.cpus = cpus or available_cpus()
+        self.max_workers = max_workers or self.cpus
+        self.min_parallel_work = min_parallel_work
+        self.min_parallel_sources = min_parallel_sources
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                # 'spawn' evita heredar hilos y locks del servidor en mitad de una solicitud
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, mp_context=get_context('spawn'))
+            return self._pool
+
+    def should_parallelize(self, graph, num_sources):
+        return (
+            min(self.max_workers, self.cpus) > 1
+            and num_sources >= max(2, self.min_parallel_sources)
+            and num_sources * max(graph.num_edges, graph.num_nodes) >= self.min_parallel_work
+        )
+
+    def run_sources(self, graph, sources, tree_function):
+        """Árboles de caminos mínimos para cada origen, en el mismo orden que sources."""
+        sources = list(sources)
+        if not self.should_parallelize(graph, len(sources)):
+            return [tree_function(graph, source, graph.num_nodes) for source in sources]
+
+        pool = self._get_pool()
+        with SharedGraph(graph) as shared:
+            futures = [
+                pool.submit(run_sources_in_worker, shared.descriptor, tree_function, chunk)
+                for chunk in _chunks(sources, self.max_workers * CHUNKS_PER_WORKER)
+            ]
+            return _gather(futures)
+
+    def run_tasks(self, graph, task_function, tasks, shared_args=()):
+        """
+        task_function(grafo, tarea, *shared_args) para cada tarea, en el mismo orden que tasks.
+        shared_args se envía una vez por bloque; task_function debe ser de nivel de módulo.
+        """
+        tasks = list(tasks)
+        if not self.should_parallelize(graph, len(tasks)):
+            return [task_function(graph, task, *shared_args) for task in tasks]
+
+        pool = self._get_pool()
+        with SharedGraph(graph) as shared:
+            futures = [
+                pool.submit(run_tasks_in_worker, shared.descriptor, task_function, chunk, shared_args)
+                for chunk in _chunks(tasks, self.max_workers * CHUNKS_PER_WORKER)
+            ]
+            return _gather(futures)
+
+    def shutdown(self):
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown()
+                self._pool = None
@@ -0,0 +1,49 @@
+# backend/parallel_worker.py
+"""
+Punto de entrada de los procesos trabajadores de parallel.py.
+
+Con 'spawn' cada proceso importa solo este módulo, graph_core y el módulo que define la función
+enviada (shortest_path_trees.py, k_shortest.py): nunca main, que crearía la aplicación Flask, la
+cola de trabajos y cargaría el almacén de grafos. Los contadores de instrumentation que acumulan
+los algoritmos en el trabajador se devuelven junto con los resultados para sumarlos a la solicitud.
+"""
+
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from graph_core import CSRGraph
+from instrumentation import finish_request, start_request
+
+
+def attach_shared_graph(descriptor):
+    """(SharedMemory, CSRGraph con vistas sin copia) a partir del descriptor de SharedGraph."""
+    name, num_nodes, num_edges = descriptor
+    shm = SharedMemory(name=name)
+    indptr = np.ndarray((num_nodes + 1,), dtype=np.int64, buffer=shm.buf)
+    indices = np.ndarray((num_edges,), dtype=np.int32, buffer=shm.buf, offset=indptr.nbytes)
+    weights = np.ndarray((num_edges,), dtype=np.int64, buffer=shm.buf, offset=indptr.nbytes + indices.nbytes)
+    return shm, CSRGraph(indptr, indices, weights)
+
+
+def run_on_shared_graph(descriptor, function, items):
+    """(resultados de function(grafo, item) para cada item, contadores acumulados en el proceso)."""
+    shm, graph = attach_shared_graph(descriptor)
+    metrics, token = start_request()
+    try:
+        return [function(graph, item) for item in items], metrics.counters
+    finally:
+        finish_request(token)
+        # Las vistas de NumPy deben desaparecer antes de cerrar el bloque
+        del graph
+        shm.close()
+
+
+def run_sources_in_worker(descriptor, tree_function, sources):
+    """Tarea del trabajador: un árbol de caminos mínimos por origen sobre el grafo compartido."""
+    return run_on_shared_graph(descriptor, lambda graph, source: tree_function(graph, source, graph.num_nodes), sources)
+
+
+def run_tasks_in_worker(descriptor, task_function, tasks, shared_args):
+    """Tarea del trabajador: task_function(grafo, tarea, *shared_args) para cada tarea del bloque."""
+    return run_on_shared_graph(descriptor, lambda graph, task: task_function(graph, task, *shared_args), tasks)
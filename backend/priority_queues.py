@@ -0,0 +1,204 @@
+# backend/priority_queues.py
+"""
+Colas de prioridad por nodo para Dijkstra, con una interfaz común:
+
+- push(node, key): inserta el nodo o, si ya está en la cola con una clave mayor, la disminuye
+  (decrease-key). Devuelve True si la cola cambió.
+- pop(): (clave, nodo) con la menor clave, o None si la cola está vacía.
+
+Implementaciones:
+
+- LazyBinaryHeap: heapq con borrado perezoso (la de dijkstra_tree): cada mejora añade una tupla y
+  las obsoletas se descartan al extraerlas; el montículo puede crecer hasta O(E).
+- IndexedBinaryHeap: montículo binario indexado por nodo con decrease-key real; nunca tiene más de
+  V entradas, a costa de mantener la posición de cada nodo.
+- DialBucketQueue: algoritmo de Dial para pesos enteros en [0, C]: C + 1 cubetas circulares
+  indexadas por distancia; push y pop en O(1) amortizado, más el avance del cursor (O(distancia máxima)).
+"""
+
+import heapq
+from array import array
+
+from graph_core import INF
+
+# Por encima de este peso máximo las cubetas de Dial dejan de compensar (memoria y barrido)
+DIAL_MAX_WEIGHT = 10_000
+
+_ABSENT = -1
+
+
+class LazyBinaryHeap:
+    """heapq con borrado perezoso: las entradas obsoletas se saltan en pop()."""
+
+    __slots__ = ('_heap', '_keys', '_done', 'pushes', 'pops', 'decrease_keys')
+
+    def __init__(self, num_nodes):
+        self._heap = []
+        self._keys = [INF] * num_nodes
+        self._done = bytearray(num_nodes)
+        self.pushes = self.pops = self.decrease_keys = 0
+
+    def push(self, node, key):
+        if key >= self._keys[node]:
+            return False
+        self._keys[node] = key
+        self._done[node] = 0
+        heapq.heappush(self._heap, (key, node))
+        self.pushes += 1
+        return True
+
+    def pop(self):
+        heap, keys, done = self._heap, self._keys, self._done
+        while heap:
+            key, node = heapq.heappop(heap)
+            self.pops += 1
+            if not done[node] and key == keys[node]:
+                done[node] = 1
+                keys[node] = INF
+                return key, node
+        return None
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class IndexedBinaryHeap:
+    """Montículo binario de nodos con decrease-key en O(log V); a lo sumo V entradas."""
+
+    __slots__ = ('_heap', '_keys', '_position', 'pushes', 'pops', 'decrease_keys')
+
+    def __init__(self, num_nodes):
+        self._heap = []
+        self._keys = [INF] * num_nodes
+        self._position = array('q', [_ABSENT]) * num_nodes
+        self.pushes = self.pops = self.decrease_keys = 0
+
+    def push(self, node, key):
+        position = self._position[node]
+        if position == _ABSENT:
+            self._keys[node] = key
+            self._position[node] = len(self._heap)
+            self._heap.append(node)
+            self.pushes += 1
+        elif key < self._keys[node]:
+            self._keys[node] = key
+            self.decrease_keys += 1
+        else:
+            return False
+        self._sift_up(self._position[node])
+        return True
+
+    def pop(self):
+        heap = self._heap
+        if not heap:
+            return None
+        root = heap[0]
+        last = heap.pop()
+        if heap:
+            heap[0] = last
+            self._position[last] = 0
+            self._sift_down(0)
+        self._position[root] = _ABSENT
+        self.pops += 1
+        key = self._keys[root]
+        self._keys[root] = INF
+        return key, root
+
+    # Desempate por número de nodo, igual que las tuplas (clave, nodo) de heapq
+    def _sift_up(self, index):
+        heap, keys, position = self._heap, self._keys, self._position
+        node = heap[index]
+        entry = (keys[node], node)
+        while index > 0:
+            parent_index = (index - 1) >> 1
+            parent = heap[parent_index]
+            if (keys[parent], parent) <= entry:
+                break
+            heap[index] = parent
+            position[parent] = index
+            index = parent_index
+        heap[index] = node
+        position[node] = index
+
+    def _sift_down(self, index):
+        heap, keys, position = self._heap, self._keys, self._position
+        size = len(heap)
+        node = heap[index]
+        entry = (keys[node], node)
+        while True:
+            child_index = 2 * index + 1
+            if child_index >= size:
+                break
+            child = heap[child_index]
+            right_index = child_index + 1
+            if right_index < size:
+                right = heap[right_index]
+                if (keys[right], right) < (keys[child], child):
+                    child_index, child = right_index, right
+            if entry <= (keys[child], child):
+                break
+            heap[index] = child
+            position[child] = index
+            index = child_index
+        heap[index] = node
+        position[node] = index
+
+    def __len__(self):
+        return len(self._heap)
+
+
+class DialBucketQueue:
+    """
+    Cola de cubetas de Dial para claves enteras monótonas: todas las claves pendientes están en
+    [mínimo, mínimo + max_weight], así que bastan max_weight + 1 cubetas circulares. Un nodo cuya
+    clave disminuye se mueve de cubeta (la entrada antigua queda obsoleta y se salta en pop()).
+    """
+
+    __slots__ = ('_buckets', '_keys', '_cursor', '_size', 'pushes', 'pops', 'decrease_keys')
+
+    def __init__(self, num_nodes, max_weight):
+        if max_weight < 0:
+            raise ValueError("El algoritmo de Dial requiere pesos no negativos.")
+        self._buckets = [[] for _ in range(int(max_weight) + 1)]
+        self._keys = [INF] * num_nodes
+        self._cursor = 0
+        self._size = 0
+        self.pushes = self.pops = self.decrease_keys = 0
+
+    def push(self, node, key):
+        if key >= self._keys[node]:
+            return False
+        if self._keys[node] == INF:
+            self._size += 1
+            self.pushes += 1
+        else:
+            self.decrease_keys += 1
+        self._keys[node] = key
+        self._buckets[int(key) % len(self._buckets)].append(node)
+        return True
+
+    def pop(self):
+        if self._size == 0:
+            return None
+        buckets, keys = self._buckets, self._keys
+        num_buckets = len(buckets)
+        while True:
+            bucket = buckets[self._cursor % num_buckets]
+            while bucket:
+                node = bucket.pop()
+                if keys[node] == self._cursor:
+                    keys[node] = INF
+                    self._size -= 1
+                    self.pops += 1
+                    return self._cursor, node
+            self._cursor += 1
+
+    def __len__(self):
+        return self._size
+
+
+def bucket_queue_for(num_nodes, max_weight):
+    """DialBucketQueue si el peso máximo lo permite; si no, IndexedBinaryHeap."""
+    if 0 <= max_weight <= DIAL_MAX_WEIGHT:
+        return DialBucketQueue(num_nodes, max_weight)
+    return IndexedBinaryHeap(num_nodes)
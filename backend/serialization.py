@@ -0,0 +1,114 @@
+# backend/serialization.py
+"""
+Serialización rápida de respuestas grandes (pasos, matrices de todos los pares).
+
+- dumps(): usa orjson si está instalado (opcional: `pip install orjson`), que es varias veces más
+  rápido que json y admite claves enteras; si no, json compacto y sin escapar "∞". Las dos ramas
+  producen los mismos bytes: claves enteras como texto, floats no finitos como null y escalares de
+  NumPy como números de Python (solo la notación de exponentes de floats enormes puede variar).
+- json_response(): Response JSON construida con dumps(); todas las rutas responden con ella.
+- compress_response(): comprime con brotli (opcional: `pip install brotli`) o gzip según
+  Accept-Encoding; se registra como after_request de la app.
+"""
+
+import gzip
+import json
+import math
+
+import numpy as np
+from flask import Response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depende del entorno
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depende del entorno
+    brotli = None
+
+# Por debajo de este tamaño la compresión no compensa
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 5
+BROTLI_QUALITY = 4
+
+_COMPRESSIBLE_MIMETYPES = frozenset(('application/json', 'application/x-ndjson'))
+
+
+def _default(value):
+    """Tipos que ni orjson ni json serializan por sí solos."""
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Tipo no serializable a JSON: {type(value).__name__}")
+
+
+def _without_non_finite(value):
+    """Copia con los floats infinitos o NaN como None (lo que hace orjson)."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _without_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_without_non_finite(item) for item in value]
+    return value
+
+
+def _json_dumps(payload):
+    return json.dumps(payload, ensure_ascii=False, separators=(',', ':'), allow_nan=False, default=_default)
+
+
+def dumps(payload):
+    """Serializa a bytes UTF-8 (las claves enteras de currentDistances se convierten a texto)."""
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_NON_STR_KEYS, default=_default)
+    try:
+        encoded = _json_dumps(payload)
+    except ValueError:
+        # allow_nan=False: solo se recorre el payload cuando de verdad trae Infinity o NaN
+        encoded = _json_dumps(_without_non_finite(payload))
+    return encoded.encode('utf-8')
+
+
+def json_response(payload, status=200):
+    return Response(dumps(payload), status=status, mimetype='application/json')
+
+
+def negotiate_encoding(accept_encoding):
+    """'br', 'gzip' o None según la cabecera Accept-Encoding y los compresores disponibles."""
+    accepted = set()
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        if params.strip().replace(' ', '') in ('q=0', 'q=0.0', 'q=0.00', 'q=0.000'):
+            continue
+        accepted.add(coding.strip().lower())
+    if brotli is not None and 'br' in accepted:
+        return 'br'
+    if 'gzip' in accepted or '*' in accepted:
+        return 'gzip'
+    return None
+
+
+def compress_response(response, accept_encoding):
+    """Comprime el cuerpo de una respuesta JSON no transmitida por partes si el cliente lo acepta."""
+    if (
+        response.is_streamed
+        or response.direct_passthrough
+        or response.mimetype not in _COMPRESSIBLE_MIMETYPES
+        or 'Content-Encoding' in response.headers
+        or not 200 <= response.status_code < 300
+    ):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = negotiate_encoding(accept_encoding)
+    body = response.get_data()
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return response
+
+    if encoding == 'br':
+        body = brotli.compress(body, quality=BROTLI_QUALITY)
+    else:
+        body = gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+    response.set_data(body)
+    response.headers['Content-Encoding'] = encoding
+    return response
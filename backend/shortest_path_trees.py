@@ -0,0 +1,325 @@
+# backend/shortest_path_trees.py
+"""
+Motores de árbol de caminos mínimos desde un origen: Bellman-Ford (escalar, con cola SPFA y
+vectorizado con NumPy) y Dijkstra (heapq, montículo indexado y cubetas de Dial). Devuelven un
+ShortestPathTree y acumulan sus contadores con instrumentation.count.
+
+No dependen de Flask ni del estado del servidor: los procesos de parallel_worker.py los importan
+sin cargar main (la aplicación, las colas de trabajos y el almacén de grafos).
+"""
+
+import heapq
+from array import array
+from collections import deque
+
+import numpy as np
+
+from graph_core import (
+    CSRGraph, INF, NO_PREDECESSOR, NegativeCycle, ShortestPathTree, adjacency_rows, find_predecessor_cycle,
+    new_distances, new_predecessors, predecessor_cycle,
+)
+from instrumentation import count
+from jobs import CHECKPOINT_POPS, checkpoint
+from priority_queues import IndexedBinaryHeap, bucket_queue_for
+
+
+def nodes_with_out_edges(graph):
+    """Nodos con aristas salientes: los únicos que pueden relajar algo en un pase de Bellman-Ford."""
+    if not isinstance(graph, CSRGraph):
+        return [u for u in range(len(graph)) if graph[u]]
+    return np.flatnonzero(np.diff(graph.indptr)).tolist()
+
+
+# =======================================================
+# CICLOS NEGATIVOS
+# =======================================================
+# Si tras |V| - 1 pases la arista u -> v todavía se puede relajar, al aplicar esa relajación el
+# grafo de predecesores contiene el ciclo negativo: se retroceden |V| pasos desde v (ya dentro del
+# ciclo) y se lee una vuelta, sin pases adicionales. Además, un ciclo en el grafo de predecesores
+# siempre tiene peso negativo, así que con early_cycle_detection se busca al final de cada pase
+# (O(V)) y el algoritmo se detiene en cuanto aparece, sin esperar al pase |V|.
+def negative_cycle_from_edge(graph, predecessors, u, v):
+    """NegativeCycle que deja relajable la arista u -> v tras los pases, o None si no se pudo leer."""
+    predecessors = list(predecessors)
+    predecessors[v] = u
+    cycle = predecessor_cycle(predecessors, v) or find_predecessor_cycle(predecessors)
+    return NegativeCycle.from_nodes(graph, cycle) if cycle is not None else None
+
+
+def negative_cycle_in_predecessors(graph, predecessors):
+    """NegativeCycle si el grafo de predecesores ya contiene un ciclo, o None."""
+    cycle = find_predecessor_cycle(predecessors)
+    return NegativeCycle.from_nodes(graph, cycle) if cycle is not None else None
+
+
+# =======================================================
+# BELLMAN-FORD Y SPFA
+# =======================================================
+def bellman_ford_tree(graph, start_node, num_nodes, early_cycle_detection=False):
+    """
+    Bellman-Ford completo desde start_node; si hay un ciclo negativo alcanzable el árbol queda
+    marcado y trae el ciclo en tree.cycle.
+    """
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    relaxations = 0
+    active_nodes = nodes_with_out_edges(graph)
+
+    for _ in range(num_nodes - 1):
+        checkpoint()
+        relaxed = False
+        for u in active_nodes:
+            for v, weight in rows[u]:
+                if distances[u] != INF and distances[u] + weight < distances[v]:
+                    distances[v] = distances[u] + weight
+                    predecessors[v] = u
+                    relaxed = True
+                    relaxations += 1
+        if not relaxed:
+            break
+        if early_cycle_detection:
+            cycle = negative_cycle_in_predecessors(graph, predecessors)
+            if cycle is not None:
+                count(relaxations=relaxations)
+                return ShortestPathTree(start_node, distances, predecessors, negative_cycle=True, cycle=cycle)
+    count(relaxations=relaxations)
+
+    for u in active_nodes:
+        for v, weight in rows[u]:
+            if distances[u] != INF and distances[u] + weight < distances[v]:
+                cycle = negative_cycle_from_edge(graph, predecessors, u, v)
+                return ShortestPathTree(start_node, distances, predecessors, negative_cycle=True, cycle=cycle)
+
+    return ShortestPathTree(start_node, distances, predecessors)
+
+
+def spfa_tree(graph, start_node, num_nodes, early_cycle_detection=False):
+    """
+    Bellman-Ford con cola de trabajo (SPFA): solo se relajan las aristas salientes de los nodos cuya
+    distancia cambió. Sin ciclos negativos un nodo entra en la cola a lo sumo |V| - 1 veces, así que
+    al alcanzar |V| entradas se marca el ciclo negativo. Con early_cycle_detection el grafo de
+    predecesores se revisa al terminar cada ronda (los nodos que estaban en la cola al empezarla).
+    """
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    enqueue_counts = array('l', [0]) * num_nodes
+    in_queue = bytearray(num_nodes)
+    queue = deque([start_node])
+    in_queue[start_node] = 1
+    enqueue_counts[start_node] = 1
+    relaxations = 0
+    remaining_in_round = 1
+
+    while queue:
+        u = queue.popleft()
+        in_queue[u] = 0
+        distance_u = distances[u]
+        for v, weight in rows[u]:
+            if distance_u + weight < distances[v]:
+                distances[v] = distance_u + weight
+                predecessors[v] = u
+                relaxations += 1
+                if not in_queue[v]:
+                    enqueue_counts[v] += 1
+                    if enqueue_counts[v] >= num_nodes:
+                        count(relaxations=relaxations)
+                        cycle = negative_cycle_from_edge(graph, predecessors, u, v)
+                        return ShortestPathTree(start_node, distances, predecessors, negative_cycle=True, cycle=cycle)
+                    in_queue[v] = 1
+                    queue.append(v)
+
+        remaining_in_round -= 1
+        if remaining_in_round == 0:
+            remaining_in_round = len(queue)
+            checkpoint()
+            if early_cycle_detection and queue:
+                cycle = negative_cycle_in_predecessors(graph, predecessors)
+                if cycle is not None:
+                    count(relaxations=relaxations)
+                    return ShortestPathTree(start_node, distances, predecessors, negative_cycle=True, cycle=cycle)
+
+    count(relaxations=relaxations)
+    return ShortestPathTree(start_node, distances, predecessors)
+
+
+# =======================================================
+# DIJKSTRA
+# =======================================================
+def dijkstra_tree(graph, start_node, num_nodes, end_node=None):
+    """
+    Dijkstra desde start_node: distancias a todos los nodos. Con end_node se detiene al fijarlo
+    (el árbol queda parcial y solo es válido para ese destino; no se guarda en caché).
+    """
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    priority_queue = [(0, start_node)]
+    pops = relaxations = 0
+
+    while priority_queue:
+        current_distance, u = heapq.heappop(priority_queue)
+        pops += 1
+        if pops % CHECKPOINT_POPS == 0:
+            checkpoint()
+        if current_distance > distances[u]:
+            continue
+        if u == end_node:
+            break
+        for v, weight in rows[u]:
+            distance = current_distance + weight
+            if distance < distances[v]:
+                distances[v] = distance
+                predecessors[v] = u
+                heapq.heappush(priority_queue, (distance, v))
+                relaxations += 1
+
+    # Cada relajación hace un push (más el del origen)
+    count(relaxations=relaxations, heap_pushes=relaxations + 1, heap_pops=pops)
+    return ShortestPathTree(start_node, distances, predecessors)
+
+
+# Variantes de Dijkstra con otra cola de prioridad (ver priority_queues.py): la cola nunca
+# guarda entradas obsoletas, así que en grafos densos no crece hasta O(E) como la de heapq.
+def dial_queue(graph, num_nodes):
+    """Cola de cubetas de Dial dimensionada por el peso máximo del grafo."""
+    max_weight = int(graph.weights.max()) if graph.num_edges else 0
+    return bucket_queue_for(num_nodes, max_weight)
+
+
+def dijkstra_tree_with_queue(graph, start_node, num_nodes, priority_queue, end_node=None):
+    """Dijkstra sobre una cola con decrease-key (push(nodo, clave) / pop() -> (clave, nodo) o None)."""
+    distances = new_distances(num_nodes, start_node)
+    predecessors = new_predecessors(num_nodes)
+    rows = adjacency_rows(graph)
+    priority_queue.push(start_node, 0)
+    relaxations = 0
+    next_checkpoint = CHECKPOINT_POPS
+
+    while True:
+        entry = priority_queue.pop()
+        if entry is None:
+            break
+        current_distance, u = entry
+        # pop() puede descartar varias entradas obsoletas: se compara con un umbral, no con un múltiplo
+        if priority_queue.pops >= next_checkpoint:
+            checkpoint()
+            next_checkpoint += CHECKPOINT_POPS
+        if u == end_node:
+            break
+        for v, weight in rows[u]:
+            distance = current_distance + weight
+            if distance < distances[v]:
+                distances[v] = distance
+                predecessors[v] = u
+                priority_queue.push(v, distance)
+                relaxations += 1
+
+    count(
+        relaxations=relaxations,
+        heap_pushes=priority_queue.pushes,
+        heap_pops=priority_queue.pops,
+        decrease_keys=priority_queue.decrease_keys,
+    )
+    return ShortestPathTree(start_node, distances, predecessors)
+
+
+def dijkstra_indexed_heap_tree(graph, start_node, num_nodes, end_node=None):
+    """Dijkstra con montículo binario indexado (decrease-key real)."""
+    return dijkstra_tree_with_queue(graph, start_node, num_nodes, IndexedBinaryHeap(num_nodes), end_node)
+
+
+def dijkstra_dial_tree(graph, start_node, num_nodes, end_node=None):
+    """Dijkstra con cubetas de Dial (pesos enteros); con pesos muy grandes usa el montículo indexado."""
+    return dijkstra_tree_with_queue(graph, start_node, num_nodes, dial_queue(graph, num_nodes), end_node)
+
+
+# =======================================================
+# BELLMAN-FORD VECTORIZADO (NumPy)
+# =======================================================
+def vectorized_edge_arrays(graph, num_nodes):
+    """Arreglos paralelos (origen, destino, peso float64) de todas las aristas del grafo."""
+    if not isinstance(graph, CSRGraph):
+        graph = CSRGraph.from_adjacency(graph, num_nodes)
+    return graph.edge_sources(), graph.indices, graph.weights.astype(np.float64)
+
+
+def vectorized_relaxation_pass(distances, predecessors, sources, targets, weights):
+    """
+    Relaja todas las aristas a la vez: gather de dist[origen] + peso y scatter-min sobre dist[destino].
+    Actualiza distances/predecessors en sitio y devuelve los nodos cuya distancia mejoró.
+    """
+    candidates = distances[sources] + weights
+    best = np.full(len(distances), INF)
+    np.minimum.at(best, targets, candidates)
+
+    improved = best < distances
+    if not improved.any():
+        return improved.nonzero()[0]
+    distances[improved] = best[improved]
+
+    # Entre las aristas que alcanzan el nuevo mínimo gana la de menor origen. No reproduce los empates
+    # del recorrido escalar, que usa dentro del mismo pase las distancias ya mejoradas: la distancia
+    # es la misma, pero entre caminos de igual costo puede elegir otro
+    winners = (improved[targets] & (candidates == distances[targets])).nonzero()[0][::-1]
+    predecessors[targets[winners]] = sources[winners]
+    return improved.nonzero()[0]
+
+
+def relaxable_edges(distances, sources, targets, weights):
+    """Índices de las aristas que todavía podrían relajarse (revisión del pase |V|)."""
+    return ((distances[sources] + weights) < distances[targets]).nonzero()[0]
+
+
+def vectorized_predecessor_cycle(graph, predecessors):
+    """
+    NegativeCycle si el grafo de predecesores contiene un ciclo, o None. Con saltos dobles
+    (p <- p[p], log2 |V| veces) cada nodo queda a >= |V| pasos hacia atrás: los que no llegan a
+    NO_PREDECESSOR están en un ciclo o desembocan en uno, sin recorrer los nodos en Python.
+    """
+    jumped = predecessors.copy()
+    reach = 1
+    while reach < len(jumped):
+        linked = jumped != NO_PREDECESSOR
+        jumped[linked] = jumped[jumped[linked]]
+        reach *= 2
+    on_cycle = np.flatnonzero(jumped != NO_PREDECESSOR)
+    if not len(on_cycle):
+        return None
+    return NegativeCycle.from_nodes(graph, predecessor_cycle(predecessors.tolist(), int(on_cycle[0])))
+
+
+def bellman_ford_vectorized_tree(graph, start_node, num_nodes, early_cycle_detection=False):
+    """
+    Árbol de caminos mínimos con Bellman-Ford vectorizado: mismas distancias y ciclos negativos que
+    bellman_ford_tree, aunque ante empates el predecesor (y por tanto el camino) puede ser otro.
+    """
+    sources, targets, weights = vectorized_edge_arrays(graph, num_nodes)
+    distances = np.full(num_nodes, INF)
+    distances[start_node] = 0
+    predecessors = np.full(num_nodes, NO_PREDECESSOR, dtype=np.int64)
+
+    negative_cycle, cycle = False, None
+    relaxations = 0
+    for _ in range(num_nodes - 1):
+        checkpoint()
+        updated = len(vectorized_relaxation_pass(distances, predecessors, sources, targets, weights))
+        if updated == 0:
+            break
+        relaxations += updated
+        if early_cycle_detection:
+            cycle = vectorized_predecessor_cycle(graph, predecessors)
+            if cycle is not None:
+                negative_cycle = True
+                break
+    else:
+        # Solo hace falta revisar el pase |V| si no hubo convergencia anticipada
+        relaxable = relaxable_edges(distances, sources, targets, weights)
+        negative_cycle = len(relaxable) > 0
+        if negative_cycle:
+            u, v = int(sources[relaxable[0]]), int(targets[relaxable[0]])
+            cycle = negative_cycle_from_edge(graph, predecessors.tolist(), u, v)
+
+    count(relaxations=relaxations)
+    return ShortestPathTree.from_numpy(start_node, distances, predecessors, negative_cycle, cycle)
@@ -0,0 +1,98 @@
+# backend/spt_cache.py
+"""
+Caché de árboles de caminos mínimos (ShortestPathTree) indexada por
+(hash de contenido del grafo, nodo origen, algoritmo).
+
+Un árbol contiene las distancias y predecesores de todos los nodos, así que cualquier
+consulta posterior con el mismo origen se responde reconstruyendo el camino en
+O(longitud del camino), sin volver a ejecutar el algoritmo.
+"""
+
+import threading
+from collections import OrderedDict
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+
+class ShortestPathTreeCache:
+    """LRU de árboles acotado por memoria, con contadores de aciertos y fallos; seguro entre hilos."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(graph, source, algorithm):
+        return (graph.content_hash(), source, algorithm)
+
+    def get(self, key):
+        """Árbol cacheado para key (contando acierto/fallo) o None."""
+        with self._lock:
+            tree = self._entries.get(key)
+            if tree is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+                self._entries.move_to_end(key)
+            return tree
+
+    def put(self, key, tree):
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._total_bytes -= previous.nbytes
+            self._entries[key] = tree
+            self._total_bytes += tree.nbytes
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+
+    def get_or_compute(self, graph, source, algorithm, compute):
+        """
+        Devuelve (árbol, acierto). En un fallo ejecuta compute() fuera del lock y guarda el resultado;
+        dos hilos con la misma clave pueden calcularlo a la vez, pero el resultado es idéntico.
+        """
+        key = self.key(graph, source, algorithm)
+        tree = self.get(key)
+        if tree is not None:
+            return tree, True
+        tree = compute()
+        self.put(key, tree)
+        return tree, False
+
+    def trees_for_graph(self, graph_hash):
+        """Lista [(origen, algoritmo, árbol)] de los árboles cacheados de un grafo (sin contar aciertos)."""
+        with self._lock:
+            return [(key[1], key[2], tree) for key, tree in self._entries.items() if key[0] == graph_hash]
+
+    def invalidate_graph(self, graph_hash):
+        """Elimina todos los árboles de un grafo (p. ej. cuando deja de existir)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == graph_hash]:
+                self._total_bytes -= self._entries.pop(key).nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+            self.hits = 0
+            self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'trees': len(self._entries),
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
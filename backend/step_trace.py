@@ -0,0 +1,184 @@
+# backend/step_trace.py
+"""
+Trazas de pasos codificadas como deltas.
+
+Los generadores de pasos de main.py emiten deltas compactos en lugar de instantáneas completas:
+
+    {
+        'description', 'activeNodeIndex', 'activeEdgeIndices', 'iteration', ...   # campos visibles
+        'distanceChanges': [[nodo, distancia]],      # distancia entera o "∞"
+        'predecessorChanges': [[nodo, predecesor]],
+        'settledNodes': [nodo, ...],                 # nodos recién fijados
+        'updatedNodeIndices': [...]  o  'updatedInPass': nodo   # este último acumula dentro del pase
+    }
+
+StepTraceState reconstruye a partir de ellos el AlgorithmStep completo (currentDistances,
+pathEdgesIndices, settledNodeIndices) solo cuando hace falta. Cualquier campo completo presente
+en el delta (p. ej. 'currentDistances') se respeta tal cual.
+"""
+
+DEFAULT_KEYFRAME_INTERVAL = 64
+# Cada instantánea copia el estado de todos los nodos: el servidor no acepta intervalos menores
+MIN_KEYFRAME_INTERVAL = 16
+
+# Campos del delta que describen cambios de estado y no se copian al paso completo
+_DELTA_KEYS = frozenset(('distanceChanges', 'predecessorChanges', 'settledNodes', 'updatedInPass'))
+
+
+class StepRun:
+    """Iterable sobre los deltas de un generador de pasos que guarda su valor de retorno en .result."""
+
+    def __init__(self, step_iterator):
+        self._step_iterator = step_iterator
+        self.result = None
+
+    def __iter__(self):
+        self.result = yield from self._step_iterator
+
+
+class StepTraceState:
+    """Estado acumulado de una traza: distancias, predecesores y nodos fijados."""
+
+    __slots__ = ('distances', 'predecessors', 'settled', '_settled_set', 'updated', 'iteration')
+
+    def __init__(self, num_nodes):
+        self.distances = ["∞"] * num_nodes
+        self.predecessors = [None] * num_nodes
+        self.settled = []
+        self._settled_set = set()
+        self.updated = []
+        self.iteration = None
+
+    @classmethod
+    def from_keyframe(cls, keyframe):
+        state = cls(0)
+        state.distances = list(keyframe['currentDistances'])
+        state.predecessors = list(keyframe['predecessors'])
+        state.settled = list(keyframe['settledNodeIndices'])
+        state._settled_set = set(state.settled)
+        state.updated = list(keyframe['updatedNodeIndices'])
+        state.iteration = keyframe['iteration']
+        return state
+
+    def apply(self, delta):
+        """Aplica un delta al estado en O(tamaño del delta)."""
+        for node, distance in delta.get('distanceChanges', ()):
+            self.distances[node] = distance
+        for node, predecessor in delta.get('predecessorChanges', ()):
+            self.predecessors[node] = predecessor
+        for node in delta.get('settledNodes', ()):
+            if node not in self._settled_set:
+                self._settled_set.add(node)
+                self.settled.append(node)
+
+        if 'updatedInPass' in delta:
+            # Bellman-Ford acumula los nodos actualizados durante todo el pase
+            if self.iteration != delta.get('iteration'):
+                self.updated = []
+            if delta['updatedInPass'] not in self.updated:
+                self.updated.append(delta['updatedInPass'])
+        else:
+            self.updated = list(delta.get('updatedNodeIndices', ()))
+        self.iteration = delta.get('iteration')
+
+    def path_edges(self):
+        return [[p, node] for node, p in enumerate(self.predecessors) if p is not None]
+
+    def full_step(self, delta, distances_as_list=False):
+        """
+        Paso completo (formato AlgorithmStep) correspondiente al estado tras aplicar delta.
+        Con distances_as_list=True, currentDistances es una lista indexada por nodo en vez de un
+        dict {nodo: distancia}: más barata de construir y de serializar.
+        """
+        step = {
+            'description': delta['description'],
+            'activeNodeIndex': delta.get('activeNodeIndex'),
+            'activeEdgeIndices': delta.get('activeEdgeIndices'),
+            'settledNodeIndices': list(self.settled),
+            'updatedNodeIndices': list(self.updated),
+            'pathEdgesIndices': self.path_edges(),
+            'currentDistances': list(self.distances) if distances_as_list else dict(enumerate(self.distances)),
+        }
+        for key, value in delta.items():
+            if key not in _DELTA_KEYS and key != 'updatedNodeIndices':
+                step[key] = value
+        return step
+
+    def keyframe(self, index):
+        """Instantánea completa del estado antes de aplicar el delta número index."""
+        return {
+            'index': index,
+            'currentDistances': list(self.distances),
+            'predecessors': list(self.predecessors),
+            'settledNodeIndices': list(self.settled),
+            'updatedNodeIndices': list(self.updated),
+            'iteration': self.iteration,
+        }
+
+
+def iter_full_steps(deltas, num_nodes, distances_as_list=False):
+    """Expande una secuencia de deltas a pasos completos (formato clásico de /find_path)."""
+    state = StepTraceState(num_nodes)
+    for delta in deltas:
+        state.apply(delta)
+        yield state.full_step(delta, distances_as_list)
+
+
+def iter_delta_records(deltas, num_nodes, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """
+    Recorre los deltas intercalando una instantánea ('keyframe', estado) cada keyframe_interval
+    pasos, empezando por la inicial; emite tuplas ('keyframe', dict) y ('delta', dict).
+    """
+    state = StepTraceState(num_nodes)
+    for index, delta in enumerate(deltas):
+        if index % keyframe_interval == 0:
+            yield 'keyframe', state.keyframe(index)
+        state.apply(delta)
+        yield 'delta', delta
+
+
+def build_delta_trace(deltas, num_nodes, keyframe_interval=DEFAULT_KEYFRAME_INTERVAL):
+    """Traza compacta: deltas por paso más instantáneas periódicas (la primera es la inicial)."""
+    trace = {
+        'format': 'delta',
+        'numNodes': num_nodes,
+        'keyframeInterval': keyframe_interval,
+        'keyframes': [],
+        'deltas': [],
+    }
+    for kind, record in iter_delta_records(deltas, num_nodes, keyframe_interval):
+        trace['keyframes' if kind == 'keyframe' else 'deltas'].append(record)
+    if not trace['keyframes']:
+        trace['keyframes'].append(StepTraceState(num_nodes).keyframe(0))
+    return trace
+
+
+def step_from_delta_trace(trace, index):
+    """Reconstruye el paso completo número index partiendo de la instantánea más cercana."""
+    keyframe = trace['keyframes'][index // trace['keyframeInterval']]
+    state = StepTraceState.from_keyframe(keyframe)
+    for delta in trace['deltas'][keyframe['index']:index]:
+        state.apply(delta)
+    delta = trace['deltas'][index]
+    state.apply(delta)
+    return state.full_step(delta)
+
+
+def steps_from_delta_trace(trace, offset, limit, distances_as_list=False):
+    """
+    Página de pasos completos [offset, offset + limit): se parte de la instantánea anterior a offset
+    y se aplican los deltas necesarios, en O(keyframeInterval + limit).
+    """
+    deltas = trace['deltas']
+    end = min(offset + limit, len(deltas))
+    if offset >= end:
+        return []
+    keyframe = trace['keyframes'][offset // trace['keyframeInterval']]
+    state = StepTraceState.from_keyframe(keyframe)
+    for delta in deltas[keyframe['index']:offset]:
+        state.apply(delta)
+    steps = []
+    for delta in deltas[offset:end]:
+        state.apply(delta)
+        steps.append(state.full_step(delta, distances_as_list))
+    return steps
@@ -0,0 +1,46 @@
+import random
+import sys
+
+import pytest
+
+from all_pairs import choose_engine, floyd_warshall, johnson
+from graph_core import CSRGraph, INF
+from main import bellman_ford_tree, bellman_ford_vectorized_tree, dijkstra_tree
+
+def random_graph(rng, num_nodes, num_edges, min_weight):
+    edges = [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(min_weight, 9)) for _ in range(num_edges)]
+    edges = [(u, v, w) for u, v, w in edges if u != v]
+    return CSRGraph.from_edges(num_nodes, [e[0] for e in edges], [e[1] for e in edges], [e[2] for e in edges])
+
+@pytest.mark.parametrize("min_weight", [0, -2])
+def test_engines_match_single_source_bellman_ford(min_weight):
+    """Ambos motores coinciden con Bellman-Ford desde cada origen y sus caminos tienen ese peso."""
+    rng = random.Random(7)
+    for _ in range(60):
+        n = rng.randint(1, 9)
+        graph = random_graph(rng, n, rng.randint(0, n * n), min_weight)
+        trees = [bellman_ford_tree(graph, s, n) for s in range(n)]
+        negative_cycle = any(tree.negative_cycle for tree in trees)
+        for result in (floyd_warshall(graph), johnson(graph, bellman_ford_vectorized_tree, dijkstra_tree)):
+            assert result.negative_cycle == negative_cycle
+            if negative_cycle:
+                continue
+            for s, tree in enumerate(trees):
+                for v in range(n):
+                    assert result.distances[s][v] == tree.distances[v]
+                    path = result.path(s, v)
+                    if tree.distances[v] == INF:
+                        assert path == []
+                    else:
+                        assert path[0] == s and path[-1] == v
+                        assert sum(graph[a][b] for a, b in zip(path, path[1:])) == tree.distances[v]
+
+def test_choose_engine_by_density():
+    dense = CSRGraph.from_edges(3, [0, 1], [1, 2], [1, 1])
+    assert choose_engine(dense) == 'floyd-warshall'
+    n = 2000
+    sparse = CSRGraph.from_edges(n, list(range(n - 1)), list(range(1, n)), [1] * (n - 1))
+    assert choose_engine(sparse) == 'johnson'
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
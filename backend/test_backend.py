@@ -86,6 +86,11 @@ def test_dijkstra_negative_weight_rejection(client):
     # Verificar que el estado se capturó en los pasos
     assert data['steps']['steps'][-1]['negativeCycleDetected'] == False # No es ciclo negativo
     assert "Peso Negativo Detectado" in data['steps']['steps'][-1]['description']
+    assert data['steps']['steps'][-1]['currentDistances'] == {'0': "∞", '1': "∞", '2': "∞"}
+
+    # En formato delta el paso es un delta más (sin campos completos)
+    delta = json.loads(client.post('/find_path', json={**payload, "trace_format": "delta"}).data)['steps']['deltas'][-1]
+    assert 'currentDistances' not in delta and 'settledNodeIndices' not in delta
 
 def test_dijkstra_disconnected(client):
     """
@@ -146,6 +151,92 @@ def test_bellman_ford_negative_cycle(client):
     assert data['distance'] == "N/A"
     # Verificar que se detectó el ciclo negativo en los pasos
     assert data['steps']['steps'][-1]['negativeCycleDetected'] == True
+    # El ciclo responsable se devuelve con sus nodos y su peso total
+    assert data['negative_cycle']['weight'] == -4
+    assert sorted(data['negative_cycle']['nodes']) == [0, 1]
+    assert data['negative_cycle']['path'] in ("A -> B -> A", "B -> A -> B")
+
+@pytest.mark.parametrize("algo", ["bellman-ford", "bellman-ford-vectorized", "spfa"])
+@pytest.mark.parametrize("include_steps", [True, False])
+@pytest.mark.parametrize("early_cycle_detection", [False, True])
+def test_negative_cycle_reported_in_response(client, algo, include_steps, early_cycle_detection):
+    """
+    Escenario: A -> B (2), B -> C (1), C -> D (1), D -> B (-4) y C -> E (1). El ciclo B, C, D
+    pesa -2 y afecta al camino A -> E: se informa en 'negative_cycle' en todos los modos.
+    """
+    matrix = [
+        ["", "2", "", "", ""],
+        ["", "", "1", "", ""],
+        ["", "", "", "1", "1"],
+        ["", "-4", "", "", ""],
+        ["", "", "", "", ""],
+    ]
+    payload = {**build_payload(matrix, 0, 4, algo), "include_steps": include_steps,
+               "early_cycle_detection": early_cycle_detection}
+    data = json.loads(client.post('/find_path', json=payload).data)
+
+    assert data['distance'] == "N/A"
+    assert sorted(data['negative_cycle']['nodes']) == [1, 2, 3]
+    assert data['negative_cycle']['weight'] == -2
+    if include_steps:
+        last_step = data['steps']['steps'][-1]
+        assert last_step['negativeCycleDetected'] is True
+        assert sorted(last_step['negativeCycleNodeIndices']) == [1, 2, 3]
+        assert "peso total -2" in last_step['description']
+
+        records = client.post('/find_path', json={**payload, "stream": True}).data.decode().splitlines()
+        summary = json.loads(records[-1])
+        assert summary['type'] == "summary" and summary['path_indices'] == []
+        assert summary['negative_cycle'] == data['negative_cycle']
+
+@pytest.mark.parametrize("algo", ["bellman-ford", "bellman-ford-vectorized", "spfa"])
+@pytest.mark.parametrize("include_steps", [True, False])
+def test_unrelated_negative_cycle_is_ignored(client, algo, include_steps):
+    """
+    Escenario: A -> B -> C es el camino pedido; el ciclo negativo D <-> E es alcanzable desde A
+    pero no llega a C, así que no afecta a la distancia.
+    """
+    matrix = [
+        ["", "2", "", "1", ""],
+        ["", "", "3", "", ""],
+        ["", "", "", "", ""],
+        ["", "", "", "", "-4"],
+        ["", "", "", "1", ""]
+    ]
+    payload = {**build_payload(matrix, 0, 2, algo), "include_steps": include_steps}
+    data = json.loads(client.post('/find_path', json=payload).data)
+    assert data['distance'] == 5
+    assert data['path_indices'] == [0, 1, 2]
+
+    payload['end_node_index'] = 4
+    assert json.loads(client.post('/find_path', json=payload).data)['distance'] == "N/A"
+
+@pytest.mark.parametrize("algo, weight", [("bellman-ford", "-1"), ("dijkstra-dial", "1")])
+def test_unreachable_target_answers_without_running_algorithm(client, algo, weight):
+    """Si el destino es inalcanzable se responde "No hay camino" con un único paso."""
+    matrix = [
+        ["", "1", ""],
+        ["1", "", ""],
+        ["", weight, ""]
+    ]
+    data = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 2, algo)).data)
+    assert data['distance'] == "No hay camino"
+    assert len(data['steps']['steps']) == 1
+    assert "no es alcanzable" in data['steps']['steps'][0]['description']
+
+def test_bellman_ford_vectorized_endpoint(client):
+    """El modo vectorizado devuelve la misma distancia y camino que Bellman-Ford escalar."""
+    matrix = [
+        ["", "10", ""],
+        ["", "", "-5"],
+        ["", "", ""]
+    ]
+    scalar = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 2, "bellman-ford")).data)
+    vectorized = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 2, "bellman-ford-vectorized")).data)
+
+    assert vectorized['distance'] == scalar['distance'] == 5
+    assert vectorized['path_indices'] == scalar['path_indices'] == [0, 1, 2]
+    assert vectorized['algorithm'] == "bellman-ford-vectorized"
 
 # --- PRUEBAS DE CASOS BORDE (EDGE CASES) ---
 
@@ -183,6 +274,912 @@ def test_undirected_graph(client):
     assert data['path_indices'] == [1, 0]
     assert data['path'] == "B -> A"
 
+# --- PRUEBAS DE FORMATOS DISPERSOS (LISTA DE ARISTAS / CSR) ---
+
+def test_edge_list_matches_matrix(client):
+    """
+    Escenario: el mismo grafo enviado como matriz y como lista de aristas
+    debe producir exactamente la misma respuesta.
+    """
+    matrix = [
+        ["", "10", "3"],
+        ["", "", "-5"],
+        ["", "", ""]
+    ]
+    edges = [[0, 1, 10], [0, 2, 3], [1, 2, -5]]
+    matrix_payload = build_payload(matrix, 0, 2, "bellman-ford")
+    edges_payload = {**matrix_payload, "edges": edges}
+    del edges_payload["matrix"]
+
+    matrix_data = json.loads(client.post('/find_path', json=matrix_payload).data)
+    edges_data = json.loads(client.post('/find_path', json=edges_payload).data)
+
+    assert edges_data == matrix_data
+    assert edges_data['distance'] == 3
+
+def test_csr_undirected_graph(client):
+    """
+    Escenario: grafo no dirigido A -- B (5) enviado en formato CSR. Se pide B->A.
+    """
+    payload = {
+        "indptr": [0, 1, 1],
+        "indices": [1],
+        "weights": [5],
+        "is_directed": False,
+        "start_node_index": 1,
+        "end_node_index": 0,
+        "algorithm": "dijkstra"
+    }
+    response = client.post('/find_path', json=payload)
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['distance'] == 5
+    assert data['path_indices'] == [1, 0]
+
+def test_edge_list_num_nodes_isolated_target(client):
+    """Con 'num_nodes' explícito, un nodo aislado es válido pero inalcanzable."""
+    payload = {
+        "edges": [[0, 1, 4]],
+        "num_nodes": 3,
+        "is_directed": True,
+        "start_node_index": 0,
+        "end_node_index": 2,
+        "algorithm": "dijkstra"
+    }
+    data = json.loads(client.post('/find_path', json=payload).data)
+    assert data['distance'] == "No hay camino"
+
+def test_invalid_edge_list(client):
+    """Aristas con pesos no enteros o nodos fuera de rango devuelven 400."""
+    base = {"is_directed": True, "start_node_index": 0, "end_node_index": 1, "algorithm": "dijkstra"}
+
+    response = client.post('/find_path', json={**base, "edges": [[0, 1, "diez"]]})
+    assert response.status_code == 400
+    assert "valores enteros" in json.loads(response.data)['error']
+
+    response = client.post('/find_path', json={**base, "edges": [[0, 5, 1]], "num_nodes": 2})
+    assert response.status_code == 400
+    assert "fuera de rango" in json.loads(response.data)['error']
+
+def test_edge_list_num_nodes_is_bounded(client):
+    """'num_nodes' negativo, cero o enorme responde 400 (sin error 500 ni reservar memoria)."""
+    from main import MAX_NUM_NODES
+    base = {"is_directed": True, "start_node_index": 0, "end_node_index": 0, "algorithm": "dijkstra", "edges": []}
+    for num_nodes in (-5, 0, MAX_NUM_NODES + 1, 10 ** 12):
+        response = client.post('/find_path', json={**base, "num_nodes": num_nodes})
+        assert response.status_code == 400
+        assert "'num_nodes'" in json.loads(response.data)['error']
+    assert client.post('/graphs', json={**base, "num_nodes": -1}).status_code == 400
+
+# --- PRUEBAS DE STREAMING (NDJSON) ---
+
+def test_stream_ndjson_matches_full_response(client):
+    """
+    Con stream=True cada paso llega en su propia línea y la última línea es el resumen,
+    con el mismo contenido que la respuesta JSON completa.
+    """
+    matrix = [
+        ["", "10", ""],
+        ["", "", "-5"],
+        ["", "", ""]
+    ]
+    payload = build_payload(matrix, 0, 2, "bellman-ford")
+    full = json.loads(client.post('/find_path', json=payload).data)
+
+    response = client.post('/find_path', json={**payload, "stream": True})
+    assert response.status_code == 200
+    assert response.is_streamed
+    assert response.mimetype == "application/x-ndjson"
+
+    records = [json.loads(line) for line in response.data.decode().splitlines()]
+    steps, summary = records[:-1], records[-1]
+
+    assert all(r['type'] == "step" for r in steps)
+    assert [r['index'] for r in steps] == list(range(len(steps)))
+    assert json.loads(json.dumps([r['step'] for r in steps])) == full['steps']['steps']
+    assert summary['type'] == "summary"
+    assert summary['status'] == "OK"
+    assert summary['step_count'] == len(steps)
+    assert (summary['distance'], summary['path'], summary['path_indices']) == (5, "A -> B -> C", [0, 1, 2])
+
+def test_stream_dijkstra_negative_weight(client):
+    """El rechazo de pesos negativos en Dijkstra también se emite como paso + resumen."""
+    matrix = [
+        ["", "-1"],
+        ["", ""]
+    ]
+    response = client.post('/find_path', json={**build_payload(matrix, 0, 1, "dijkstra"), "stream": True})
+    records = [json.loads(line) for line in response.data.decode().splitlines()]
+
+    assert len(records) == 2
+    assert "Peso Negativo Detectado" in records[0]['step']['description']
+    assert records[1]['status'] == "Peso Negativo Detectado"
+    assert records[1]['distance'] == "N/A"
+
+def test_dijkstra_negative_weight_all_response_modes(client):
+    """Dijkstra con peso negativo responde 200 con y sin pasos y en streaming."""
+    payload = build_payload([["", "10", ""], ["", "", "-5"], ["", "", ""]], 0, 2, "dijkstra")
+    for extra in ({}, {"include_steps": False}, {"trace_format": "delta"}):
+        response = client.post('/find_path', json={**payload, **extra})
+        assert response.status_code == 200
+        assert json.loads(response.data)['distance'] == "N/A"
+
+    records = [json.loads(line) for line in client.post('/find_path', json={**payload, "stream": True}).data.decode().splitlines()]
+    assert records[-1]['status'] == "Peso Negativo Detectado"
+
+# --- PRUEBAS DE TRAZA COMPACTA (DELTAS) ---
+
+def test_delta_trace_rebuilds_full_steps(client):
+    """
+    Con trace_format='delta' la respuesta trae instantáneas periódicas y deltas por paso;
+    reconstruir cualquier paso debe dar exactamente el paso completo del formato clásico.
+    """
+    from step_trace import MIN_KEYFRAME_INTERVAL, step_from_delta_trace
+
+    matrix = [
+        ["", "4", "1", ""],
+        ["", "", "", "1"],
+        ["", "2", "", "5"],
+        ["", "", "", ""]
+    ]
+    payload = build_payload(matrix, 0, 3, "dijkstra")
+    full = json.loads(client.post('/find_path', json=payload).data)
+    delta = json.loads(client.post('/find_path', json={**payload, "trace_format": "delta", "keyframe_interval": 3}).data)
+
+    trace = delta['steps']
+    full_steps = full['steps']['steps']
+    assert trace['format'] == "delta"
+    assert len(trace['deltas']) == len(full_steps)
+    assert trace['keyframeInterval'] == MIN_KEYFRAME_INTERVAL  # el servidor sube el intervalo pedido
+    assert [k['index'] for k in trace['keyframes']] == list(range(0, len(full_steps), MIN_KEYFRAME_INTERVAL))
+    assert "currentDistances" not in trace['deltas'][1]
+    for i, step in enumerate(full_steps):
+        assert json.loads(json.dumps(step_from_delta_trace(trace, i))) == step
+    assert delta['distance'] == full['distance'] == 4
+
+def test_delta_trace_stream(client):
+    """En streaming, el formato delta intercala líneas keyframe y delta antes del resumen."""
+    from step_trace import MIN_KEYFRAME_INTERVAL
+    matrix = [
+        ["", "1", ""],
+        ["", "", "1"],
+        ["", "", ""]
+    ]
+    payload = {**build_payload(matrix, 0, 2, "bellman-ford"), "stream": True, "trace_format": "delta", "keyframe_interval": 2}
+    records = [json.loads(line) for line in client.post('/find_path', json=payload).data.decode().splitlines()]
+    kinds = [r['type'] for r in records]
+
+    assert kinds[0] == "keyframe" and kinds[-1] == "summary"
+    assert kinds.count("delta") == records[-1]['step_count']
+    assert kinds.count("keyframe") == -(-records[-1]['step_count'] // MIN_KEYFRAME_INTERVAL)
+    assert records[-1]['format'] == "delta"
+
+def test_invalid_trace_format(client):
+    payload = {**build_payload([["0"]], 0, 0, "dijkstra"), "trace_format": "zip"}
+    response = client.post('/find_path', json=payload)
+    assert response.status_code == 400
+    assert "Formato de traza no válido" in json.loads(response.data)['error']
+
+# --- PRUEBAS DE TRAZAS PEREZOSAS (/trace/<trace_id>) ---
+
+def test_lazy_trace_pages_match_full_steps(client):
+    """
+    Escenario: con trace_format='lazy' la respuesta solo trae trace_id y step_count; las páginas
+    de /trace reproducen exactamente los pasos del formato completo.
+    """
+    matrix = [
+        ["", "4", "5", ""],
+        ["", "", "", "3"],
+        ["", "-3", "", "4"],
+        ["", "", "", ""],
+    ]
+    full = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 3, "bellman-ford")).data)
+    lazy = json.loads(client.post('/find_path', json={
+        **build_payload(matrix, 0, 3, "bellman-ford"), "trace_format": "lazy", "keyframe_interval": 2
+    }).data)
+
+    assert {k: v for k, v in lazy.items() if k != "steps"} == {k: v for k, v in full.items() if k != "steps"}
+    assert lazy['steps']['format'] == "lazy"
+    step_count = lazy['steps']['step_count']
+    assert step_count == len(full['steps']['steps'])
+
+    trace_id = lazy['steps']['trace_id']
+    pages = []
+    for offset in range(0, step_count, 3):
+        page = json.loads(client.get(f'/trace/{trace_id}?offset={offset}&limit=3').data)
+        assert page['step_count'] == step_count and page['offset'] == offset
+        pages.extend(page['steps'])
+    assert json.loads(json.dumps(pages)) == json.loads(json.dumps(full['steps']['steps']))
+
+    again = json.loads(client.post('/find_path', json={
+        **build_payload(matrix, 0, 3, "bellman-ford"), "trace_format": "lazy", "keyframe_interval": 2
+    }).data)
+    assert again['steps']['trace_id'] == trace_id
+
+def test_lazy_trace_errors(client):
+    assert client.get('/trace/no-existe').status_code == 404
+    lazy = json.loads(client.post('/find_path', json={**build_payload([["", "1"], ["", ""]], 0, 1, "dijkstra"), "trace_format": "lazy"}).data)
+    trace_id = lazy['steps']['trace_id']
+    assert client.get(f'/trace/{trace_id}?limit=0').status_code == 400
+    assert client.get(f'/trace/{trace_id}?offset=x').status_code == 400
+    assert json.loads(client.get(f'/trace/{trace_id}?offset=99').data)['steps'] == []
+
+def test_trace_store_bounded_by_bytes(client, monkeypatch):
+    """
+    Escenario: el almacén de trazas descarta las más antiguas al superar su memoria estimada, y un
+    keyframe_interval de 1 no hace guardar una instantánea O(V) por paso.
+    """
+    import main
+    from step_trace import MIN_KEYFRAME_INTERVAL
+    from trace_store import TraceStore
+
+    store = TraceStore(max_bytes=1)
+    monkeypatch.setattr(main, 'trace_store', store)
+    matrix = [["", "1", ""], ["", "", "1"], ["", "", ""]]
+    ids = []
+    for algorithm in ("dijkstra", "bellman-ford"):
+        lazy = json.loads(client.post('/find_path', json={
+            **build_payload(matrix, 0, 2, algorithm), "trace_format": "lazy", "keyframe_interval": 1
+        }).data)
+        ids.append(lazy['steps']['trace_id'])
+
+    assert len(store) == 1 and store.get(ids[1]) is not None
+    assert store.stats()['total_bytes'] == store.get(ids[1]).nbytes
+    assert store.get(ids[1]).trace['keyframeInterval'] == MIN_KEYFRAME_INTERVAL
+    assert client.get(f'/trace/{ids[0]}').status_code == 404
+
+# --- PRUEBAS DE SERIALIZACIÓN Y COMPRESIÓN ---
+
+def test_distance_list_format_and_gzip(client):
+    """
+    Escenario: distance_format='list' codifica currentDistances como lista y, con
+    Accept-Encoding: gzip, la respuesta llega comprimida con el mismo contenido.
+    """
+    import gzip
+    matrix = [["" if j != i + 1 else "1" for j in range(30)] for i in range(30)]
+    plain = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 29, "bellman-ford")).data)
+    response = client.post(
+        '/find_path',
+        json={**build_payload(matrix, 0, 29, "bellman-ford"), "distance_format": "list"},
+        headers={"Accept-Encoding": "gzip"},
+    )
+
+    assert response.headers['Content-Encoding'] == "gzip"
+    assert "Accept-Encoding" in response.headers['Vary']
+    data = json.loads(gzip.decompress(response.data))
+    for as_list, as_map in zip(data['steps']['steps'], plain['steps']['steps']):
+        assert as_list['currentDistances'] == [as_map['currentDistances'][str(i)] for i in range(30)]
+
+def test_all_routes_use_the_same_json_encoding(client):
+    """Respuestas normales y de error salen de json_response: compactas y sin escapar los acentos."""
+    from serialization import dumps
+    payload = build_payload([["", ""], ["", ""]], 0, 1, "dijkstra")
+    response = client.post('/find_path', json={**payload, "include_steps": False})
+    assert response.data == dumps(json.loads(response.data))
+
+    error = client.post('/find_path', json={**payload, "end_node_index": 5})
+    assert error.status_code == 400 and error.mimetype == "application/json"
+    assert error.data == dumps(json.loads(error.data))
+    assert "Índices".encode('utf-8') in error.data
+
+def test_boolean_flags_must_be_json_booleans(client):
+    """La cadena "false" no activa el streaming: los flags que no son true/false responden 400."""
+    payload = build_payload([["", "1"], ["", ""]], 0, 1, "dijkstra")
+    for flag in ("stream", "include_steps", "early_cycle_detection"):
+        response = client.post('/find_path', json={**payload, flag: "false"})
+        assert response.status_code == 400
+        assert f"'{flag}'" in json.loads(response.data)['error']
+    assert client.post('/find_path', json={**payload, "stream": False}).mimetype == "application/json"
+
+def test_invalid_distance_format(client):
+    response = client.post('/find_path', json={**build_payload([["0"]], 0, 0, "dijkstra"), "distance_format": "csv"})
+    assert response.status_code == 400
+
+# --- PRUEBAS DEL REGISTRO DE GRAFOS (/graphs) ---
+
+def test_register_graph_and_query_by_id(client):
+    """
+    Escenario: se registra el grafo una vez y se consulta por graph_id; el resultado
+    es el mismo que enviando la matriz completa.
+    """
+    matrix = [
+        ["", "10", ""],
+        ["", "", "5"],
+        ["", "", ""]
+    ]
+    response = client.post('/graphs', json={"matrix": matrix, "is_directed": True})
+    assert response.status_code == 201
+    info = json.loads(response.data)
+    assert info['num_nodes'] == 3 and info['num_edges'] == 2
+
+    by_id = json.loads(client.post('/find_path', json={
+        "graph_id": info['graph_id'], "start_node_index": 0, "end_node_index": 2, "algorithm": "dijkstra"
+    }).data)
+    inline = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 2, "dijkstra")).data)
+    assert by_id == inline
+
+    assert json.loads(client.get(f"/graphs/{info['graph_id']}").data) == info
+
+def test_register_graph_id_is_content_hash(client):
+    """El mismo grafo como matriz o como lista de aristas recibe el mismo graph_id."""
+    from_matrix = json.loads(client.post('/graphs', json={"matrix": [["", "3"], ["", ""]], "is_directed": False}).data)
+    from_edges = json.loads(client.post('/graphs', json={"edges": [[1, 0, 3]], "is_directed": False}).data)
+    directed = json.loads(client.post('/graphs', json={"edges": [[1, 0, 3]], "is_directed": True}).data)
+
+    assert from_matrix['graph_id'] == from_edges['graph_id']
+    assert directed['graph_id'] != from_edges['graph_id']
+
+def test_register_graph_with_other_direction_conflicts(client):
+    """El mismo contenido ya registrado con otro is_directed responde 409 hasta que se elimina."""
+    matrix = [["", "7"], ["7", ""]]
+    undirected = json.loads(client.post('/graphs', json={"matrix": matrix, "is_directed": False}).data)
+
+    conflict = client.post('/graphs', json={"matrix": matrix, "is_directed": True})
+    assert conflict.status_code == 409
+    assert "no dirigido" in json.loads(conflict.data)['error']
+
+    assert client.delete(f"/graphs/{undirected['graph_id']}").status_code == 200
+    directed = client.post('/graphs', json={"matrix": matrix, "is_directed": True})
+    assert directed.status_code == 201
+    assert json.loads(directed.data)['is_directed'] is True
+    client.delete(f"/graphs/{undirected['graph_id']}")
+
+def test_unknown_graph_id(client):
+    response = client.post('/find_path', json={
+        "graph_id": "no-existe", "start_node_index": 0, "end_node_index": 0, "algorithm": "dijkstra"
+    })
+    assert response.status_code == 404
+    assert "Grafo no encontrado" in json.loads(response.data)['error']
+    assert client.delete('/graphs/no-existe').status_code == 404
+
+# --- PRUEBAS DE LA CACHÉ DE ÁRBOLES DE CAMINOS MÍNIMOS ---
+
+def test_without_steps_reuses_shortest_path_tree(client):
+    """
+    Escenario: con include_steps=False, la primera consulta desde A calcula el árbol completo
+    y las siguientes consultas desde A (a otros destinos) se responden desde la caché.
+    """
+    from main import spt_cache
+    spt_cache.clear()
+
+    matrix = [
+        ["", "4", "1", ""],
+        ["", "", "", "1"],
+        ["", "2", "", "5"],
+        ["", "", "", ""]
+    ]
+    first = client.post('/find_path', json={**build_payload(matrix, 0, 3, "dijkstra"), "include_steps": False})
+    second = client.post('/find_path', json={**build_payload(matrix, 0, 1, "dijkstra"), "include_steps": False})
+
+    assert first.headers['X-SPT-Cache'] == "miss"
+    assert second.headers['X-SPT-Cache'] == "hit"
+    data = json.loads(second.data)
+    assert (data['distance'], data['path_indices']) == (3, [0, 2, 1])
+    assert "steps" not in data
+
+    with_steps = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 3, "dijkstra")).data)
+    without_steps = json.loads(first.data)
+    assert without_steps == {k: v for k, v in with_steps.items() if k != "steps"}
+
+    stats = json.loads(client.get('/cache/stats').data)['spt_cache']
+    assert (stats['hits'], stats['misses'], stats['trees']) == (1, 1, 1)
+
+@pytest.mark.parametrize("algo", ["bellman-ford", "bellman-ford-vectorized", "spfa"])
+def test_negative_weights_reuse_full_graph_tree(client, algo):
+    """Con pesos negativos, consultas a distintos destinos desde el mismo origen comparten el árbol."""
+    matrix = [
+        ["", "4", "2", ""],
+        ["", "", "", "1"],
+        ["", "-1", "", "5"],
+        ["", "", "", ""]
+    ]
+    first = client.post('/find_path', json={**build_payload(matrix, 0, 3, algo), "include_steps": False})
+    second = client.post('/find_path', json={**build_payload(matrix, 0, 1, algo), "include_steps": False})
+
+    assert first.headers['X-SPT-Cache'] == "miss"
+    assert second.headers['X-SPT-Cache'] == "hit"
+    assert (json.loads(first.data)['distance'], json.loads(second.data)['path_indices']) == (2, [0, 2, 1])
+
+@pytest.mark.parametrize("algo", ["bellman-ford", "bellman-ford-vectorized", "spfa"])
+@pytest.mark.parametrize("cycle_through_start", [True, False])
+def test_same_start_and_end_agree_with_and_without_steps(client, algo, cycle_through_start):
+    """
+    Escenario: A -> B (1) y el ciclo negativo B <-> C (-3). Si además C -> A, el ciclo pasa por A y
+    la distancia A -> A es indefinida; si no, el ciclo no vuelve a A y la respuesta es 0. Ambos
+    modos deben coincidir.
+    """
+    matrix = [
+        ["", "1", ""],
+        ["", "", "-3"],
+        ["1" if cycle_through_start else "", "1", ""]
+    ]
+    with_steps = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 0, algo)).data)
+    without_steps = json.loads(client.post('/find_path', json={**build_payload(matrix, 0, 0, algo), "include_steps": False}).data)
+
+    assert without_steps == {k: v for k, v in with_steps.items() if k != "steps"}
+    if cycle_through_start:
+        assert without_steps['distance'] == "N/A"
+    else:
+        assert (without_steps['distance'], without_steps['path_indices']) == (0, [0])
+
+def test_without_steps_negative_cycle_and_negative_weight(client):
+    matrix = [
+        ["", "1"],
+        ["-5", ""]
+    ]
+    cycle = json.loads(client.post('/find_path', json={**build_payload(matrix, 0, 1, "bellman-ford"), "include_steps": False}).data)
+    rejected = json.loads(client.post('/find_path', json={**build_payload(matrix, 0, 1, "dijkstra"), "include_steps": False}).data)
+
+    assert cycle['path'] == "Ciclo Negativo Detectado. La ruta más corta es indefinida."
+    assert rejected['path'] == "Dijkstra no es compatible con pesos negativos. Use Bellman-Ford."
+
+# --- PRUEBAS DEL FORMATO BINARIO (/graphs/import, /graphs/<graph_id>/export) ---
+
+def test_binary_export_import_round_trip(client):
+    """
+    Escenario: un grafo registrado como matriz se exporta en binario, se vuelve a importar
+    (mismo graph_id) y se exporta de nuevo como matriz.
+    """
+    matrix = [
+        ["", "4", "-1"],
+        ["", "", "3"],
+        ["2", "", ""]
+    ]
+    info = json.loads(client.post('/graphs', json={"matrix": matrix, "is_directed": True}).data)
+
+    exported = client.get(f"/graphs/{info['graph_id']}/export")
+    assert exported.status_code == 200
+    assert exported.mimetype == "application/octet-stream"
+
+    imported = client.post('/graphs/import', data=exported.data, content_type="application/octet-stream")
+    assert imported.status_code == 201
+    assert json.loads(imported.data) == info
+
+    as_matrix = json.loads(client.get(f"/graphs/{info['graph_id']}/export?format=matrix").data)
+    assert as_matrix == {"matrix": matrix, "is_directed": True}
+    as_edges = json.loads(client.get(f"/graphs/{info['graph_id']}/export?format=edges").data)
+    assert as_edges['edges'] == [[0, 1, 4], [0, 2, -1], [1, 2, 3], [2, 0, 2]]
+
+def test_binary_import_into_graph_store(client, tmp_path, monkeypatch):
+    """Con GRAPH_STORE_DIR el grafo importado se guarda en disco y se registra mapeado en memoria."""
+    import main
+    from graph_binary import to_bytes
+    from graph_core import CSRGraph
+    monkeypatch.setattr(main, 'GRAPH_STORE_DIR', str(tmp_path))
+
+    graph = CSRGraph.from_edges(3, [0, 1], [1, 2], [5, 6])
+    info = json.loads(client.post('/graphs/import', data=to_bytes(graph, True), content_type="application/octet-stream").data)
+
+    assert (tmp_path / f"{info['graph_id']}.ogcsr").exists()
+    main.graph_registry.remove(info['graph_id'])
+    assert main.preload_graph_store(str(tmp_path)) == 1
+    assert main.graph_registry.get(info['graph_id']).graph.to_adjacency() == graph.to_adjacency()
+
+def test_binary_import_rejects_invalid_data(client):
+    response = client.post('/graphs/import', data=b"no es un grafo", content_type="application/octet-stream")
+    assert response.status_code == 400
+    assert "binario" in json.loads(response.data)['error']
+
+# --- PRUEBAS DE EDICIÓN INCREMENTAL (/graphs/<graph_id>/edits) ---
+
+def test_edge_edits_repair_cached_trees(client):
+    """
+    Escenario: se consulta desde A (árbol cacheado), se borra una arista del árbol y se inserta
+    otra. El grafo editado tiene un nuevo graph_id y su árbol se repara sin recalcularse.
+    """
+    from main import spt_cache
+    spt_cache.clear()
+
+    matrix = [
+        ["", "4", "1", ""],
+        ["", "", "", "1"],
+        ["", "2", "", "5"],
+        ["", "", "", ""]
+    ]
+    graph_id = json.loads(client.post('/graphs', json={"matrix": matrix, "is_directed": True}).data)['graph_id']
+    query = {"start_node_index": 0, "end_node_index": 3, "algorithm": "dijkstra", "include_steps": False}
+    assert json.loads(client.post('/find_path', json={**query, "graph_id": graph_id}).data)['distance'] == 4
+
+    response = client.post(f'/graphs/{graph_id}/edits', json={"edits": [
+        {"source": 2, "target": 1, "weight": None},
+        {"source": 0, "target": 3, "weight": 6},
+    ]})
+    assert response.status_code == 200
+    info = json.loads(response.data)
+    assert info['previous_graph_id'] == graph_id and info['graph_id'] != graph_id
+    assert (info['edges_changed'], info['trees_repaired'], info['num_edges']) == (2, 1, 5)
+
+    edited = client.post('/find_path', json={**query, "graph_id": info['graph_id']})
+    assert edited.headers['X-SPT-Cache'] == "hit"
+    assert json.loads(edited.data)['path_indices'] == [0, 1, 3]
+
+    matrix[2][1], matrix[0][3] = "", "6"
+    inline = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 3, "dijkstra")).data)
+    assert json.loads(edited.data)['distance'] == inline['distance'] == 5
+
+def test_edge_edits_validation(client):
+    graph_id = json.loads(client.post('/graphs', json={"matrix": [["", "1"], ["", ""]], "is_directed": False}).data)['graph_id']
+
+    out_of_range = client.post(f'/graphs/{graph_id}/edits', json={"edits": [{"source": 0, "target": 5, "weight": 1}]})
+    assert out_of_range.status_code == 400
+    assert client.post('/graphs/no-existe/edits', json={"edits": []}).status_code == 404
+
+    # No dirigido: la edición se aplica en ambos sentidos
+    info = json.loads(client.post(f'/graphs/{graph_id}/edits', json={"edits": [{"source": 1, "target": 0, "weight": "7"}]}).data)
+    assert info['edges_changed'] == 2 and info['num_edges'] == 2
+
+# --- PRUEBAS DE CONSULTAS POR LOTES (/find_paths) ---
+
+def test_batch_groups_pairs_by_source(client):
+    """
+    Escenario: 4 pares con 3 orígenes distintos. Se calculan solo 3 árboles y los resultados
+    respetan el orden de la solicitud.
+    """
+    from main import spt_cache
+    spt_cache.clear()
+
+    matrix = [
+        ["", "4", "1", ""],
+        ["", "", "", "1"],
+        ["", "2", "", "5"],
+        ["", "", "", ""]
+    ]
+    pairs = [[0, 3], [2, 3], [0, 1], [3, 0]]
+    response = client.post('/find_paths', json={"matrix": matrix, "is_directed": True, "pairs": pairs, "algorithm": "dijkstra"})
+    data = json.loads(response.data)
+
+    assert response.status_code == 200
+    assert data['distinct_sources'] == 3
+    assert data['trees_computed'] == 3
+    assert [(r['start_node_index'], r['end_node_index']) for r in data['results']] == [tuple(p) for p in pairs]
+    assert [r['distance'] for r in data['results']] == [4, 3, 3, "No hay camino"]
+    assert data['results'][0]['path'] == "A -> C -> B -> D"
+
+    for (source, target), result in zip(pairs, data['results']):
+        single = json.loads(client.post('/find_path', json=build_payload(matrix, source, target, "dijkstra")).data)
+        assert result['distance'] == single['distance']
+        assert result['path_indices'] == single['path_indices']
+
+def test_batch_invalid_pair(client):
+    response = client.post('/find_paths', json={"matrix": [["", ""], ["", ""]], "is_directed": True, "pairs": [[0, 2]]})
+    assert response.status_code == 400
+    assert "fuera de rango" in json.loads(response.data)['error']
+
+# --- PRUEBAS DE BELLMAN-FORD CON COLA (SPFA) ---
+
+def test_spfa_matches_bellman_ford_endpoint(client):
+    matrix = [
+        ["", "4", "5", ""],
+        ["", "", "", "3"],
+        ["", "-3", "", "4"],
+        ["", "", "", ""],
+    ]
+    expected = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 3, "bellman-ford")).data)
+    data = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 3, "spfa")).data)
+
+    assert data['algorithm'] == "spfa"
+    assert data['distance'] == expected['distance'] == 5
+    assert data['path_indices'] == expected['path_indices']
+    assert data['steps']['steps'][-1]['currentDistances'] == expected['steps']['steps'][-1]['currentDistances']
+
+# --- PRUEBAS DE DIJKSTRA CON DECREASE-KEY (MONTÍCULO INDEXADO Y DIAL) ---
+
+@pytest.mark.parametrize("algo", ["dijkstra-indexed-heap", "dijkstra-dial"])
+def test_dijkstra_queue_backends_match_dijkstra(client, algo):
+    matrix = [
+        ["", "7", "9", "", "", "14"],
+        ["7", "", "10", "15", "", ""],
+        ["9", "10", "", "11", "", "2"],
+        ["", "15", "11", "", "6", ""],
+        ["", "", "", "6", "", "9"],
+        ["14", "", "2", "", "9", ""],
+    ]
+    expected = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 4, "dijkstra")).data)
+    data = json.loads(client.post('/find_path', json=build_payload(matrix, 0, 4, algo)).data)
+    without_steps = json.loads(client.post('/find_path', json={**build_payload(matrix, 0, 4, algo), "include_steps": False}).data)
+
+    assert data['algorithm'] == algo
+    assert data['distance'] == without_steps['distance'] == expected['distance'] == 20
+    assert data['path_indices'] == expected['path_indices']
+
+    negative = json.loads(client.post('/find_path', json=build_payload([["", "-1"], ["", ""]], 0, 1, algo)).data)
+    assert negative['distance'] == "N/A"
+
+# --- PRUEBAS DE DIJKSTRA BIDIRECCIONAL Y A* ---
+
+def grid_payload(width, algo):
+    """Rejilla width×width no dirigida con pesos 1, de la esquina izquierda a la derecha de la fila central."""
+    n = width * width
+    matrix = [[""] * n for _ in range(n)]
+    for r in range(width):
+        for c in range(width):
+            if c + 1 < width:
+                matrix[r * width + c][r * width + c + 1] = "1"
+            if r + 1 < width:
+                matrix[r * width + c][(r + 1) * width + c] = "1"
+    row = width // 2
+    payload = build_payload(matrix, row * width, row * width + width - 1, algo, is_directed=False)
+    payload["positions"] = {str(i): {"x": (i % width) * 50, "y": (i // width) * 50} for i in range(n)}
+    return payload
+
+@pytest.mark.parametrize("algo", ["bidirectional-dijkstra", "astar"])
+def test_point_to_point_algorithms_settle_fewer_nodes(client, algo):
+    """Misma distancia que Dijkstra fijando menos nodos, con el mismo esquema de pasos."""
+    baseline = json.loads(client.post('/find_path', json=grid_payload(9, "dijkstra")).data)
+    data = json.loads(client.post('/find_path', json=grid_payload(9, algo)).data)
+
+    assert data['algorithm'] == algo
+    assert data['distance'] == baseline['distance'] == 8
+    final_step = data['steps']['steps'][-1]
+    assert set(final_step) >= {'description', 'settledNodeIndices', 'currentDistances', 'pathEdgesIndices'}
+    assert len(final_step['settledNodeIndices']) < len(baseline['steps']['steps'][-1]['settledNodeIndices'])
+
+@pytest.mark.parametrize("algo", ["bidirectional-dijkstra", "astar"])
+def test_point_to_point_without_steps_and_negative_weights(client, algo):
+    payload = grid_payload(4, algo)
+    payload["include_steps"] = False
+    assert json.loads(client.post('/find_path', json=payload).data)['distance'] == 3
+
+    negative = build_payload([["", "-1"], ["", ""]], 0, 1, algo)
+    assert json.loads(client.post('/find_path', json=negative).data)['distance'] == "N/A"
+
+def test_astar_rejects_incomplete_positions(client):
+    payload = grid_payload(3, "astar")
+    del payload["positions"]["4"]
+    response = client.post('/find_path', json=payload)
+    assert response.status_code == 400
+    assert "posiciones" in json.loads(response.data)['error']
+
+# --- PRUEBAS DE ÍNDICES DE LANDMARKS (ALT) ---
+
+def test_alt_index_answers_point_to_point_queries(client):
+    """
+    Escenario: se registra la rejilla, se construye su índice de landmarks y 'alt' encuentra la
+    misma distancia que Dijkstra fijando menos nodos.
+    """
+    payload = grid_payload(9, "alt")
+    graph_id = json.loads(client.post('/graphs', json={"matrix": payload["matrix"], "is_directed": False}).data)['graph_id']
+    query = {k: payload[k] for k in ("start_node_index", "end_node_index", "algorithm")}
+
+    response = client.post(f'/graphs/{graph_id}/index', json={"landmarks": 4})
+    assert response.status_code == 201
+    assert len(json.loads(response.data)['landmarks']) == 4
+    assert json.loads(client.get(f'/graphs/{graph_id}/index').data)['graph_id'] == graph_id
+
+    data = json.loads(client.post('/find_path', json={**query, "graph_id": graph_id}).data)
+    baseline = json.loads(client.post('/find_path', json=grid_payload(9, "dijkstra")).data)
+    assert data['distance'] == baseline['distance'] == 8
+    assert len(data['steps']['steps'][-1]['settledNodeIndices']) < len(baseline['steps']['steps'][-1]['settledNodeIndices'])
+
+    plain = json.loads(client.post('/find_path', json={**query, "graph_id": graph_id, "include_steps": False}).data)
+    assert plain['distance'] == 8 and len(plain['path_indices']) == 9
+
+def test_alt_index_is_invalidated_by_edits(client):
+    """El grafo editado tiene otro hash: el índice anterior no se aplica y 'alt' sigue siendo exacto."""
+    matrix = [["", "1", "5"], ["", "", "1"], ["", "", ""]]
+    graph_id = json.loads(client.post('/graphs', json={"matrix": matrix, "is_directed": True}).data)['graph_id']
+    assert client.post(f'/graphs/{graph_id}/index', json={}).status_code == 201
+
+    edited_id = json.loads(client.post(f'/graphs/{graph_id}/edits', json={"edits": [
+        {"source": 1, "target": 2, "weight": 10},
+    ]}).data)['graph_id']
+    assert client.get(f'/graphs/{edited_id}/index').status_code == 404
+
+    query = {"start_node_index": 0, "end_node_index": 2, "algorithm": "alt", "include_steps": False}
+    assert json.loads(client.post('/find_path', json={**query, "graph_id": edited_id}).data)['distance'] == 5
+    assert json.loads(client.post('/find_path', json={**query, "graph_id": graph_id}).data)['distance'] == 2
+
+def test_alt_index_persisted_in_graph_store(client, tmp_path, monkeypatch):
+    import main
+    monkeypatch.setattr(main, 'GRAPH_STORE_DIR', str(tmp_path))
+    graph_id = json.loads(client.post('/graphs', json={"matrix": [["", "2"], ["", ""]], "is_directed": True}).data)['graph_id']
+    client.post(f'/graphs/{graph_id}/index', json={"landmarks": 1})
+    assert (tmp_path / f"{graph_id}.alt.npz").exists()
+
+    # Si solo falta en memoria se vuelve a cargar desde disco
+    main.landmark_indexes.remove(graph_id)
+    assert client.get(f'/graphs/{graph_id}/index').status_code == 200
+
+def test_alt_index_delete_removes_persisted_file(client, tmp_path, monkeypatch):
+    import main
+    monkeypatch.setattr(main, 'GRAPH_STORE_DIR', str(tmp_path))
+    graph_id = json.loads(client.post('/graphs', json={"matrix": [["", "6"], ["", ""]], "is_directed": True}).data)['graph_id']
+    client.post(f'/graphs/{graph_id}/index', json={"landmarks": 1})
+
+    assert client.delete(f'/graphs/{graph_id}/index').status_code == 200
+    assert not (tmp_path / f"{graph_id}.alt.npz").exists()
+    assert client.get(f'/graphs/{graph_id}/index').status_code == 404
+    assert client.delete(f'/graphs/{graph_id}/index').status_code == 404
+
+    # Solo en disco (p. ej. tras reiniciar el servidor) también cuenta como existente
+    client.post(f'/graphs/{graph_id}/index', json={"landmarks": 1})
+    main.landmark_indexes.remove(graph_id)
+    assert client.delete(f'/graphs/{graph_id}/index').status_code == 200
+
+def test_deleting_graph_removes_persisted_alt_index(client, tmp_path, monkeypatch):
+    import main
+    monkeypatch.setattr(main, 'GRAPH_STORE_DIR', str(tmp_path))
+    matrix = [["", "4"], ["", ""]]
+    graph_id = json.loads(client.post('/graphs', json={"matrix": matrix, "is_directed": True}).data)['graph_id']
+    client.post(f'/graphs/{graph_id}/index', json={"landmarks": 1})
+
+    assert client.delete(f'/graphs/{graph_id}').status_code == 200
+    assert not (tmp_path / f"{graph_id}.alt.npz").exists()
+    client.post('/graphs', json={"matrix": matrix, "is_directed": True})
+    assert client.get(f'/graphs/{graph_id}/index').status_code == 404
+
+def test_alt_index_validation(client):
+    negative_id = json.loads(client.post('/graphs', json={"matrix": [["", "-1"], ["", ""]], "is_directed": True}).data)['graph_id']
+    assert client.post(f'/graphs/{negative_id}/index', json={}).status_code == 400
+    assert client.post(f'/graphs/{negative_id}/index', json={"landmarks": 0}).status_code == 400
+    assert client.post('/graphs/no-existe/index', json={}).status_code == 404
+
+# --- PRUEBAS DE K CAMINOS MÁS CORTOS (YEN) ---
+
+def test_k_shortest_paths_ranked(client):
+    """
+    Escenario: 0 -> 3 tiene tres caminos simples de costos 2, 3 y 4; con k = 5 se devuelven los
+    tres en orden y el resultado principal es el mejor.
+    """
+    matrix = [
+        ["", "1", "2", "3"],
+        ["", "", "", "1"],
+        ["", "", "", "1"],
+        ["", "", "", ""],
+    ]
+    response = client.post('/find_path', json={
+        "matrix": matrix, "is_directed": True, "start_node_index": 0, "end_node_index": 3,
+        "algorithm": "dijkstra", "k": 5,
+    })
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['distance'] == 2 and data['path_indices'] == [0, 1, 3] and data['k'] == 5
+    assert 'steps' not in data
+    assert [(p['rank'], p['distance'], p['path_indices']) for p in data['paths']] == [
+        (1, 2, [0, 1, 3]), (2, 3, [0, 3]), (3, 3, [0, 2, 3]),
+    ]
+    assert data['paths'][0]['path'] == "A -> B -> D"
+
+def test_k_shortest_paths_validation(client):
+    base = {"matrix": [["", "-1"], ["", ""]], "is_directed": True, "start_node_index": 0, "end_node_index": 1,
+            "algorithm": "bellman-ford"}
+    assert client.post('/find_path', json={**base, "k": 0}).status_code == 400
+    assert client.post('/find_path', json={**base, "k": 1000}).status_code == 400
+    # Con pesos negativos solo se admite k = 1
+    assert client.post('/find_path', json={**base, "k": 2, "algorithm": "dijkstra"}).status_code == 400
+    assert client.post('/find_path', json={**base, "k": 1, "include_steps": False}).status_code == 200
+
+def test_k_shortest_paths_reject_other_algorithms(client):
+    """Con 'k' > 1 se ejecuta Yen sobre Dijkstra: otro algoritmo pedido es un error, no se ignora."""
+    base = {"matrix": [["", "1"], ["", ""]], "is_directed": True, "start_node_index": 0, "end_node_index": 1, "k": 2}
+    for algorithm in ("bellman-ford", "astar", "bidirectional-dijkstra"):
+        response = client.post('/find_path', json={**base, "algorithm": algorithm})
+        assert response.status_code == 400
+        assert "Yen" in json.loads(response.data)['error']
+    assert client.post('/find_path', json={**base, "algorithm": "dijkstra"}).status_code == 200
+
+# --- PRUEBAS DE CAMINOS ENTRE TODOS LOS PARES ---
+
+@pytest.mark.parametrize("engine", ["auto", "floyd-warshall", "johnson"])
+def test_all_pairs_matrices(client, engine):
+    """Distancias y sucesores de todos los pares; los inalcanzables son "∞" / null."""
+    matrix = [
+        ["", "4", "1"],
+        ["", "", ""],
+        ["", "-2", ""],
+    ]
+    response = client.post('/all_pairs', json={"matrix": matrix, "is_directed": True, "engine": engine})
+    assert response.status_code == 200
+    data = json.loads(response.data)
+    assert data['status'] == "OK"
+    assert data['num_nodes'] == 3
+    assert data['distances'] == [[0, -1, 1], ["∞", 0, "∞"], ["∞", -2, 0]]
+    assert data['successors'] == [[0, 2, 2], [None, 1, None], [None, 1, 2]]
+
+def test_all_pairs_negative_cycle(client):
+    matrix = [["", "1"], ["-3", ""]]
+    data = json.loads(client.post('/all_pairs', json={"matrix": matrix, "is_directed": True}).data)
+    assert data['status'] == "Ciclo Negativo Detectado"
+    assert data['distances'] is None
+
+def test_all_pairs_invalid_engine(client):
+    response = client.post('/all_pairs', json={"matrix": [["0"]], "is_directed": True, "engine": "magia"})
+    assert response.status_code == 400
+    assert "Motor no válido" in json.loads(response.data)['error']
+
+# --- PRUEBAS DE INSTRUMENTACIÓN ---
+
+def test_server_timing_phases_and_counters(client):
+    matrix = [["", "4", "1"], ["", "", ""], ["", "2", ""]]
+    response = client.post('/find_path', json=build_payload(matrix, 0, 1, "dijkstra"))
+    timing = response.headers['Server-Timing']
+
+    for phase in ("parse", "build", "algorithm", "serialize", "total"):
+        assert f"{phase};dur=" in timing
+    assert 'steps;desc="' in timing
+
+    response = client.post('/find_path', json={**build_payload(matrix, 0, 1, "dijkstra"), "include_steps": False})
+    assert 'heap_pops;desc="' in response.headers['Server-Timing']
+
+def test_metrics_histograms(client):
+    matrix = [["", "1"], ["", ""]]
+    client.post('/find_path', json=build_payload(matrix, 0, 1, "bellman-ford"))
+    text = client.get('/metrics').get_data(as_text=True)
+
+    assert 'http_request_duration_seconds_bucket{endpoint="/find_path",le="+Inf"}' in text
+    assert 'request_phase_duration_seconds_count{endpoint="/find_path",phase="algorithm"}' in text
+    assert 'algorithm_operations_total{operation="steps"}' in text
+
+def test_profile_flag(client):
+    matrix = [["", "1"], ["", ""]]
+    data = json.loads(client.post('/find_path?profile=1', json=build_payload(matrix, 0, 1, "dijkstra")).data)
+
+    assert data['distance'] == 1
+    assert data['profile']['functions']
+    assert any("dijkstra" in f['function'] for f in data['profile']['functions'])
+    assert 'profile' not in json.loads(client.post('/find_path', json=build_payload(matrix, 0, 1, "dijkstra")).data)
+
+# --- PRUEBAS DE TRABAJOS ASÍNCRONOS ---
+
+def wait_for_job(client, job_id):
+    from main import job_queue
+    assert job_queue.get(job_id).finished.wait(10)
+    return json.loads(client.get(f'/jobs/{job_id}').data)
+
+def test_job_result_matches_synchronous_response(client):
+    matrix = [["", "10", ""], ["", "", "-5"], ["", "", ""]]
+    payload = build_payload(matrix, 0, 2, "bellman-ford")
+
+    response = client.post('/jobs', json=payload)
+    assert response.status_code == 202
+    job_id = json.loads(response.data)['job_id']
+    status = wait_for_job(client, job_id)
+
+    assert status['status'] == "done"
+    assert status['progress']['steps'] > 0
+    result = json.loads(client.get(f'/jobs/{job_id}/result').data)
+    assert result == json.loads(client.post('/find_path', json=payload).data)
+
+    events = [json.loads(line) for line in client.get(f'/jobs/{job_id}/events').data.splitlines()]
+    assert events[-1]['status'] == "done"
+
+def test_job_limits_and_cancellation(client):
+    matrix = [[str(j - i) if j == i + 1 else "" for j in range(40)] for i in range(40)]
+    payload = build_payload(matrix, 0, 39, "bellman-ford")
+
+    job_id = json.loads(client.post('/jobs', json={**payload, "memory_limit": 5000}).data)['job_id']
+    status = wait_for_job(client, job_id)
+    assert status['status'] == "failed"
+    assert "memoria" in status['error']
+    assert client.get(f'/jobs/{job_id}/result').status_code == 409
+
+    finished_id = json.loads(client.post('/jobs', json=payload).data)['job_id']
+    wait_for_job(client, finished_id)
+    cancelled = json.loads(client.delete(f'/jobs/{finished_id}').data)
+    assert cancelled['status'] == "done"
+
+def test_job_queue_full_returns_503(client, monkeypatch):
+    import main
+    from jobs import JobQueue
+
+    full_queue = JobQueue(max_workers=1, max_pending=0)
+    monkeypatch.setattr(main, 'job_queue', full_queue)
+    try:
+        response = client.post('/jobs', json=build_payload([["", "1"], ["", ""]], 0, 1, "dijkstra"))
+    finally:
+        full_queue.shutdown()
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '1'
+
+def test_job_validation(client):
+    matrix = [["", "1"], ["", ""]]
+    assert client.post('/jobs', json={**build_payload(matrix, 0, 1, "dijkstra"), "trace_format": "lazy"}).status_code == 400
+    assert client.post('/jobs', json={**build_payload(matrix, 0, 1, "dijkstra"), "time_limit": -1}).status_code == 400
+    for flag in ("include_steps", "early_cycle_detection"):
+        assert client.post('/jobs', json={**build_payload(matrix, 0, 1, "dijkstra"), flag: "false"}).status_code == 400
+    assert client.get('/jobs/no-existe').status_code == 404
+
 # --- PRUEBAS DE ERROR Y VALIDACIÓN ---
 
 def test_invalid_algorithm(client):
@@ -223,6 +1220,29 @@ def test_invalid_matrix_value(client):
     assert response.status_code == 400
     assert "La matriz debe contener solo números enteros" in json.loads(response.data)['error']
 
+def test_invalid_matrix_value_with_spaces(client):
+    """Las celdas con espacios se leen celda a celda y siguen validándose igual."""
+    matrix = [
+        [" ", " 2 "],
+        ["x", ""]
+    ]
+    response = client.post('/find_path', json=build_payload(matrix, 0, 1, "dijkstra"))
+
+    assert response.status_code == 400
+    assert "La matriz debe contener solo números enteros" in json.loads(response.data)['error']
+
+def test_matrix_with_spaces_matches_canonical_matrix(client):
+    """La lectura vectorizada y la de celda a celda dan el mismo resultado."""
+    canonical = [["", "4", "1"], ["", "", "2"], ["3", "", ""]]
+    spaced = [[" ", " 4", "1 "], ["", " ", "2"], ["3 ", "", ""]]
+    for is_directed in (True, False):
+        results = [
+            json.loads(client.post('/find_path', json=build_payload(matrix, 0, 2, "dijkstra", is_directed)).data)
+            for matrix in (canonical, spaced)
+        ]
+        assert results[0]['distance'] == results[1]['distance']
+        assert results[0]['path'] == results[1]['path']
+
 def test_options_cors(client):
     """Verifica que el preflight de CORS funcione."""
     response = client.open('/find_path', method='OPTIONS')
@@ -0,0 +1,53 @@
+import json
+import sys
+
+import numpy as np
+import pytest
+
+from benchmark import FAMILIES, compare, generate_graph, main_cli, run_suite
+
+def test_generators_are_seeded():
+    for family in FAMILIES:
+        first, _ = generate_graph(family, 100, seed=7)
+        second, _ = generate_graph(family, 100, seed=7)
+        assert first.content_hash() == second.content_hash()
+
+    other, _ = generate_graph('sparse', 100, seed=8)
+    assert other.content_hash() != generate_graph('sparse', 100, seed=7)[0].content_hash()
+
+def test_negative_dag_has_negative_weights_and_no_cycles():
+    graph, _ = generate_graph('negative-dag', 100, seed=0)
+
+    assert graph.has_negative_weights
+    assert (graph.edge_sources() < graph.indices).all()
+
+def test_grid_has_positions():
+    graph, positions = generate_graph('grid', 100, seed=0)
+
+    assert graph.num_nodes == 100
+    assert positions.shape == (100, 2)
+    assert np.array_equal(positions[11], [1, 1])
+
+def test_suite_smoke_run():
+    results = run_suite(sizes=[100], families=FAMILIES, seed=0, repeat=1)
+
+    measured = [r for r in results if r['status'] == 'ok']
+    engines = {(r['family'], r['engine']) for r in measured}
+    assert ('grid', 'astar') in engines
+    assert ('sparse', 'http-find-path') in engines
+    assert {('negative-dag', 'batch-serial'), ('negative-dag', 'batch-process-pool')} <= engines
+    # Dijkstra no admite pesos negativos: se marca como omitido
+    assert ('negative-dag', 'dijkstra') not in engines
+    assert all(r['seconds_min'] > 0 and r['peak_bytes'] >= 0 for r in measured)
+
+def test_cli_output_and_compare(tmp_path, capsys):
+    output = tmp_path / "resultados.json"
+    main_cli(['--sizes', '100', '--families', 'grid', '--repeat', '1', '--output', str(output)])
+    report = json.loads(output.read_text())
+
+    assert report['environment']['seed'] == 0
+    rows = compare(report['results'], report['results'])
+    assert rows and all(row[-1] == 1 for row in rows)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
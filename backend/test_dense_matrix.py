@@ -0,0 +1,63 @@
+import random
+import sys
+
+import pytest
+
+from dense_matrix import parse_dense_matrix
+from graph_core import CSRGraph
+
+def build_per_cell(matrix, symmetrize):
+    n = len(matrix)
+    sources, targets, weights = [], [], []
+    for i in range(n):
+        for j in range(n):
+            cell = str(matrix[i][j]).strip()
+            if cell != "":
+                sources.append(i)
+                targets.append(j)
+                weights.append(int(cell))
+    return CSRGraph.from_edges(n, sources, targets, weights, symmetrize=symmetrize)
+
+def test_parse_positions_and_weights():
+    positions, weights = parse_dense_matrix([["", "5", "-3"], ["+7", "", ""], ["", "0", "120"]])
+    assert positions.tolist() == [1, 2, 3, 7, 8]
+    assert weights.tolist() == [5, -3, 7, 0, 120]
+
+def test_parse_accepts_integer_cells():
+    positions, weights = parse_dense_matrix([["", 4], [2, ""]])
+    assert positions.tolist() == [1, 2]
+    assert weights.tolist() == [4, 2]
+
+@pytest.mark.parametrize("matrix", [
+    [],
+    [["", "cinco"], ["", ""]],
+    [[" 1", ""], ["", ""]],
+    [["1.5", ""], ["", ""]],
+    [["-", ""], ["", ""]],
+    [["1-", ""], ["", ""]],
+    [["--1", ""], ["", ""]],
+    [["1\x1f2", ""], ["", ""]],
+    [["1" * 19, ""], ["", ""]],
+    [["", ""], [""]],
+])
+def test_non_canonical_matrix_falls_back(matrix):
+    assert parse_dense_matrix(matrix) is None
+
+@pytest.mark.parametrize("symmetrize", [False, True])
+def test_dense_cells_match_per_cell_build(symmetrize):
+    rng = random.Random(5)
+    for _ in range(50):
+        n = rng.randint(1, 15)
+        matrix = [
+            [rng.choice(["", "", "", str(rng.randint(-50, 500)), "+9", "-0", "007"]) for _ in range(n)]
+            for _ in range(n)
+        ]
+        graph = CSRGraph.from_dense_cells(n, *parse_dense_matrix(matrix), symmetrize=symmetrize)
+        assert graph.content_hash() == build_per_cell(matrix, symmetrize).content_hash()
+
+def test_symmetrize_copies_reverse_weight_into_empty_cells():
+    graph = CSRGraph.from_dense_cells(3, *parse_dense_matrix([["", "4", ""], ["", "", ""], ["", "9", ""]]), symmetrize=True)
+    assert graph.to_adjacency() == {0: {1: 4}, 1: {0: 4, 2: 9}, 2: {1: 9}}
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,61 @@
+import random
+import sys
+
+import pytest
+
+from dynamic_sssp import apply_edge_edits, repair_tree
+from graph_core import CSRGraph, INF
+from main import bellman_ford_tree
+
+def test_apply_edge_edits_insert_delete_and_update():
+    graph = CSRGraph.from_edges(3, [0, 0, 1], [1, 2, 2], [4, 7, 1])
+
+    edited, changes = apply_edge_edits(graph, [(0, 1, 2), (0, 2, None), (2, 0, 3), (1, 2, 1)])
+
+    assert edited.to_adjacency() == {0: {1: 2}, 1: {2: 1}, 2: {0: 3}}
+    assert sorted(changes) == [(0, 1, 4, 2), (0, 2, 7, None), (2, 0, None, 3)]
+    assert apply_edge_edits(graph, [(1, 2, 1)]) == (graph, [])
+
+@pytest.mark.parametrize("min_weight", [0, -3])
+def test_repaired_tree_matches_recomputation(min_weight):
+    """El árbol reparado coincide con recalcular Bellman-Ford sobre el grafo editado."""
+    rng = random.Random(17)
+    for _ in range(150):
+        n = rng.randint(1, 9)
+        edges = [(rng.randrange(n), rng.randrange(n), rng.randint(min_weight, 9)) for _ in range(rng.randint(0, 3 * n))]
+        graph = CSRGraph.from_edges(n, [e[0] for e in edges], [e[1] for e in edges], [e[2] for e in edges])
+        edits = [
+            (rng.randrange(n), rng.randrange(n), None if rng.random() < 0.3 else rng.randint(min_weight, 9))
+            for _ in range(rng.randint(1, 3))
+        ]
+        edited, changes = apply_edge_edits(graph, edits)
+        for s in range(n):
+            previous = bellman_ford_tree(graph, s, n)
+            repaired = repair_tree(previous, edited, changes)
+            if repaired is None:
+                assert previous.negative_cycle
+                continue
+            expected = bellman_ford_tree(edited, s, n)
+            assert repaired.negative_cycle == expected.negative_cycle
+            if not expected.negative_cycle:
+                assert list(repaired.distances) == list(expected.distances)
+                for t in range(n):
+                    distance, path = repaired.path_to(t)
+                    if distance != INF:
+                        assert sum(edited[a][b] for a, b in zip(path, path[1:])) == distance
+
+@pytest.mark.parametrize("edit", [(1, 2, 1), (1, 2, 50), (1, 2, None)])
+def test_repair_reads_only_touched_rows(edit):
+    """La reparación no convierte el grafo editado a filas de Python ni construye su inverso."""
+    n = 2000
+    graph = CSRGraph.from_edges(n, list(range(n - 1)) + [0], list(range(1, n)) + [n - 1], [3] * (n - 1) + [10 ** 4])
+    previous = bellman_ford_tree(graph, 0, n)
+    edited, changes = apply_edge_edits(graph, [edit])
+
+    repaired = repair_tree(previous, edited, changes)
+
+    assert edited._rows is None and edited._reverse is None
+    assert list(repaired.distances) == list(bellman_ford_tree(edited, 0, n).distances)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
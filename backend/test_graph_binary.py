@@ -0,0 +1,53 @@
+import sys
+
+import numpy as np
+import pytest
+
+from graph_binary import BinaryGraphFormatError, HEADER_SIZE, from_bytes, load_graph, to_bytes, write_graph
+from graph_core import CSRGraph
+
+def sample_graph():
+    return CSRGraph.from_edges(4, [0, 0, 1, 2, 3], [1, 2, 3, 1, 0], [4, -1, 7, 2, 5])
+
+def test_bytes_round_trip_without_copy():
+    graph = sample_graph()
+    data = to_bytes(graph, is_directed=True)
+
+    loaded, is_directed = from_bytes(data)
+
+    assert is_directed is True
+    assert loaded.content_hash() == graph.content_hash()
+    assert not loaded.weights.flags.owndata
+
+def test_memmap_load(tmp_path):
+    graph = sample_graph()
+    path = tmp_path / "grafo.ogcsr"
+    write_graph(path, graph, is_directed=False)
+
+    loaded, is_directed = load_graph(path)
+
+    assert is_directed is False
+    assert isinstance(loaded.indices.base, np.memmap) or isinstance(loaded.indices, np.memmap)
+    assert loaded.to_adjacency() == graph.to_adjacency()
+
+def test_empty_graph_round_trip():
+    graph = CSRGraph.from_edges(3, [], [], [])
+    loaded, _ = from_bytes(to_bytes(graph, True))
+    assert loaded.num_nodes == 3 and loaded.num_edges == 0
+
+@pytest.mark.parametrize("corrupt", ["magic", "truncated", "unsorted"])
+def test_invalid_binary_graph(corrupt):
+    data = bytearray(to_bytes(sample_graph(), True))
+    if corrupt == "magic":
+        data[0:5] = b"XXXXX"
+    elif corrupt == "truncated":
+        data = data[:-4]
+    else:
+        # Fila 0 con destinos [2, 1]: ya no está ordenada
+        indices_offset = HEADER_SIZE + 8 * 5
+        data[indices_offset:indices_offset + 8] = np.array([2, 1], dtype='<i4').tobytes()
+    with pytest.raises(BinaryGraphFormatError):
+        from_bytes(bytes(data))
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,319 @@
+import random
+import sys
+
+import numpy as np
+import pytest
+
+from graph_core import (
+    CSRGraph, INF, NO_PREDECESSOR, new_distances, new_predecessors, extract_path,
+    NegativeCycle, find_predecessor_cycle, predecessor_cycle,
+)
+from main import (
+    dijkstra, bellman_ford, dijkstra_with_steps, bellman_ford_with_steps,
+    bellman_ford_vectorized, bellman_ford_vectorized_with_steps,
+    bidirectional_dijkstra, bidirectional_dijkstra_with_steps, astar, astar_with_steps,
+    bellman_ford_tree, spfa, spfa_tree, bellman_ford_vectorized_tree,
+    collect_deltas, iter_bellman_ford_steps, iter_spfa_steps,
+)
+
+# --- CONSTRUCCIÓN DEL GRAFO CSR ---
+
+def test_from_edges_sorted_and_deduplicated():
+    """Las filas quedan ordenadas por destino y las aristas repetidas conservan el menor peso."""
+    graph = CSRGraph.from_edges(3, [0, 0, 0, 2], [2, 1, 2, 0], [7, 4, 3, 1])
+
+    assert graph.indptr.tolist() == [0, 2, 2, 3]
+    assert list(graph[0].items()) == [(1, 4), (2, 3)]
+    assert list(graph[2].items()) == [(0, 1)]
+    assert graph.num_edges == 3
+
+def test_from_edges_symmetrize_keeps_explicit_reverse():
+    """En no dirigidos, la arista inversa solo se crea si no se dio explícitamente."""
+    graph = CSRGraph.from_edges(3, [0, 1, 1], [1, 0, 2], [5, 8, 2], symmetrize=True)
+
+    assert graph.to_adjacency() == {0: {1: 5}, 1: {0: 8, 2: 2}, 2: {1: 2}}
+
+def test_row_lookup_and_negative_flag():
+    graph = CSRGraph.from_edges(2, [0], [1], [-3])
+
+    assert 1 in graph[0] and 0 not in graph[0]
+    assert graph[0][1] == -3
+    assert graph.has_negative_weights
+
+def test_rows_are_python_lists_built_once():
+    """Los bucles escalares recorren filas de Python cacheadas, no cortes de NumPy."""
+    graph = CSRGraph.from_edges(3, [0, 0, 1], [2, 1, 2], [4, 6, -1])
+
+    rows = graph.rows()
+    assert rows == [[(1, 6), (2, 4)], [(2, -1)], []]
+    assert all(type(v) is int and type(w) is int for row in rows for v, w in row)
+    assert graph.rows() is rows
+    assert graph[0][2] == 4 and 3 not in graph[0] and list(graph[0]) == [1, 2]
+
+def test_memory_per_edge_is_compact():
+    """Cada arista ocupa 12 bytes (destino int32 + peso int64) más 8 bytes por nodo."""
+    n = 1000
+    graph = CSRGraph.from_edges(n, list(range(n - 1)), list(range(1, n)), [1] * (n - 1))
+
+    assert graph.nbytes == 8 * (n + 1) + 12 * (n - 1)
+
+# --- ESTADO TIPADO ---
+
+def test_typed_state_and_path_extraction():
+    distances = new_distances(4, 1)
+    predecessors = new_predecessors(4)
+    predecessors[2] = 1
+    predecessors[3] = 2
+
+    assert distances.typecode == 'd' and predecessors.typecode == 'q'
+    assert distances[1] == 0 and distances[0] == INF
+    assert predecessors[0] == NO_PREDECESSOR
+    assert extract_path(predecessors, 1, 3) == [1, 2, 3]
+    assert extract_path(predecessors, 1, 0) == []
+
+# --- ALGORITMOS SOBRE CSR Y SOBRE DICT ---
+
+@pytest.mark.parametrize("algorithm", [dijkstra, bellman_ford, bellman_ford_vectorized])
+def test_algorithms_accept_csr_and_dict(algorithm):
+    adjacency = {0: {1: 4, 2: 1}, 1: {3: 1}, 2: {1: 2, 3: 5}, 3: {}}
+    graph = CSRGraph.from_adjacency(adjacency, 4)
+
+    assert algorithm(graph, 0, 3, 4) == (4, [0, 2, 1, 3])
+    assert algorithm(adjacency, 0, 3, 4) == (4, [0, 2, 1, 3])
+
+@pytest.mark.parametrize("algorithm", [dijkstra_with_steps, bellman_ford_with_steps, bellman_ford_vectorized_with_steps])
+def test_step_algorithms_on_csr(algorithm):
+    graph = CSRGraph.from_edges(3, [0, 1], [1, 2], [10, 5])
+
+    status, path, distance, steps = algorithm(graph, 0, 2, 3)
+
+    assert status == "OK"
+    assert path == [0, 1, 2]
+    assert distance == 15
+    assert steps[-1]['currentDistances'][2] == 15
+
+def test_dijkstra_steps_stop_at_negative_weight():
+    """El generador de Dijkstra devuelve también (estado, camino, distancia, ciclo) al ver un peso negativo."""
+    graph = CSRGraph.from_edges(3, [0, 1], [1, 2], [10, -5])
+
+    status, path, _, steps = dijkstra_with_steps(graph, 0, 2, 3)
+
+    assert (status, path) == ("Peso Negativo Detectado", [])
+    assert "peso negativo" in steps[-1]['description']
+
+# --- BELLMAN-FORD VECTORIZADO ---
+
+def test_vectorized_bellman_ford_matches_scalar_with_negative_weights():
+    adjacency = {0: {1: 4, 2: 5}, 1: {3: 3}, 2: {1: -3, 3: 4}, 3: {4: -1}, 4: {}}
+    graph = CSRGraph.from_adjacency(adjacency, 5)
+
+    for end_node in range(5):
+        assert bellman_ford_vectorized(graph, 0, end_node, 5) == bellman_ford(graph, 0, end_node, 5)
+    assert bellman_ford_vectorized(graph, 0, 4, 5) == (4, [0, 2, 1, 3, 4])
+
+def test_vectorized_bellman_ford_ties_same_distance_other_path():
+    """
+    Con caminos de igual costo la distancia coincide, pero el camino puede no ser el del escalar:
+    este encadena 0→1→2→3 en un solo pase, mientras que el vectorizado llega antes por 0→5→3.
+    """
+    graph = CSRGraph.from_edges(6, [0, 1, 2, 0, 5], [1, 2, 3, 5, 3], [1, 1, 1, 1, 2])
+
+    assert bellman_ford(graph, 0, 3, 6) == (3, [0, 1, 2, 3])
+    assert bellman_ford_vectorized(graph, 0, 3, 6) == (3, [0, 5, 3])
+
+    rng = random.Random(3)
+    for _ in range(200):
+        n = rng.randint(2, 8)
+        edges = [(u, v) for u in range(n) for v in range(n) if u != v and rng.random() < 0.4]
+        weights = [rng.randint(0, 3) for _ in edges]
+        graph = CSRGraph.from_edges(n, [u for u, _ in edges], [v for _, v in edges], weights)
+        cost = {edge: weight for edge, weight in zip(edges, weights)}
+        distance, path = bellman_ford_vectorized(graph, 0, n - 1, n)
+        assert distance == bellman_ford(graph, 0, n - 1, n)[0]
+        if path:
+            assert sum(cost[edge] for edge in zip(path, path[1:])) == distance
+
+def test_vectorized_bellman_ford_negative_cycle():
+    graph = CSRGraph.from_edges(3, [0, 1, 2], [1, 2, 1], [1, -2, 1])
+
+    assert bellman_ford_vectorized(graph, 0, 2, 3) == (None, "Ciclo Negativo Detectado")
+    status, path, _, steps = bellman_ford_vectorized_with_steps(graph, 0, 2, 3)
+    assert status == "Ciclo Negativo Detectado"
+    assert steps[-1]['negativeCycleDetected'] is True
+
+def test_vectorized_bellman_ford_stops_when_converged():
+    """Una cadena de 3 aristas converge en 3 pases aunque haya 10 nodos."""
+    graph = CSRGraph.from_edges(10, [0, 1, 2], [1, 2, 3], [1, 1, 1])
+
+    status, path, distance, steps = bellman_ford_vectorized_with_steps(graph, 0, 3, 10)
+
+    assert (status, path, distance) == ("OK", [0, 1, 2, 3], 3)
+    assert [s['iteration'] for s in steps] == [0, 1, 2, 3, 4]
+    assert "converge" in steps[-1]['description']
+
+# --- BELLMAN-FORD CON COLA (SPFA) ---
+
+def test_spfa_matches_bellman_ford_with_negative_weights():
+    rng = random.Random(13)
+    for _ in range(200):
+        n = rng.randint(1, 10)
+        edges = [(rng.randrange(n), rng.randrange(n), rng.randint(-4, 9)) for _ in range(rng.randint(0, 3 * n))]
+        graph = CSRGraph.from_edges(n, [e[0] for e in edges], [e[1] for e in edges], [e[2] for e in edges])
+        for s in range(n):
+            expected, tree = bellman_ford_tree(graph, s, n), spfa_tree(graph, s, n)
+            assert tree.negative_cycle == expected.negative_cycle
+            if not expected.negative_cycle:
+                assert list(tree.distances) == list(expected.distances)
+
+def test_spfa_negative_cycle_and_steps():
+    cycle = CSRGraph.from_edges(3, [0, 1, 2], [1, 2, 1], [1, -2, 1])
+    assert spfa(cycle, 0, 2, 3) == (None, "Ciclo Negativo Detectado")
+    status, _, _, steps = bellman_ford_with_steps(cycle, 0, 2, 3, queue_based=True)
+    assert status == "Ciclo Negativo Detectado"
+    assert steps[-1]['negativeCycleDetected'] is True
+
+    graph = CSRGraph.from_adjacency({0: {1: 4, 2: 5}, 1: {3: 3}, 2: {1: -3, 3: 4}, 3: {}}, 4)
+    status, path, distance, steps = bellman_ford_with_steps(graph, 0, 3, 4, queue_based=True)
+    assert (status, path, distance) == ("OK", [0, 2, 1, 3], 5)
+    assert "converge" in steps[-1]['description']
+
+# --- EXTRACCIÓN DE CICLOS NEGATIVOS ---
+
+def test_predecessor_cycle_walks_back_into_the_cycle():
+    # Ciclo 1 -> 2 -> 3 -> 1 y el nodo 4 cuelga de él (3 -> 4); 0 es el origen
+    predecessors = [NO_PREDECESSOR, 3, 1, 2, 3]
+    cycle = predecessor_cycle(predecessors, 4)
+    assert sorted(cycle) == [1, 2, 3]
+    assert all(predecessors[v] == u for u, v in zip(cycle, cycle[1:] + cycle[:1]))
+    assert predecessor_cycle([NO_PREDECESSOR, 0, 1], 2) is None
+    assert sorted(find_predecessor_cycle(predecessors)) == [1, 2, 3]
+    assert find_predecessor_cycle([NO_PREDECESSOR, 0, 0, 1]) is None
+
+def assert_valid_negative_cycle(graph, cycle):
+    assert isinstance(cycle, NegativeCycle)
+    assert len(set(cycle.nodes)) == len(cycle.nodes)
+    edges = list(zip(cycle.nodes, cycle.nodes[1:] + cycle.nodes[:1]))
+    assert all(v in graph[u] for u, v in edges)
+    assert cycle.weight == sum(graph[u][v] for u, v in edges) < 0
+
+@pytest.mark.parametrize("tree_function", [bellman_ford_tree, spfa_tree, bellman_ford_vectorized_tree])
+@pytest.mark.parametrize("early_cycle_detection", [False, True])
+def test_trees_report_the_negative_cycle(tree_function, early_cycle_detection):
+    """Cada ciclo informado existe en el grafo y es negativo; sin ciclo ambos modos coinciden."""
+    rng = random.Random(21)
+    found = 0
+    for _ in range(300):
+        n = rng.randint(2, 9)
+        edges = [(rng.randrange(n), rng.randrange(n), rng.randint(-4, 9)) for _ in range(rng.randint(1, 3 * n))]
+        graph = CSRGraph.from_edges(n, *zip(*edges))
+        expected = tree_function(graph, 0, n)
+        tree = tree_function(graph, 0, n, early_cycle_detection=early_cycle_detection)
+        assert tree.negative_cycle == expected.negative_cycle
+        if tree.negative_cycle:
+            assert_valid_negative_cycle(graph, tree.cycle)
+            found += 1
+        else:
+            assert list(tree.distances) == list(expected.distances)
+    assert found > 0
+
+@pytest.mark.parametrize("queue_based", [False, True])
+def test_early_cycle_detection_stops_before_pass_v(queue_based):
+    """Ciclo 1 -> 2 -> 3 -> 1 de peso -3 junto al origen de una cadena larga: se detiene en pocas rondas."""
+    n = 60
+    sources, targets, weights = list(range(n - 1)), list(range(1, n)), [1] * (n - 1)
+    graph = CSRGraph.from_edges(n, sources + [3], targets + [1], weights + [-5])
+
+    status, path, _, steps = bellman_ford_with_steps(graph, 0, n - 1, n, queue_based, early_cycle_detection=True)
+    assert status == "Ciclo Negativo Detectado" and path == []
+    assert steps[-1]['negativeCycleDetected'] is True
+    assert sorted(steps[-1]['negativeCycleNodeIndices']) == [1, 2, 3]
+    assert steps[-1]['iteration'] < n // 2
+
+    step_function = iter_spfa_steps if queue_based else iter_bellman_ford_steps
+    _, path, _, cycle, late_deltas = collect_deltas(step_function(graph, 0, n - 1, n))
+    assert path == [] and sorted(cycle.nodes) == [1, 2, 3] and cycle.weight == -3
+    assert len(steps) < len(late_deltas)
+
+# --- DIJKSTRA BIDIRECCIONAL Y A* ---
+
+def test_reverse_graph():
+    graph = CSRGraph.from_edges(3, [0, 0, 1], [1, 2, 2], [4, 7, 1])
+    reverse = graph.reverse()
+    assert reverse.to_adjacency() == {0: {}, 1: {0: 4}, 2: {0: 7, 1: 1}}
+    assert graph.reverse() is reverse
+
+def test_point_to_point_algorithms_match_dijkstra():
+    """Bidireccional y A* (con posiciones arbitrarias) devuelven distancias óptimas y caminos válidos."""
+    rng = random.Random(5)
+    for _ in range(80):
+        n = rng.randint(1, 10)
+        edges = [(rng.randrange(n), rng.randrange(n), rng.randint(0, 9)) for _ in range(rng.randint(0, 3 * n))]
+        graph = CSRGraph.from_edges(n, [e[0] for e in edges], [e[1] for e in edges], [e[2] for e in edges])
+        positions = np.array([[rng.uniform(0, 100), rng.uniform(0, 100)] for _ in range(n)])
+        for s in range(n):
+            for t in range(n):
+                expected, _ = dijkstra(graph, s, t, n)
+                for distance, path in (bidirectional_dijkstra(graph, s, t, n), astar(graph, s, t, n, positions)):
+                    assert distance == expected
+                    if distance != INF:
+                        assert path[0] == s and path[-1] == t
+                        assert sum(graph[a][b] for a, b in zip(path, path[1:])) == distance
+
+@pytest.mark.parametrize("algorithm", [bidirectional_dijkstra_with_steps, astar_with_steps])
+def test_point_to_point_steps_end_with_full_path(algorithm):
+    graph = CSRGraph.from_edges(5, [0, 1, 2, 3, 0], [1, 2, 3, 4, 4], [1, 1, 1, 1, 10])
+
+    status, path, distance, steps = algorithm(graph, 0, 4, 5)
+
+    assert (status, path, distance) == ("OK", [0, 1, 2, 3, 4], 4)
+    assert steps[-1]['currentDistances'][4] == 4
+    assert all(edge in steps[-1]['pathEdgesIndices'] for edge in [[0, 1], [1, 2], [2, 3], [3, 4]])
+
+# --- PODA POR ALCANZABILIDAD ---
+
+def python_reachable(graph, source):
+    reached, stack = {source}, [source]
+    while stack:
+        for v in graph[stack.pop()]:
+            if v not in reached:
+                reached.add(v)
+                stack.append(v)
+    return reached
+
+def test_reachable_from_and_path_nodes():
+    """BFS con niveles estrechos (nodo a nodo) y anchos (vectorizados) frente a un DFS simple."""
+    rng = random.Random(21)
+    for n, degree in ((30, 1), (400, 4)):
+        edges = [(rng.randrange(n), rng.randrange(n)) for _ in range(degree * n)]
+        graph = CSRGraph.from_edges(n, [e[0] for e in edges], [e[1] for e in edges], [1] * len(edges))
+        for s in range(0, n, n // 10):
+            assert set(np.flatnonzero(graph.reachable_from(s)).tolist()) == python_reachable(graph, s)
+            t = (s * 7 + 3) % n
+            expected = {v for v in python_reachable(graph, s) if t in python_reachable(graph, v)}
+            assert set(np.flatnonzero(graph.path_nodes(s, t)).tolist()) == expected
+
+def test_subgraph_keeps_node_ids():
+    graph = CSRGraph.from_edges(4, [0, 0, 1, 2], [1, 2, 3, 3], [1, 2, 3, 4])
+    sub = graph.subgraph(np.array([True, True, False, True]))
+    assert sub.num_nodes == 4
+    assert sub.to_adjacency() == {0: {1: 1}, 1: {3: 3}, 2: {}, 3: {}}
+    assert graph.subgraph(np.ones(4, dtype=bool)) is graph
+
+@pytest.mark.parametrize("algorithm", [bellman_ford, spfa, bellman_ford_vectorized])
+def test_unrelated_negative_cycle_does_not_poison_path(algorithm):
+    """0 -> 1 -> 2 es el camino pedido; el ciclo negativo 3 <-> 4 es alcanzable desde 0 pero no llega a 2."""
+    graph = CSRGraph.from_edges(5, [0, 1, 0, 3, 4], [1, 2, 3, 4, 3], [2, 3, 1, -4, 1])
+    assert bellman_ford_tree(graph, 0, 5).negative_cycle
+
+    assert algorithm(graph, 0, 2, 5) == (5, [0, 1, 2])
+    assert algorithm(graph, 0, 4, 5) == (None, "Ciclo Negativo Detectado")
+
+def test_bellman_ford_steps_stop_when_target_unreachable():
+    graph = CSRGraph.from_edges(4, [0, 1, 3], [1, 0, 2], [1, 1, -1])
+    status, path, distance, steps = bellman_ford_with_steps(graph, 0, 2, 4)
+
+    assert (status, path, distance) == ("OK", [], INF)
+    assert len(steps) == 1 and "No hay camino" in steps[0]['description']
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,56 @@
+import sys
+
+import pytest
+
+from graph_core import CSRGraph
+from graph_registry import GraphRegistry, GraphRegistryConflict
+
+def chain_graph(length):
+    """Cadena 0 -> 1 -> ... -> length con pesos 1."""
+    return CSRGraph.from_edges(length + 1, range(length), range(1, length + 1), [1] * length)
+
+def test_add_is_idempotent_by_content():
+    registry = GraphRegistry()
+    first = registry.add(chain_graph(3), True)
+    second = registry.add(chain_graph(3), True)
+
+    assert first is second
+    assert len(registry) == 1
+    assert registry.stats()['total_bytes'] == first.nbytes
+
+def test_same_content_with_other_direction_is_rejected():
+    registry = GraphRegistry()
+    entry = registry.add(chain_graph(3), True)
+
+    with pytest.raises(GraphRegistryConflict):
+        registry.add(chain_graph(3), False)
+    assert registry.get(entry.graph_id).is_directed
+
+    registry.remove(entry.graph_id)
+    assert not registry.add(chain_graph(3), False).is_directed
+
+def test_memory_based_lru_eviction():
+    """Al superar el límite de bytes se desaloja el grafo usado hace más tiempo."""
+    a, b, c = chain_graph(10), chain_graph(11), chain_graph(12)
+    registry = GraphRegistry(max_bytes=a.nbytes + b.nbytes + c.nbytes - 1)
+
+    entry_a = registry.add(a, True)
+    entry_b = registry.add(b, True)
+    registry.get(entry_a.graph_id)      # 'a' pasa a ser el más reciente
+    entry_c = registry.add(c, True)
+
+    assert entry_a.graph_id in registry
+    assert entry_b.graph_id not in registry
+    assert entry_c.graph_id in registry
+    assert registry.stats()['total_bytes'] <= registry.max_bytes
+
+def test_single_oversized_graph_is_kept():
+    registry = GraphRegistry(max_bytes=1)
+    entry = registry.add(chain_graph(5), True)
+
+    assert registry.get(entry.graph_id) is entry
+    assert registry.remove(entry.graph_id)
+    assert registry.get(entry.graph_id) is None
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
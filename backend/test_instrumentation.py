@@ -0,0 +1,49 @@
+import sys
+
+import pytest
+
+from instrumentation import LATENCY_BUCKETS, Histogram, MetricsRegistry, RequestMetrics, count, lap
+
+def test_histogram_buckets_are_cumulative():
+    histogram = Histogram()
+    for value in (0.0005, 0.003, 0.003, 20.0):
+        histogram.observe(value)
+
+    buckets = dict(histogram.cumulative_buckets())
+    assert buckets[LATENCY_BUCKETS[0]] == 1
+    assert buckets[0.005] == 3
+    assert buckets[LATENCY_BUCKETS[-1]] == 3
+    assert buckets[float('inf')] == 4
+    assert histogram.sum == pytest.approx(20.0065)
+
+def test_request_metrics_laps_and_counters():
+    metrics = RequestMetrics()
+    metrics.lap('parse')
+    metrics.lap('algorithm')
+    metrics.count({'relaxations': 3})
+    metrics.count({'relaxations': 2, 'heap_pops': 1})
+
+    assert list(metrics.phases) == ['parse', 'algorithm']
+    assert metrics.counters == {'relaxations': 5, 'heap_pops': 1}
+    header = metrics.server_timing()
+    assert header.startswith("parse;dur=") and 'relaxations;desc="5"' in header
+
+def test_helpers_are_noops_outside_requests():
+    lap('parse')
+    count(relaxations=1)
+
+def test_registry_prometheus_text():
+    registry = MetricsRegistry()
+    metrics = RequestMetrics()
+    metrics.lap('build')
+    metrics.count({'steps': 7})
+    registry.record('/find_path', metrics)
+    registry.record('/find_path', metrics)
+
+    text = registry.prometheus_text()
+    assert 'http_request_duration_seconds_count{endpoint="/find_path"} 2' in text
+    assert 'request_phase_duration_seconds_bucket{endpoint="/find_path",phase="build",le="+Inf"} 2' in text
+    assert 'algorithm_operations_total{operation="steps"} 14' in text
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
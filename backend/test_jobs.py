@@ -0,0 +1,133 @@
+import sys
+import threading
+import time
+
+import pytest
+
+from graph_core import CSRGraph
+from jobs import CANCELLED, CHECKPOINT_POPS, DONE, FAILED, RUNNING, JobQueue, JobQueueFull, checkpoint
+from shortest_path_trees import bellman_ford_tree, dijkstra_tree
+
+@pytest.fixture
+def queue():
+    job_queue = JobQueue(max_workers=1, max_jobs=3)
+    yield job_queue
+    job_queue.shutdown()
+
+def counting_steps(count):
+    for i in range(count):
+        yield {'iteration': i, 'distanceChanges': [[i, i]]}
+    return "OK"
+
+def test_job_runs_and_reports_progress(queue):
+    def task(job):
+        run = job.track_steps(counting_steps(5))
+        deltas = list(run)
+        return len(deltas)
+
+    job = queue.submit('prueba', task)
+    assert job.finished.wait(5)
+
+    assert job.status == DONE
+    assert job.result == 5
+    assert job.describe()['progress']['steps'] == 5
+    assert job.describe()['progress']['iteration'] == 4
+
+def test_running_job_is_cancelled_cooperatively(queue):
+    started = threading.Event()
+
+    def task(job):
+        started.set()
+        while True:
+            job.check()
+
+    job = queue.submit('prueba', task)
+    assert started.wait(5)
+    queue.cancel(job.job_id)
+
+    assert job.finished.wait(5)
+    assert job.status == CANCELLED
+
+def test_queued_job_is_cancelled_before_running(queue):
+    release = threading.Event()
+    blocker = queue.submit('prueba', lambda job: release.wait(5))
+    waiting = queue.submit('prueba', lambda job: "no debería ejecutarse")
+
+    queue.cancel(waiting.job_id)
+    release.set()
+
+    assert waiting.finished.wait(5) and blocker.finished.wait(5)
+    assert waiting.status == CANCELLED
+    assert waiting.result is None
+
+def test_time_and_memory_limits(queue):
+    def endless(job):
+        while True:
+            job.check()
+
+    slow = queue.submit('prueba', endless, time_limit=0.05)
+    assert slow.finished.wait(5)
+    assert slow.status == FAILED and "Tiempo límite" in slow.error
+
+    big = queue.submit('prueba', lambda job: list(job.track_steps(counting_steps(100))), memory_limit=1000)
+    assert big.finished.wait(5)
+    assert big.status == FAILED and "memoria" in big.error
+
+def test_store_evicts_oldest_finished_jobs(queue):
+    jobs = [queue.submit('prueba', lambda job: None) for _ in range(5)]
+    for job in jobs:
+        job.finished.wait(5)
+    queue.submit('prueba', lambda job: None).finished.wait(5)
+
+    assert len(queue) <= 3
+    assert queue.get(jobs[0].job_id) is None
+
+def test_events_end_with_final_state(queue):
+    job = queue.submit('prueba', lambda job: list(job.track_steps(counting_steps(3))))
+    events = list(job.iter_events(0.01))
+
+    assert events[-1]['status'] == DONE
+    assert events[-1]['progress']['steps'] == 3
+
+def path_graph(num_nodes):
+    return CSRGraph.from_edges(num_nodes, range(num_nodes - 1), range(1, num_nodes), [1] * (num_nodes - 1))
+
+def test_engines_without_steps_stop_at_checkpoints(queue):
+    graph = path_graph(CHECKPOINT_POPS + 10)
+
+    def cancelled_relaxation(job):
+        queue.cancel(job.job_id)
+        return bellman_ford_tree(graph, 0, graph.num_nodes)
+
+    job = queue.submit('prueba', cancelled_relaxation)
+    assert job.finished.wait(5)
+    assert job.status == CANCELLED
+
+    def late_dijkstra(job):
+        time.sleep(0.1)
+        return dijkstra_tree(graph, 0, graph.num_nodes)
+
+    slow = queue.submit('prueba', late_dijkstra, time_limit=0.05)
+    assert slow.finished.wait(5)
+    assert slow.status == FAILED and "Tiempo límite" in slow.error
+
+    # Fuera de un trabajo checkpoint() no hace nada
+    checkpoint()
+    assert dijkstra_tree(graph, 0, graph.num_nodes).distances[-1] == graph.num_nodes - 1
+
+def test_pending_queue_is_bounded():
+    job_queue = JobQueue(max_workers=1, max_pending=1)
+    release = threading.Event()
+    try:
+        running = job_queue.submit('prueba', lambda job: release.wait(5))
+        while running.status != RUNNING:
+            time.sleep(0.01)
+        job_queue.submit('prueba', lambda job: None)
+        with pytest.raises(JobQueueFull):
+            job_queue.submit('prueba', lambda job: None)
+    finally:
+        release.set()
+        job_queue.shutdown()
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,65 @@
+import random
+import sys
+
+import pytest
+
+from graph_core import CSRGraph
+from k_shortest import spur_search, yen_k_shortest_paths
+from main import dijkstra_tree
+
+def random_graph(num_nodes, num_edges, seed, max_weight=6):
+    rng = random.Random(seed)
+    edges = [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(0, max_weight)) for _ in range(num_edges)]
+    return CSRGraph.from_edges(num_nodes, *zip(*edges))
+
+def all_simple_paths(graph, start_node, end_node):
+    """Todos los caminos simples por fuerza bruta, ordenados por costo."""
+    found = []
+    def visit(u, path, cost):
+        if u == end_node:
+            found.append((cost, list(path)))
+            return
+        for v, weight in graph[u].items():
+            if v not in path:
+                path.append(v)
+                visit(v, path, cost + weight)
+                path.pop()
+    visit(start_node, [start_node], 0)
+    return sorted(found)
+
+def k_shortest(graph, start_node, end_node, k):
+    reverse_tree = dijkstra_tree(graph.reverse(), end_node, graph.num_nodes)
+    return yen_k_shortest_paths(graph, start_node, end_node, k, reverse_tree)
+
+@pytest.mark.parametrize("seed", range(40))
+def test_matches_brute_force_enumeration(seed):
+    """Mismos costos que enumerar todos los caminos simples, incluidos pesos 0 y empates."""
+    graph = random_graph(7, 20, seed)
+    expected = all_simple_paths(graph, 0, 6)
+    paths = k_shortest(graph, 0, 6, 12)
+
+    assert [cost for cost, _ in paths] == [cost for cost, _ in expected[:12]]
+    assert len({tuple(path) for _, path in paths}) == len(paths)
+    for cost, path in paths:
+        assert path[0] == 0 and path[-1] == 6 and len(set(path)) == len(path)
+        assert sum(graph[u][v] for u, v in zip(path, path[1:])) == cost
+
+def test_fewer_paths_than_k_and_unreachable():
+    # 0 -> 1 -> 3, 0 -> 2 -> 3 y el nodo 4 aislado
+    graph = CSRGraph.from_edges(5, [0, 0, 1, 2], [1, 2, 3, 3], [1, 2, 1, 1])
+    assert k_shortest(graph, 0, 3, 5) == [(2, [0, 1, 3]), (3, [0, 2, 3])]
+    assert k_shortest(graph, 0, 4, 5) == []
+
+def test_spur_search_reuses_tree_path():
+    """Si el camino del árbol desde el nodo de desvío está permitido se devuelve sin expandir aristas."""
+    graph = CSRGraph.from_edges(4, [0, 0, 1, 2], [1, 2, 3, 3], [1, 5, 1, 1])
+    reverse_tree = dijkstra_tree(graph.reverse(), 3, 4)
+    args = (3, reverse_tree.distances, reverse_tree.predecessors)
+
+    assert spur_search(graph, (0, [], []), *args) == (2, [0, 1, 3])
+    # Prohibido el primer salto 0 -> 1: el desvío sale por 2
+    assert spur_search(graph, (0, [], [1]), *args) == (6, [0, 2, 3])
+    assert spur_search(graph, (0, [], [1, 2]), *args) is None
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,68 @@
+import random
+import sys
+
+import numpy as np
+import pytest
+
+from graph_core import INF, CSRGraph
+from landmarks import LandmarkIndexStore, build_landmark_index, delete_index, load_index, save_index
+from main import dijkstra_tree
+
+def random_graph(num_nodes, num_edges, seed):
+    rng = random.Random(seed)
+    edges = [(rng.randrange(num_nodes), rng.randrange(num_nodes), rng.randint(1, 20)) for _ in range(num_edges)]
+    return CSRGraph.from_edges(num_nodes, *zip(*edges))
+
+def test_lower_bounds_never_exceed_true_distances():
+    graph = random_graph(60, 150, seed=1)
+    index = build_landmark_index(graph, 4, dijkstra_tree)
+    assert len(set(index.landmarks.tolist())) == 4
+
+    for target in range(0, 60, 7):
+        bounds = index.lower_bounds(target)
+        true_distances = np.array(dijkstra_tree(graph.reverse(), target, 60).distances)
+        reachable = true_distances < INF
+        assert (bounds[reachable] <= true_distances[reachable]).all()
+        assert bounds[target] == 0
+
+def test_infinite_bound_means_unreachable():
+    # Dos componentes: 0 -> 1 -> 2 y 3 -> 4
+    graph = CSRGraph.from_edges(5, [0, 1, 3], [1, 2, 4], [1, 1, 1])
+    index = build_landmark_index(graph, 2, dijkstra_tree)
+    bounds = index.lower_bounds(2)
+    assert bounds[3] == INF and bounds[4] == INF
+    assert bounds[0] < INF
+
+def test_save_and_load_checks_content_hash(tmp_path):
+    graph = random_graph(20, 50, seed=2)
+    index = build_landmark_index(graph, 3, dijkstra_tree)
+    save_index(index, str(tmp_path))
+
+    loaded = load_index(str(tmp_path), graph)
+    assert loaded.graph_id == graph.content_hash()
+    assert np.array_equal(loaded.from_landmarks, index.from_landmarks)
+    # Otro contenido no tiene índice (aunque se renombre el archivo con su hash)
+    edited = random_graph(20, 50, seed=3)
+    assert load_index(str(tmp_path), edited) is None
+    (tmp_path / f"{index.graph_id}.alt.npz").rename(tmp_path / f"{edited.content_hash()}.alt.npz")
+    assert load_index(str(tmp_path), edited) is None
+
+def test_delete_index_removes_the_file(tmp_path):
+    graph = random_graph(20, 50, seed=4)
+    save_index(build_landmark_index(graph, 2, dijkstra_tree), str(tmp_path))
+
+    assert delete_index(str(tmp_path), graph.content_hash())
+    assert load_index(str(tmp_path), graph) is None
+    assert not delete_index(str(tmp_path), graph.content_hash())
+
+def test_store_is_keyed_by_content_hash():
+    graph = random_graph(10, 20, seed=4)
+    store = LandmarkIndexStore()
+    store.put(build_landmark_index(graph, 2, dijkstra_tree))
+
+    assert store.get(graph) is not None
+    assert store.get(random_graph(10, 20, seed=5)) is None
+    assert store.remove(graph.content_hash()) and len(store) == 0
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
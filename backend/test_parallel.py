@@ -0,0 +1,92 @@
+import sys
+
+import numpy as np
+import pytest
+
+from graph_core import CSRGraph
+from instrumentation import finish_request, start_request
+from parallel import ParallelExecutor, SharedGraph
+from parallel_worker import attach_shared_graph
+from shortest_path_trees import dijkstra_tree
+
+def random_graph(num_nodes, num_edges, seed=0):
+    rng = np.random.default_rng(seed)
+    return CSRGraph.from_edges(
+        num_nodes, rng.integers(0, num_nodes, num_edges), rng.integers(0, num_nodes, num_edges),
+        rng.integers(0, 20, num_edges),
+    )
+
+def test_shared_graph_round_trip():
+    """Las vistas sobre la memoria compartida reproducen el grafo (mismo hash de contenido)."""
+    graph = random_graph(50, 200)
+    with SharedGraph(graph) as shared:
+        shm, attached = attach_shared_graph(shared.descriptor)
+        assert attached.content_hash() == graph.content_hash()
+        del attached
+        shm.close()
+
+def test_process_pool_matches_sequential():
+    graph = random_graph(300, 1500)
+    sources = list(range(0, 300, 7))
+    executor = ParallelExecutor(max_workers=2, min_parallel_work=0, min_parallel_sources=2, cpus=2)
+    try:
+        trees = executor.run_sources(graph, sources, dijkstra_tree)
+    finally:
+        executor.shutdown()
+    assert [tree.source for tree in trees] == sources
+    for tree in trees:
+        assert list(tree.distances) == list(dijkstra_tree(graph, tree.source, 300).distances)
+
+def test_run_tasks_keeps_order_in_process_pool():
+    """Tareas genéricas (búsquedas de desvío de Yen) repartidas por bloques, en el orden pedido."""
+    from k_shortest import spur_search
+    graph = random_graph(300, 1500)
+    reverse_tree = dijkstra_tree(graph.reverse(), 0, 300)
+    tasks = [(u, [], []) for u in range(1, 300, 11)]
+    shared_args = (0, reverse_tree.distances, reverse_tree.predecessors)
+    executor = ParallelExecutor(max_workers=2, min_parallel_work=0, min_parallel_sources=2, cpus=2)
+    try:
+        results = executor.run_tasks(graph, spur_search, tasks, shared_args)
+    finally:
+        executor.shutdown()
+    assert results == [spur_search(graph, task, *shared_args) for task in tasks]
+
+def loaded_module(graph, name):
+    """Tarea de prueba: si el proceso trabajador tiene importado el módulo name."""
+    return name in sys.modules
+
+def test_workers_do_not_import_main_and_report_counters():
+    """Los trabajadores no cargan la aplicación y sus contadores se suman a la solicitud en curso."""
+    graph = random_graph(300, 1500)
+    executor = ParallelExecutor(max_workers=2, min_parallel_work=0, min_parallel_sources=2, cpus=2)
+    metrics, token = start_request()
+    try:
+        trees = executor.run_sources(graph, [0, 1, 2], dijkstra_tree)
+        loaded = executor.run_tasks(graph, loaded_module, ['main', 'graph_core'])
+    finally:
+        finish_request(token)
+        executor.shutdown()
+    assert loaded == [False, True]
+    assert len(trees) == 3
+    assert metrics.counters['heap_pops'] >= 3 and metrics.counters['relaxations'] > 0
+
+def test_small_workloads_run_inline():
+    executor = ParallelExecutor(max_workers=8, cpus=8)
+    assert not executor.should_parallelize(random_graph(10, 20), 5)
+    executor.run_sources(random_graph(10, 20), [0, 1], dijkstra_tree)
+    assert executor._pool is None
+
+def test_single_cpu_or_few_sources_run_inline():
+    """Con una sola CPU disponible el pool sería más lento: se ejecuta en serie aunque max_workers > 1."""
+    graph = random_graph(300, 1500)
+    single_cpu = ParallelExecutor(max_workers=4, min_parallel_work=0, cpus=1)
+    assert not single_cpu.should_parallelize(graph, 100)
+    single_cpu.run_sources(graph, range(10), dijkstra_tree)
+    assert single_cpu._pool is None
+
+    multi_cpu = ParallelExecutor(max_workers=4, min_parallel_work=0, cpus=4)
+    assert not multi_cpu.should_parallelize(graph, 3)
+    assert multi_cpu.should_parallelize(graph, 4)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,53 @@
+import random
+import sys
+
+import pytest
+
+from priority_queues import DIAL_MAX_WEIGHT, DialBucketQueue, IndexedBinaryHeap, LazyBinaryHeap, bucket_queue_for
+
+def drain(queue):
+    popped = []
+    while True:
+        entry = queue.pop()
+        if entry is None:
+            return popped
+        popped.append(entry)
+
+@pytest.mark.parametrize("queue_class", [LazyBinaryHeap, IndexedBinaryHeap])
+def test_heaps_pop_in_key_order_with_decrease_key(queue_class):
+    rng = random.Random(3)
+    queue = queue_class(200)
+    best = {}
+    for _ in range(1000):
+        node, key = rng.randrange(200), rng.randrange(10_000)
+        changed = queue.push(node, key)
+        assert changed == (key < best.get(node, float('inf')))
+        best[node] = min(key, best.get(node, float('inf')))
+
+    assert drain(queue) == sorted((key, node) for node, key in best.items())
+
+def test_indexed_heap_never_exceeds_num_nodes():
+    queue = IndexedBinaryHeap(3)
+    for key in range(100, 0, -1):
+        queue.push(key % 3, key)
+    assert len(queue) == 3
+    assert queue.decrease_keys == 97
+
+def test_dial_pops_monotone_keys():
+    queue = DialBucketQueue(5, max_weight=4)
+    queue.push(0, 0)
+    assert queue.pop() == (0, 0)
+    queue.push(1, 4)
+    queue.push(2, 3)
+    queue.push(1, 1)  # decrease-key: la entrada con clave 4 queda obsoleta
+    assert queue.pop() == (1, 1)
+    queue.push(3, 5)
+    assert drain(queue) == [(3, 2), (5, 3)]
+    assert len(queue) == 0
+
+def test_bucket_queue_falls_back_for_large_weights():
+    assert isinstance(bucket_queue_for(10, 100), DialBucketQueue)
+    assert isinstance(bucket_queue_for(10, DIAL_MAX_WEIGHT + 1), IndexedBinaryHeap)
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,55 @@
+import gzip
+import json
+import sys
+
+import pytest
+
+import serialization
+from serialization import compress_response, dumps, json_response, negotiate_encoding
+
+def test_dumps_matches_json_with_int_keys_and_infinity_symbol():
+    payload = {'currentDistances': {0: 0, 1: "∞"}, 'path': "A -> B"}
+    encoded = dumps(payload)
+    assert json.loads(encoded) == json.loads(json.dumps(payload))
+    assert "∞".encode() in encoded
+
+@pytest.mark.skipif(serialization.orjson is None, reason="orjson no está instalado")
+def test_orjson_and_json_branches_produce_the_same_bytes(monkeypatch):
+    """Con y sin orjson la respuesta es idéntica (claves enteras, "∞", Infinity, escalares de NumPy)."""
+    import numpy as np
+    from graph_core import CSRGraph
+    from main import dijkstra_with_steps
+
+    graph = CSRGraph.from_edges(4, [0, 1, 0], [1, 2, 2], [2, 3, 9])
+    status, path, distance, steps = dijkstra_with_steps(graph, 0, 3, 4)
+    payload = {
+        'status': status, 'path_indices': path, 'distance': distance, 'steps': steps,
+        'raw': {0: float('inf'), 1: -float('inf'), 2: np.int64(7), 3: np.float64(0.5), 4: [float('nan')]},
+    }
+    assert any(2 in step['currentDistances'] for step in steps)
+    assert "∞" in steps[0]['currentDistances'].values()
+
+    with_orjson = dumps(payload)
+    monkeypatch.setattr(serialization, 'orjson', None)
+    with_json = dumps(payload)
+
+    assert with_orjson == with_json
+    assert json.loads(with_json)['raw'] == {'0': None, '1': None, '2': 7, '3': 0.5, '4': [None]}
+
+def test_negotiate_encoding(monkeypatch):
+    monkeypatch.setattr(serialization, 'brotli', None)
+    assert negotiate_encoding("gzip, deflate, br") == 'gzip'
+    assert negotiate_encoding("gzip;q=0, identity") is None
+    assert negotiate_encoding(None) is None
+
+def test_compress_response_only_large_json():
+    from main import app
+    with app.app_context():
+        large = compress_response(json_response({'data': list(range(2000))}), "gzip")
+        small = compress_response(json_response({'ok': True}), "gzip")
+    assert large.headers['Content-Encoding'] == 'gzip'
+    assert json.loads(gzip.decompress(large.get_data())) == {'data': list(range(2000))}
+    assert 'Content-Encoding' not in small.headers
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
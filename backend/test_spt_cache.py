@@ -0,0 +1,40 @@
+import sys
+
+import pytest
+
+from graph_core import CSRGraph
+from main import dijkstra_tree
+from spt_cache import ShortestPathTreeCache
+
+def test_get_or_compute_counts_hits_and_misses():
+    graph = CSRGraph.from_edges(3, [0, 1], [1, 2], [2, 3])
+    cache = ShortestPathTreeCache()
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return dijkstra_tree(graph, 0, 3)
+
+    tree, hit = cache.get_or_compute(graph, 0, 'dijkstra', compute)
+    assert not hit
+    again, hit = cache.get_or_compute(graph, 0, 'dijkstra', compute)
+    assert hit and again is tree
+    assert len(calls) == 1
+    assert tree.path_to(2) == (5, [0, 1, 2])
+    assert cache.stats()['hits'] == 1 and cache.stats()['misses'] == 1
+
+def test_lru_eviction_by_bytes_and_invalidation():
+    graph = CSRGraph.from_edges(4, [0, 1, 2], [1, 2, 3], [1, 1, 1])
+    tree_bytes = dijkstra_tree(graph, 0, 4).nbytes
+    cache = ShortestPathTreeCache(max_bytes=2 * tree_bytes)
+
+    for source in range(3):
+        cache.get_or_compute(graph, source, 'dijkstra', lambda s=source: dijkstra_tree(graph, s, 4))
+
+    assert len(cache) == 2
+    assert cache.get(cache.key(graph, 0, 'dijkstra')) is None
+    cache.invalidate_graph(graph.content_hash())
+    assert len(cache) == 0 and cache.stats()['total_bytes'] == 0
+
+if __name__ == "__main__":
+    sys.exit(pytest.main(["-v", __file__]))
@@ -0,0 +1,94 @@
+# backend/trace_store.py
+"""
+Trazas de pasos guardadas en el servidor para servirlas por páginas (GET /trace/<trace_id>).
+
+Con trace_format='lazy', /find_path responde solo con el resultado, el trace_id y el número de
+pasos. La traza se guarda como deltas con instantáneas periódicas (ver step_trace.py), así que
+cualquier página se reconstruye desde la instantánea más cercana sin volver a ejecutar el algoritmo.
+
+Los algoritmos son deterministas, de modo que el trace_id se deriva del grafo y de los parámetros
+de la consulta: repetir la misma consulta reutiliza la traza ya guardada.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+from jobs import estimate_delta_bytes
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Una instantánea guarda distancia, predecesor y estado de fijado de cada nodo en listas de Python
+BYTES_PER_KEYFRAME_NODE = 64
+
+
+class StoredTrace:
+    """Traza de deltas (build_delta_trace) junto con la respuesta resumida de /find_path."""
+
+    __slots__ = ('algorithm', 'trace', 'summary', 'nbytes')
+
+    def __init__(self, algorithm, trace, summary):
+        self.algorithm = algorithm
+        self.trace = trace
+        self.summary = summary
+        self.nbytes = estimate_trace_bytes(trace)
+
+    @property
+    def step_count(self):
+        return len(self.trace['deltas'])
+
+
+def estimate_trace_bytes(trace):
+    """Memoria aproximada de una traza de deltas: sus deltas más una lista por nodo en cada instantánea."""
+    keyframe_bytes = len(trace['keyframes']) * trace['numNodes'] * BYTES_PER_KEYFRAME_NODE
+    return keyframe_bytes + sum(estimate_delta_bytes(delta) for delta in trace['deltas'])
+
+
+def trace_id_for(graph, algorithm, start_node, end_node, keyframe_interval, extra=None):
+    """Identificador determinista de la traza de una consulta (hash del grafo + parámetros)."""
+    digest = hashlib.sha256()
+    digest.update(graph.content_hash().encode())
+    digest.update(json.dumps([algorithm, start_node, end_node, keyframe_interval]).encode())
+    if extra is not None:
+        digest.update(extra)
+    return digest.hexdigest()[:32]
+
+
+class TraceStore:
+    """LRU de StoredTrace acotado por memoria estimada (como spt_cache); seguro entre hilos."""
+
+    def __init__(self, max_bytes=DEFAULT_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, trace_id):
+        with self._lock:
+            stored = self._entries.get(trace_id)
+            if stored is not None:
+                self._entries.move_to_end(trace_id)
+            return stored
+
+    def put(self, trace_id, stored):
+        with self._lock:
+            previous = self._entries.pop(trace_id, None)
+            if previous is not None:
+                self._total_bytes -= previous.nbytes
+            self._entries[trace_id] = stored
+            self._total_bytes += stored.nbytes
+            while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, evicted = self._entries.popitem(last=False)
+                self._total_bytes -= evicted.nbytes
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'traces': len(self._entries),
+                'steps': sum(stored.step_count for stored in self._entries.values()),
+                'total_bytes': self._total_bytes,
+                'max_bytes': self.max_bytes,
+            }
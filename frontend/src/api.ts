@@ -1,13 +1,29 @@
-import { StepByStepResult } from "./types";
+import { AlgorithmName, AlgorithmStep, DeltaStepTrace, LazyStepTrace, NegativeCycle, StepByStepResult, VisPositions } from "./types";
 
 const BACKEND = import.meta.env.VITE_BACKEND_URL ?? "http://localhost:5000";
 
 export interface FindPathPayload {
-  matrix: string[][];
-  is_directed: boolean;
+  matrix?: string[][];
+  graph_id?: string;  // grafo ya registrado con registerGraph (sustituye a matrix/is_directed)
+  is_directed?: boolean;
   start_node_index: number;
   end_node_index: number;
-  algorithm: 'dijkstra' | 'bellman-ford';
+  algorithm: AlgorithmName;
+  positions?: VisPositions;  // coordenadas de los nodos: heurística de 'astar'
+  stream?: boolean;
+  include_steps?: boolean;  // false: solo el resultado, respondido desde la caché de árboles del backend
+  trace_format?: 'full' | 'delta' | 'lazy';
+  distance_format?: 'map' | 'list';  // 'list': currentDistances como arreglo (más compacto)
+  keyframe_interval?: number;  // el backend usa como mínimo 16 (una instantánea copia todos los nodos)
+  k?: number;  // > 1: los k caminos más cortos (Yen), sin traza de pasos; requiere algorithm 'dijkstra'
+  early_cycle_detection?: boolean;  // familia Bellman-Ford: parar en cuanto el grafo de predecesores forme un ciclo
+}
+
+export interface RankedPath {
+  rank: number;
+  distance: number;
+  path: string;
+  path_indices: number[];
 }
 
 export interface FindPathResponse {
@@ -15,19 +31,72 @@ export interface FindPathResponse {
   path: string;
   path_indices: number[];
   algorithm: string;
-  steps?: StepByStepResult;
+  steps?: StepByStepResult | DeltaStepTrace | LazyStepTrace;
+  k?: number;
+  paths?: RankedPath[];
+  negative_cycle?: NegativeCycle;  // con ciclo negativo: el ciclo que lo provocó
 }
 
-export async function findPath(payload: FindPathPayload): Promise<FindPathResponse> {
+// Registros NDJSON emitidos por /find_path con stream: true
+type StreamRecord =
+  | { type: 'step'; index: number; step: AlgorithmStep }
+  | ({ type: 'summary'; status: string; step_count: number } & Omit<FindPathResponse, 'steps'>);
+
+// Lee la respuesta chunked línea a línea, notificando cada paso en cuanto llega
+async function readStepStream(
+  res: Response,
+  algorithm: AlgorithmName,
+  onStep: (step: AlgorithmStep, index: number) => void,
+): Promise<FindPathResponse> {
+  const reader = res.body!.getReader();
+  const decoder = new TextDecoder();
+  const steps: AlgorithmStep[] = [];
+  let buffer = '';
+
+  for (;;) {
+    const { done, value } = await reader.read();
+    buffer += decoder.decode(value, { stream: !done });
+
+    const lines = buffer.split('\n');
+    buffer = lines.pop() ?? '';
+    for (const line of lines) {
+      if (!line.trim()) continue;
+      const record = JSON.parse(line) as StreamRecord;
+      if (record.type === 'step') {
+        steps.push(record.step);
+        onStep(record.step, record.index);
+      } else if (record.type === 'summary') {
+        return {
+          distance: record.distance,
+          path: record.path,
+          path_indices: record.path_indices,
+          algorithm: record.algorithm,
+          negative_cycle: record.negative_cycle,
+          steps: { algorithm, steps },
+        };
+      }
+    }
+    if (done) throw new Error("La transmisión de pasos terminó sin resumen");
+  }
+}
+
+export async function findPath(
+  payload: FindPathPayload,
+  onStep?: (step: AlgorithmStep, index: number) => void,
+): Promise<FindPathResponse> {
   console.log('🔍 Enviando request a:', `${BACKEND}/find_path`);
   
   try {
     const res = await fetch(`${BACKEND}/find_path`, {
       method: "POST",
       headers: { "Content-Type": "application/json" },
-      body: JSON.stringify(payload),
+      body: JSON.stringify(onStep ? { ...payload, stream: true, trace_format: 'full' } : payload),
     });
     
+    if (onStep && res.ok) {
+      return await readStepStream(res, payload.algorithm, onStep);
+    }
+
     const data = await res.json();
     
     if (!res.ok) {
@@ -39,4 +108,234 @@ export async function findPath(payload: FindPathPayload): Promise<FindPathRespon
     console.error('💥 Fetch error:', error);
     throw error;
   }
-}
\ No newline at end of file
+}
+
+export interface TracePage {
+  trace_id: string;
+  algorithm: string;
+  step_count: number;
+  offset: number;
+  steps: AlgorithmStep[];
+}
+
+// Página de pasos de una traza perezosa (trace_format: 'lazy')
+export async function fetchTracePage(traceId: string, offset: number, limit: number = 50): Promise<TracePage> {
+  const res = await fetch(`${BACKEND}/trace/${traceId}?offset=${offset}&limit=${limit}`);
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export interface RegisteredGraph {
+  graph_id: string;
+  num_nodes: number;
+  num_edges: number;
+  is_directed: boolean;
+  has_negative_weights: boolean;
+  nbytes: number;
+}
+
+// Registra el grafo una sola vez; las consultas siguientes pueden enviar solo graph_id
+export async function registerGraph(matrix: string[][], isDirected: boolean): Promise<RegisteredGraph> {
+  const res = await fetch(`${BACKEND}/graphs`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ matrix, is_directed: isDirected }),
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+// Exporta un grafo registrado en formato binario .ogcsr (CSR listo para np.memmap)
+export async function exportGraphBinary(graphId: string): Promise<Blob> {
+  const res = await fetch(`${BACKEND}/graphs/${graphId}/export?format=binary`);
+  if (!res.ok) {
+    const data = await res.json();
+    throw new Error(data.error || "Error del servidor");
+  }
+  return res.blob();
+}
+
+// Exporta un grafo registrado como matriz del editor
+export async function exportGraphMatrix(graphId: string): Promise<{ matrix: string[][]; is_directed: boolean }> {
+  const res = await fetch(`${BACKEND}/graphs/${graphId}/export?format=matrix`);
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+// Registra un grafo a partir de un archivo binario .ogcsr
+export async function importGraphBinary(file: Blob): Promise<RegisteredGraph> {
+  const res = await fetch(`${BACKEND}/graphs/import`, {
+    method: "POST",
+    headers: { "Content-Type": "application/octet-stream" },
+    body: file,
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export interface EdgeEdit {
+  source: number;
+  target: number;
+  weight: number | string | null;  // null o "" borra la arista
+}
+
+export interface EditGraphResponse extends RegisteredGraph {
+  previous_graph_id: string;
+  edges_changed: number;
+  trees_repaired: number;
+}
+
+// Edita aristas de un grafo registrado; el backend repara sus árboles cacheados y devuelve el nuevo graph_id
+export async function editGraph(graphId: string, edits: EdgeEdit[]): Promise<EditGraphResponse> {
+  const res = await fetch(`${BACKEND}/graphs/${graphId}/edits`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ edits }),
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export interface LandmarkIndex {
+  graph_id: string;
+  kind: 'landmarks';
+  landmarks: number[];
+  nbytes: number;
+}
+
+// Preprocesa un grafo registrado (índice de landmarks) para consultarlo con algorithm 'alt'
+export async function buildGraphIndex(graphId: string, landmarks?: number): Promise<LandmarkIndex> {
+  const res = await fetch(`${BACKEND}/graphs/${graphId}/index`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(landmarks === undefined ? {} : { landmarks }),
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export interface FindPathsResponse {
+  algorithm: string;
+  results: (FindPathResponse & { start_node_index: number; end_node_index: number })[];
+  distinct_sources: number;
+  trees_computed: number;
+}
+
+// Consulta por lotes: cada origen distinto se calcula una sola vez en el backend
+export async function findPaths(
+  graph: { matrix: string[][]; is_directed: boolean } | { graph_id: string },
+  pairs: [number, number][],
+  algorithm: AlgorithmName,
+): Promise<FindPathsResponse> {
+  const res = await fetch(`${BACKEND}/find_paths`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ ...graph, pairs, algorithm }),
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export type AllPairsEngine = 'auto' | 'floyd-warshall' | 'johnson';
+
+export interface AllPairsResponse {
+  engine: Exclude<AllPairsEngine, 'auto'>;
+  status: string;
+  num_nodes: number;
+  distances: (number | string)[][] | null;   // "∞" si no hay camino; null con ciclo negativo
+  successors: (number | null)[][] | null;    // primer salto del camino i -> j
+}
+
+// Caminos mínimos entre todos los pares (Floyd-Warshall o Johnson según la densidad)
+export async function findAllPairs(
+  graph: { matrix: string[][]; is_directed: boolean } | { graph_id: string },
+  engine: AllPairsEngine = 'auto',
+): Promise<AllPairsResponse> {
+  const res = await fetch(`${BACKEND}/all_pairs`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify({ ...graph, engine }),
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export type JobStatus = 'queued' | 'running' | 'done' | 'failed' | 'cancelled';
+
+export interface JobState {
+  job_id: string;
+  kind: string;
+  status: JobStatus;
+  progress: { steps: number; iteration: number | null; estimated_bytes: number };
+  elapsed_seconds: number;
+  time_limit: number;
+  memory_limit: number;
+  error: string | null;
+}
+
+// Encola un /find_path asíncrono (trace_format 'full' o 'delta'); límites opcionales en s y bytes
+export async function submitFindPathJob(
+  payload: FindPathPayload & { time_limit?: number; memory_limit?: number },
+): Promise<JobState> {
+  const res = await fetch(`${BACKEND}/jobs`, {
+    method: "POST",
+    headers: { "Content-Type": "application/json" },
+    body: JSON.stringify(payload),
+  });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export async function getJob(jobId: string): Promise<JobState> {
+  const res = await fetch(`${BACKEND}/jobs/${jobId}`);
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export async function cancelJob(jobId: string): Promise<JobState> {
+  const res = await fetch(`${BACKEND}/jobs/${jobId}`, { method: "DELETE" });
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
+
+export async function getJobResult(jobId: string): Promise<FindPathResponse> {
+  const res = await fetch(`${BACKEND}/jobs/${jobId}/result`);
+  const data = await res.json();
+  if (!res.ok) {
+    throw new Error(data.error || "Error del servidor");
+  }
+  return data;
+}
@@ -1,7 +1,8 @@
 // frontend/src/components/GraphEditor.tsx
 import React, { useState, useEffect, useCallback } from 'react';
 import { findPath } from '../api';
-import type { Matrix, VisPositions, GraphMode, PathResult, HoverRC } from '../types';
+import type { FindPathResponse } from '../api';
+import type { Matrix, VisPositions, GraphMode, PathResult, HoverRC, AlgorithmStep } from '../types';
 import GraphVisualization from './GraphVisualization';
 import AdjacencyMatrix from './AdjacencyMatrix';
 import MathRepresentation from './MathRepresentation';
@@ -26,20 +27,56 @@ interface GraphState {
   numNodes: number;
 }
 
-// Componente interno para visualización paso a paso
+// Componente interno para visualización paso a paso (los pasos se reciben en streaming)
 function StepByStepModal({ 
   onClose, 
   darkMode,
   algorithm,
   startNode,
-  endNode 
+  endNode,
+  matrix,
+  isDirected,
+  startIndex,
+  endIndex
 }: { 
   onClose: () => void; 
   darkMode: boolean;
   algorithm: 'dijkstra' | 'bellman-ford';
   startNode: string;
   endNode: string;
+  matrix: Matrix;
+  isDirected: boolean;
+  startIndex: number;
+  endIndex: number;
 }): React.JSX.Element {
+  const [steps, setSteps] = useState<AlgorithmStep[]>([]);
+  const [summary, setSummary] = useState<FindPathResponse | null>(null);
+  const [error, setError] = useState<string | null>(null);
+
+  useEffect(() => {
+    let cancelled = false;
+    setSteps([]);
+    setSummary(null);
+    setError(null);
+
+    const payload = {
+      matrix,
+      is_directed: isDirected,
+      start_node_index: startIndex,
+      end_node_index: endIndex,
+      algorithm,
+    };
+    findPath(payload, (step) => {
+      if (!cancelled) setSteps(prev => [...prev, step]);
+    })
+      .then(res => { if (!cancelled) setSummary(res); })
+      .catch((err: unknown) => {
+        if (!cancelled) setError(err instanceof Error ? err.message : 'Error desconocido');
+      });
+
+    return () => { cancelled = true; };
+  }, [matrix, isDirected, startIndex, endIndex, algorithm]);
+
   return (
     <div className={`step-modal-overlay ${darkMode ? 'dark-mode' : ''}`}>
       <div className="step-modal-container">
@@ -56,11 +93,28 @@ function StepByStepModal({
             <p><strong>Algoritmo:</strong> {algorithm}</p>
           </div>
           <div className="step-content">
-            <p style={{ textAlign: 'center', color: '#64748b', fontStyle: 'italic' }}>
-              La visualización paso a paso requiere datos adicionales del backend.
-              <br />
-              Por ahora, puedes ver el resultado final en el panel de resultados.
-            </p>
+            {error && (
+              <p style={{ color: '#dc2626' }}>Error: {error}</p>
+            )}
+            <ol>
+              {steps.map((step, index) => (
+                <li key={index}>{step.description}</li>
+              ))}
+            </ol>
+            {summary ? (
+              <>
+                <p><strong>Resultado:</strong> {summary.distance} — {summary.path}</p>
+                {summary.negative_cycle && (
+                  <p style={{ color: '#dc2626' }}>
+                    <strong>Ciclo negativo:</strong> {summary.negative_cycle.path} (peso total {summary.negative_cycle.weight})
+                  </p>
+                )}
+              </>
+            ) : !error && (
+              <p style={{ textAlign: 'center', color: '#64748b', fontStyle: 'italic' }}>
+                Recibiendo pasos del backend... ({steps.length})
+              </p>
+            )}
           </div>
         </div>
       </div>
@@ -326,6 +380,7 @@ export default function GraphEditor(): React.JSX.Element {
           ? res.path_indices.map((x: unknown) => Number(x))
           : [],
         algorithm: res.algorithm ?? algorithm,
+        negative_cycle: res.negative_cycle,
       });
     } catch (err: unknown) {
       setModalState({
@@ -494,6 +549,10 @@ export default function GraphEditor(): React.JSX.Element {
           algorithm={showStepByStep.algorithm}
           startNode={nodeNameFromIndex(selectedA)}
           endNode={nodeNameFromIndex(selectedB)}
+          matrix={matrix}
+          isDirected={isDirected}
+          startIndex={selectedA}
+          endIndex={selectedB}
         />
       )}
       
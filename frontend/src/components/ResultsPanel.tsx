@@ -69,6 +69,11 @@ export default function ResultsPanel({
             {String(pathResult.path ?? 'No encontrada')}
           </strong>
         </p>
+        {pathResult.negative_cycle && (
+          <p style={{ margin: 'var(--space-2) 0 0', color: '#dc2626', fontFamily: 'monospace' }}>
+            Ciclo negativo: {pathResult.negative_cycle.path} (peso total {pathResult.negative_cycle.weight})
+          </p>
+        )}
       </div>
     </div>
   );
@@ -4,12 +4,21 @@
 export type Matrix = string[][];
 export type VisPositions = { [nodeId: number]: { x: number; y: number } };
 export type GraphMode = "select" | "addNode" | "addEdge";
+export type AlgorithmName = 'dijkstra' | 'dijkstra-indexed-heap' | 'dijkstra-dial' | 'bellman-ford' | 'bellman-ford-vectorized' | 'spfa' | 'bidirectional-dijkstra' | 'astar' | 'alt';
+
+// Ciclo negativo que impide definir el camino más corto (campo negative_cycle de /find_path)
+export interface NegativeCycle {
+  nodes: number[];
+  path: string;  // recorrido cerrado, p. ej. "B -> C -> D -> B"
+  weight: number;
+}
 
 export interface PathResult {
   distance: number | string;
   path: string;
   path_indices?: number[];
   algorithm?: string;
+  negative_cycle?: NegativeCycle;
 }
 
 export interface HoverRC {
@@ -26,13 +35,61 @@ export interface AlgorithmStep {
   currentDistances: { [key: number]: number | string }; 
   iteration?: number; 
   negativeCycleDetected?: boolean;
+  negativeCycleNodeIndices?: number[];
 }
 
 export interface StepByStepResult {
-  algorithm: 'dijkstra' | 'bellman-ford';
+  algorithm: AlgorithmName;
   steps: AlgorithmStep[];
 }
 
+// --- Traza compacta (trace_format: 'delta') ---
+// Cada delta solo trae lo que cambió en ese paso; el estado completo se reconstruye
+// desde la instantánea (keyframe) más cercana con stepFromDeltaTrace (utils.ts).
+export interface AlgorithmStepDelta {
+  description: string;
+  activeNodeIndex?: number | null;
+  activeEdgeIndices?: [number, number] | null;
+  updatedNodeIndices?: number[];
+  updatedInPass?: number;
+  distanceChanges?: [number, number | string][];
+  predecessorChanges?: [number, number][];
+  settledNodes?: number[];
+  iteration?: number;
+  negativeCycleDetected?: boolean;
+  negativeCycleNodeIndices?: number[];
+  // Pasos especiales pueden traer campos completos que se respetan tal cual
+  settledNodeIndices?: number[];
+  pathEdgesIndices?: [number, number][];
+  currentDistances?: { [key: number]: number | string };
+}
+
+export interface TraceKeyframe {
+  index: number;
+  currentDistances: (number | string)[];
+  predecessors: (number | null)[];
+  settledNodeIndices: number[];
+  updatedNodeIndices: number[];
+  iteration: number | null;
+}
+
+export interface DeltaStepTrace {
+  algorithm: AlgorithmName;
+  format: 'delta';
+  numNodes: number;
+  keyframeInterval: number;
+  keyframes: TraceKeyframe[];
+  deltas: AlgorithmStepDelta[];
+}
+
+// Traza guardada en el backend: los pasos se piden por páginas a /trace/<trace_id>
+export interface LazyStepTrace {
+  algorithm: AlgorithmName;
+  format: 'lazy';
+  trace_id: string;
+  step_count: number;
+}
+
 // Actualizar PathResult para incluir los pasos
 export interface PathResult {
   distance: number | string;
@@ -1,3 +1,4 @@
+import type { AlgorithmStep, DeltaStepTrace } from './types';
 
 export function nodeNameFromIndex(index: number): string {
   let name = "";
@@ -13,4 +14,52 @@ export function nodeNameFromIndex(index: number): string {
     }
   }
   return name;
-}
\ No newline at end of file
+}
+// Reconstruye el paso completo número `index` de una traza delta: parte de la instantánea
+// más cercana y aplica los deltas intermedios (mismo algoritmo que backend/step_trace.py).
+export function stepFromDeltaTrace(trace: DeltaStepTrace, index: number): AlgorithmStep {
+  const keyframe = trace.keyframes[Math.floor(index / trace.keyframeInterval)];
+  const distances = keyframe.currentDistances.slice();
+  const predecessors = keyframe.predecessors.slice();
+  const settled = keyframe.settledNodeIndices.slice();
+  const settledSet = new Set(settled);
+  let updated = keyframe.updatedNodeIndices.slice();
+  let iteration = keyframe.iteration;
+
+  for (let i = keyframe.index; i <= index; i++) {
+    const delta = trace.deltas[i];
+    for (const [node, distance] of delta.distanceChanges ?? []) distances[node] = distance;
+    for (const [node, predecessor] of delta.predecessorChanges ?? []) predecessors[node] = predecessor;
+    for (const node of delta.settledNodes ?? []) {
+      if (!settledSet.has(node)) {
+        settledSet.add(node);
+        settled.push(node);
+      }
+    }
+    if (delta.updatedInPass !== undefined) {
+      if (iteration !== (delta.iteration ?? null)) updated = [];
+      if (!updated.includes(delta.updatedInPass)) updated.push(delta.updatedInPass);
+    } else {
+      updated = (delta.updatedNodeIndices ?? []).slice();
+    }
+    iteration = delta.iteration ?? null;
+  }
+
+  const delta = trace.deltas[index];
+  const pathEdges: [number, number][] = [];
+  predecessors.forEach((p, node) => {
+    if (p !== null) pathEdges.push([p, node]);
+  });
+
+  return {
+    description: delta.description,
+    activeNodeIndex: delta.activeNodeIndex ?? undefined,
+    activeEdgeIndices: delta.activeEdgeIndices ?? undefined,
+    settledNodeIndices: delta.settledNodeIndices ?? settled,
+    updatedNodeIndices: updated,
+    pathEdgesIndices: delta.pathEdgesIndices ?? pathEdges,
+    currentDistances: delta.currentDistances ?? { ...distances },
+    iteration: delta.iteration,
+    negativeCycleDetected: delta.negativeCycleDetected,
+  };
+}